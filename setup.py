@@ -52,6 +52,7 @@ setup(
         "matplotlib>=3.0",
         "pandas>=0.24",
         "pillow>=6.1",
+        "pyarrow>=0.16",
         "pyscal>=0.4.1",
         "scipy>=1.2",
         "webviz-config>=0.0.55",
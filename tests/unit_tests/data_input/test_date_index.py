@@ -0,0 +1,28 @@
+import pandas as pd
+
+from webviz_subsurface._datainput.date_index import DateIndex
+
+
+def test_date_index():
+    dframe = pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-0", "iter-1", "iter-0", "iter-1", "iter-0"],
+            "REAL": [0, 0, 0, 0, 1],
+            "DATE": pd.to_datetime(
+                ["2020-01-01", "2020-01-01", "2021-01-01", "2021-01-01", "2020-01-01"]
+            ),
+        }
+    )
+    date_index = DateIndex(dframe)
+    assert date_index.ensembles == ["iter-0", "iter-1"]
+    assert date_index.rows("2020-01-01", "iter-0").tolist() == [0, 4]
+    assert date_index.rows(pd.Timestamp("2021-01-01")).tolist() == [2, 3]
+    assert date_index.rows("2022-01-01").tolist() == []
+    assert date_index.rows(None).tolist() == []
+    cross_section = date_index.cross_section(dframe, "2020-01-01", "iter-1")
+    assert cross_section.index.tolist() == [1]
+
+    # No rows, e.g. when no realizations are selected
+    empty_index = DateIndex(dframe.iloc[:0])
+    assert empty_index.ensembles == []
+    assert empty_index.cross_section(dframe.iloc[:0], "2020-01-01").empty
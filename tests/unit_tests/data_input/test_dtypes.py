@@ -0,0 +1,37 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface._datainput.dtypes import compact_frame
+
+
+def test_compact_frame():
+    dframe = pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-0", "iter-0", "iter-1"],
+            "REAL": [0, 1, 0],
+            "DATE": [datetime.datetime(2020, 1, 1)] * 3,
+            "ZONE": ["UpperReek", "LowerReek", "UpperReek"],
+            "FOPT": [1.0, 2.0, 3.0],
+        }
+    ).astype({"DATE": object})
+    compact = compact_frame(dframe)
+    assert compact["ENSEMBLE"].dtype == "category"
+    assert compact["ZONE"].dtype == "category"
+    assert compact["REAL"].dtype == np.int16
+    assert pd.api.types.is_datetime64_any_dtype(compact["DATE"])
+    assert compact["FOPT"].dtype == np.float64
+    assert compact_frame(dframe, float32=True)["FOPT"].dtype == np.float32
+    assert dframe["ENSEMBLE"].dtype != "category"
+
+
+def test_compact_parquet_roundtrip(tmp_path):
+    dframe = compact_frame(
+        pd.DataFrame({"ENSEMBLE": ["iter-0", "iter-1"], "REAL": [0, 40000]})
+    )
+    assert dframe["REAL"].dtype == np.int32
+    dframe.to_parquet(tmp_path / "compact.parquet")
+    stored = pd.read_parquet(tmp_path / "compact.parquet")
+    assert stored["ENSEMBLE"].dtype == "category"
+    assert stored["REAL"].dtype == np.int32
@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface._datainput.ensemble_registry import EnsembleDataRegistry
+
+
+def test_registry_loads_missing_vectors():
+    loaded = []
+
+    def _loader(vectors):
+        loaded.append(vectors)
+        return pd.DataFrame(
+            {
+                "ENSEMBLE": "iter-0",
+                "REAL": [0, 0, 1, 1],
+                "DATE": pd.to_datetime(["2020-01-01", "2020-02-01"] * 2),
+                **{vector: np.arange(4.0) + len(vector) for vector in vectors},
+            }
+        )
+
+    registry = EnsembleDataRegistry()
+    key = ("iter-0", "path", "None")
+    first = registry.smry(key, ["FOPT", "FOPR"], _loader)
+    assert registry.smry(key, ["FGPT"]) is None
+    second = registry.smry(key, ["FOPR", "FGPT"], _loader)
+    assert loaded == [["FOPT", "FOPR"], ["FGPT"]]
+    assert list(second.columns) == ["ENSEMBLE", "REAL", "DATE", "FOPR", "FGPT"]
+
+    # Both requests are served the same arrays, and changing a served frame
+    # does not change the data of the registry
+    assert np.shares_memory(first["FOPR"].to_numpy(), second["FOPR"].to_numpy())
+    second.loc[0, "FOPR"] = -1.0
+    assert registry.smry(key, ["FOPR"])["FOPR"][0] == first["FOPR"][0] != -1.0
+
+    registry.clear()
+    assert registry.smry(key, ["FOPR"]) is None
+
+
+def test_registry_invalidation(monkeypatch):
+    def _loader(vectors):
+        return pd.DataFrame(
+            {
+                "ENSEMBLE": "iter-0",
+                "REAL": [0, 1],
+                "DATE": pd.to_datetime(["2020-01-01"] * 2),
+                **{vector: [1.0, 2.0] for vector in vectors},
+            }
+        )
+
+    registry = EnsembleDataRegistry(timeout=10)
+    key = ("iter-0", "path", "None")
+    registry.smry(key, ["FOPT"], _loader, version="a")
+    assert registry.smry(key, ["FOPT"], version="a") is not None
+    # Another version of the files the data was loaded from
+    assert registry.smry(key, ["FOPT"], version="b") is None
+
+    registry.smry(key, ["FOPT"], _loader, version="b")
+    registry.invalidate("iter-1")
+    assert registry.smry(key, ["FOPT"], version="b") is not None
+    registry.invalidate("iter-0", "path")
+    assert registry.smry(key, ["FOPT"], version="b") is None
+
+    # Data not used within the timeout is dropped
+    registry.smry(key, ["FOPT"], _loader, version="b")
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert registry.smry(key, ["FOPT"], version="b") is None
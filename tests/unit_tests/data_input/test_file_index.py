@@ -0,0 +1,63 @@
+import os
+import glob
+
+from webviz_subsurface._datainput.file_index import FileIndex
+
+
+def _make_ensemble(root):
+    for real in range(3):
+        share = root / f"realization-{real}" / "iter-0" / "share"
+        share.mkdir(parents=True)
+        (share / "a.csv").write_text("A\n1\n")
+        (share / "b.txt").write_text("")
+    (root / "realization-0" / "iter-0" / ".hidden.csv").write_text("")
+
+
+def test_glob(tmp_path):
+    _make_ensemble(tmp_path)
+    index = FileIndex(workers=2)
+    for pattern in [
+        "realization-*/iter-0",
+        "realization-*/iter-0/share/*.csv",
+        "realization-[01]/iter-*/share/b.txt",
+        "realization-0/iter-0/*.csv",
+        "realization-0/iter-0/share/missing.csv",
+    ]:
+        assert index.glob(tmp_path / pattern) == sorted(
+            glob.glob(str(tmp_path / pattern))
+        )
+
+    # Cached listings are revalidated against directory mtimes on every lookup
+    share = tmp_path / "realization-2" / "iter-0" / "share"
+    (share / "c.csv").write_text("")
+    os.utime(share, ns=(0, 0))
+    pattern = tmp_path / "realization-*" / "iter-0" / "share" / "*.csv"
+    assert index.glob(pattern) == sorted(glob.glob(str(pattern)))
+
+
+def test_snapshot(tmp_path):
+    _make_ensemble(tmp_path / "ens")
+    pattern = tmp_path / "ens" / "realization-*" / "iter-0" / "share" / "*.csv"
+    snapshot = tmp_path / "snapshot.json"
+
+    index = FileIndex()
+    index.set_snapshot(snapshot)
+    assert len(index.glob(pattern)) == 3
+    assert not snapshot.exists()
+    index.save_snapshot()
+    assert snapshot.exists()
+
+    # Listings from the snapshot are revalidated against directory mtimes
+    share = tmp_path / "ens" / "realization-1" / "iter-0" / "share"
+    (share / "c.csv").write_text("")
+    os.utime(share, ns=(0, 0))
+    index = FileIndex()
+    index.set_snapshot(snapshot)
+    assert index.glob(pattern) == sorted(glob.glob(str(pattern)))
+    assert len(index.glob(pattern)) == 4
+
+    # Unreadable snapshots are ignored
+    snapshot.write_text("{")
+    index = FileIndex()
+    index.set_snapshot(snapshot)
+    assert len(index.glob(pattern)) == 4
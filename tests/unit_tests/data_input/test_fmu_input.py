@@ -0,0 +1,188 @@
+import shutil
+import datetime
+
+import flask
+import pandas as pd
+from webviz_config.common_cache import CACHE
+from fmu.ensemble import ScratchEnsemble
+from resdata.summary import Summary
+
+from webviz_subsurface._datainput import fmu_input
+from webviz_subsurface._datainput.fmu_input import (
+    _scratch_ensembles,
+    _get_smry_parallel,
+    IncrementalEnsembleLoader,
+    set_loader_workers,
+    load_csv,
+    load_parameters,
+    load_smry,
+)
+from webviz_subsurface._datainput.ensemble_registry import ENSEMBLE_DATA
+
+
+def _write_realization(root, real, days, start=datetime.date(2020, 1, 1)):
+    """Writes a realization with a summary file with steps every 20 days"""
+    realdir = root / f"realization-{real}" / "iter-0"
+    model = realdir / "eclipse" / "model"
+    model.mkdir(parents=True, exist_ok=True)
+    smry = Summary.writer(str(model / "MODEL"), start, 1, 1, 1)
+    smry.add_variable("FOPT")
+    smry.add_variable("FOPR")
+    for step, day in enumerate(range(20, days + 1, 20)):
+        tstep = smry.add_t_step(step + 1, day)
+        tstep["FOPT"] = day * (real + 1.0)
+        tstep["FOPR"] = real + 1.0
+    smry.fwrite()
+    (realdir / "OK").write_text("")
+    return realdir
+
+
+def _sorted(dframe):
+    return dframe.sort_values(["REAL", "DATE"]).reset_index(drop=True)
+
+
+def test_parallel_smry(tmp_path):
+    _write_realization(tmp_path, 0, 100)
+    _write_realization(tmp_path, 1, 400)
+    # Starts after the end of realization 0, such that the ensemble dates are
+    # not the union of the dates of each realization
+    _write_realization(tmp_path, 2, 160, start=datetime.date(2021, 6, 1))
+    ens_path = str(tmp_path / "realization-*" / "iter-0")
+    serial = ScratchEnsemble("iter-0", ens_path)
+    ensemble = _scratch_ensembles({"iter-0": ens_path}, workers=2)[0]
+    assert sorted(ensemble.realizations) == [0, 1, 2]
+    for time_index in ["raw", "monthly", "yearly", "first", "last"]:
+        pd.testing.assert_frame_equal(
+            _sorted(_get_smry_parallel(ensemble, time_index, None, workers=2)),
+            _sorted(serial.get_smry(time_index=time_index)),
+            check_like=True,
+        )
+
+
+def test_parallel_order(tmp_path):
+    # Realization directories sort differently as strings and as numbers
+    for real in [10, 2, 0, 11, 1, 3, 7]:
+        realdir = _write_realization(tmp_path, real, 40)
+        (realdir / "parameters.txt").write_text(f"MULT {real / 10}\n")
+        (realdir / "table.csv").write_text(f"ZONE,VALUE\nA,{real}\nB,{-real}\n")
+    ensemble_paths = {"iter-0": str(tmp_path / "realization-*" / "iter-0")}
+    ensemble = _scratch_ensembles(ensemble_paths, workers=4)[0]
+    assert list(ensemble.realizations) == [0, 1, 2, 3, 7, 10, 11]
+
+    app = flask.Flask(__name__)
+    CACHE.init_app(app, config={"CACHE_TYPE": "simple"})
+    frames = {}
+    with app.app_context():
+        for workers in [None, 4]:
+            CACHE.clear()
+            set_loader_workers(workers)
+            frames[workers] = (
+                load_parameters(ensemble_paths),
+                load_csv(ensemble_paths, "table.csv"),
+            )
+    set_loader_workers(None)
+    assert frames[None][0]["REAL"].tolist() == [0, 1, 2, 3, 7, 10, 11]
+    for serial, parallel in zip(frames[None], frames[4]):
+        pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_load_smry_registry(tmp_path, monkeypatch):
+    for real in range(2):
+        _write_realization(tmp_path, real, 100)
+    ensemble_paths = {"iter-0": str(tmp_path / "realization-*" / "iter-0")}
+
+    loaded = []
+    get_ensemble_smry = fmu_input.get_ensemble_smry
+
+    def _get_ensemble_smry(ensemble, time_index=None, column_keys=None):
+        loaded.append(column_keys)
+        return get_ensemble_smry(ensemble, time_index, column_keys)
+
+    monkeypatch.setattr(fmu_input, "get_ensemble_smry", _get_ensemble_smry)
+    app = flask.Flask(__name__)
+    CACHE.init_app(app, config={"CACHE_TYPE": "simple"})
+    with app.app_context():
+        fopt = load_smry(ensemble_paths, column_keys=["FOPT"])
+        # Only the vectors not loaded by the first call are loaded
+        smry = load_smry(ensemble_paths, column_keys=["FOP*"])
+        assert loaded == [["FOPT"], ["FOPR"]]
+        assert list(smry.columns) == ["ENSEMBLE", "REAL", "DATE", "FOPR", "FOPT"]
+        assert smry["FOPT"].equals(fopt["FOPT"])
+
+        # Served frames can be changed without changing the shared data
+        smry.loc[0, "FOPT"] = -1.0
+        assert load_smry(ensemble_paths, column_keys=["FOPT"])["FOPT"].equals(
+            fopt["FOPT"]
+        )
+
+        # Changed summary files are loaded again
+        _write_realization(tmp_path, 0, 200)
+        smry = load_smry(ensemble_paths, column_keys=["FOP*"])
+        assert loaded[-1] == ["FOPR", "FOPT"]
+        assert smry.loc[smry["REAL"] == 0, "FOPT"].max() == 200.0
+    ENSEMBLE_DATA.clear()
+
+
+def test_incremental_refresh(tmp_path, monkeypatch):
+    for real in range(3):
+        _write_realization(tmp_path, real, 100)
+    loader = IncrementalEnsembleLoader(
+        {"iter-0": str(tmp_path / "realization-*" / "iter-0")}
+    )
+    assert loader.smry["REAL"].unique().tolist() == [0, 1, 2]
+
+    # Record which realizations are read from disk
+    loaded = []
+    load_realization = fmu_input._load_realization  # pylint: disable=protected-access
+
+    def _load_realization(runpath_and_index, **kwargs):
+        loaded.append(runpath_and_index[1])
+        return load_realization(runpath_and_index, **kwargs)
+
+    monkeypatch.setattr(fmu_input, "_load_realization", _load_realization)
+
+    assert loader.refresh() == {"added": [], "changed": [], "removed": []}
+    assert not loaded
+
+    # Summary data of the ensemble shared through the registry
+    registry_key = ("iter-0", loader.ensemble_paths["iter-0"], "None")
+    ENSEMBLE_DATA.smry(
+        registry_key, [], lambda _: loader.smry[["ENSEMBLE", "REAL", "DATE"]]
+    )
+    assert ENSEMBLE_DATA.smry(registry_key, []) is not None
+
+    # Only the replaced realization is reloaded, and deleted ones are dropped
+    _write_realization(tmp_path, 1, 200)
+    shutil.rmtree(tmp_path / "realization-2")
+    _write_realization(tmp_path, 3, 100)
+    assert loader.refresh() == {
+        "added": [("iter-0", 3)],
+        "changed": [("iter-0", 1)],
+        "removed": [("iter-0", 2)],
+    }
+    assert sorted(loaded) == [1, 3]
+    assert ENSEMBLE_DATA.smry(registry_key, []) is None
+    smry = loader.smry
+    assert smry["REAL"].unique().tolist() == [0, 1, 3]
+    assert smry.loc[smry["REAL"] == 1, "FOPT"].max() == 400.0
+
+    # Realizations without the filter file are dropped
+    (tmp_path / "realization-0" / "iter-0" / "OK").unlink()
+    assert loader.refresh()["removed"] == [("iter-0", 0)]
+    assert loader.parameters["REAL"].tolist() == [1, 3]
+
+
+def test_incremental_refresh_frequency(tmp_path):
+    for real in range(2):
+        _write_realization(tmp_path, real, 100)
+    loader = IncrementalEnsembleLoader(
+        {"iter-0": str(tmp_path / "realization-*" / "iter-0")}, time_index="monthly"
+    )
+    assert loader.smry["DATE"].max() == datetime.date(2020, 5, 1)
+    # Extending one realization changes the dates of the whole ensemble
+    _write_realization(tmp_path, 0, 200)
+    assert loader.refresh()["changed"] == [("iter-0", 0)]
+    smry = loader.smry
+    assert (
+        smry.groupby("REAL")["DATE"].max().tolist() == [datetime.date(2020, 8, 1)] * 2
+    )
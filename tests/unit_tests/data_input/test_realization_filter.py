@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface._datainput.realization_filter import RealizationFilter
+from webviz_subsurface._datainput.smry_cube import SmryCube
+
+
+def test_realization_filter():
+    parameters = pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-0"] * 4 + ["iter-1"] * 3,
+            "REAL": [3, 0, 1, 2, 0, 1, 2],
+            "MULTFLT": [0.9, 0.1, 0.5, np.nan, 0.6, 0.4, 0.7],
+            "KH": [1.0, 2.0, 3.0, 4.0, 1.0, 2.0, 3.0],
+            "FACIES": ["a", "b", "a", "b", "a", "b", "a"],
+        }
+    )
+    realization_filter = RealizationFilter(parameters)
+    assert realization_filter.parameters == ["MULTFLT", "KH"]
+    assert realization_filter.parameter_range("MULTFLT") == (0.1, 0.9)
+
+    assert realization_filter.realizations(
+        "iter-0", {"MULTFLT": (0.5, 1.0)}
+    ).tolist() == [1, 3]
+    assert realization_filter.realizations(
+        "iter-0", {"MULTFLT": (0.5, 1.0), "KH": (0.0, 2.0)}
+    ).tolist() == [3]
+    assert realization_filter.realizations("iter-1", {}).tolist() == [0, 1, 2]
+    assert realization_filter.realizations("iter-2", {}) is None
+
+    cube = SmryCube.from_frame(
+        pd.DataFrame(
+            {
+                "ENSEMBLE": "iter-0",
+                "REAL": [0, 1, 2, 3],
+                "DATE": pd.to_datetime(["2020-01-01"] * 4),
+                "FOPT": [1.0, 2.0, 3.0, 4.0],
+            }
+        ),
+        source="test",
+    )
+    selected = cube.select_realizations(
+        {"iter-0": realization_filter.realizations("iter-0", {"MULTFLT": (0.5, 1.0)})}
+    )
+    assert selected.cubes["iter-0"].reals.tolist() == [1, 3]
+    assert selected.cubes["iter-0"].statistics("FOPT")["mean"].tolist() == [3.0]
+    assert repr(selected) != repr(cube)
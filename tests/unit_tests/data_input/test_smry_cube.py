@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface._datainput.smry_store import SmryStore
+from webviz_subsurface._datainput.smry_cube import SmryCube
+
+
+def make_smry():
+    return pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-0"] * 5 + ["iter-1"] * 4,
+            "REAL": [0, 0, 1, 1, 2, 0, 0, 1, 1],
+            "DATE": pd.to_datetime(
+                ["2020-01-01", "2020-02-01"] * 2
+                + ["2020-01-01"]
+                + ["2020-01-01", "2020-02-01"] * 2
+            ),
+            "FOPT": np.arange(9.0),
+        }
+    )
+
+
+def test_cube_from_store(tmp_path):
+    smry = make_smry()
+    cube = SmryCube.from_store(SmryStore.from_frame(smry), mmap_folder=tmp_path)
+    assert cube.ensembles == ["iter-0", "iter-1"]
+    ens_cube = cube.cubes["iter-0"]
+    assert ens_cube.values.shape == (3, 2, 1)
+    assert not ens_cube.present[2, 1]
+    stats = ens_cube.statistics("FOPT")
+    assert stats["mean"].tolist() == [2.0, 2.0]
+    pd.testing.assert_frame_equal(
+        cube.to_frame()[["REAL", "FOPT"]], smry[["REAL", "FOPT"]]
+    )
+
+
+def test_cube_mmap_reused(tmp_path):
+    store = SmryStore.from_frame(make_smry())
+    cube = SmryCube.from_store(store, mmap_folder=tmp_path)
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".npy", ".npy"]
+
+    # Complete files are reused (e.g. by another process), without reading vectors
+    def _vector_values(vector):
+        raise AssertionError(f"{vector} read again")
+
+    store.vector_values = _vector_values
+    reused = SmryCube.from_store(store, mmap_folder=tmp_path)
+    for ensemble, ens_cube in reused.cubes.items():
+        np.testing.assert_array_equal(ens_cube.values, cube.cubes[ensemble].values)
+        np.testing.assert_array_equal(ens_cube.present, cube.cubes[ensemble].present)
+
+
+def test_cube_delta():
+    cube = SmryCube.from_frame(make_smry(), source="test")
+    delta = cube.delta("iter-0", "iter-1")
+    values = delta.cubes["(iter-0) - (iter-1)"].vector("FOPT")
+    assert values[:2].tolist() == [[-5.0, -5.0], [-5.0, -5.0]]
+    assert values[2, 0] == 0.0 and np.isnan(values[2, 1])
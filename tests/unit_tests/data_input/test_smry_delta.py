@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface._datainput.smry_delta import DeltaAlignment
+
+
+def test_delta_alignment():
+    dframe = pd.DataFrame(
+        {
+            "ENSEMBLE": ["base"] * 4 + ["delta"] * 3,
+            "REAL": [0, 0, 1, 1, 0, 0, 2],
+            "DATE": pd.to_datetime(
+                ["2020-01-01", "2021-01-01"] * 3 + ["2020-01-01"]
+            ).values,
+            "FOPT": [1.0, 2.0, 3.0, 4.0, 0.5, 1.5, 10.0],
+        }
+    )
+    alignment = DeltaAlignment.from_frame(dframe, "base", "delta")
+    delta_df = alignment.delta_frame(dframe, ["FOPT"], name="(base) - (delta)")
+
+    base_df = dframe[dframe["ENSEMBLE"] == "base"].set_index(["DATE", "REAL"])
+    other_df = dframe[dframe["ENSEMBLE"] == "delta"].set_index(["DATE", "REAL"])
+    expected = base_df[["FOPT"]].sub(other_df[["FOPT"]]).fillna(0).reset_index()
+    assert delta_df["REAL"].tolist() == expected["REAL"].tolist()
+    assert np.array_equal(delta_df["DATE"].values, expected["DATE"].values)
+    assert np.allclose(delta_df["FOPT"], expected["FOPT"])
+    assert (delta_df["ENSEMBLE"] == "(base) - (delta)").all()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from webviz_subsurface._datainput.smry_expressions import VectorExpression
+from webviz_subsurface._datainput.smry_store import SmryStore
+
+
+def test_vector_expression():
+    values = {
+        "WOPR:A-1": np.array([1.0, 2.0]),
+        "WOPR:B": np.array([3.0, 4.0]),
+        "FWPR": np.array([1.0, 0.0]),
+        "FOPR": np.array([3.0, 0.0]),
+    }
+    expression = VectorExpression("WOPR:A-1-WOPR:B*2", list(values))
+    assert expression.vectors == ["WOPR:A-1", "WOPR:B"]
+    assert np.allclose(expression.evaluate(values.get), [-5.0, -6.0])
+
+    expression = VectorExpression("-(WOPR:A-1 + 1) / 2", list(values))
+    assert np.allclose(expression.evaluate(values.get), [-1.0, -1.5])
+
+    # Division by zero gives NaN
+    expression = VectorExpression("FWPR / (FWPR + FOPR)", list(values))
+    result = expression.evaluate(values.get)
+    assert result[0] == 0.25 and np.isnan(result[1])
+    # Also when dividing constants
+    expression = VectorExpression("FOPR * (1/0)", list(values))
+    assert np.isnan(expression.evaluate(values.get)).all()
+
+    for invalid in ["FOPR +", "FOPR + FGPR", "(FOPR", "FOPR )", "2 * 3"]:
+        with pytest.raises(ValueError):
+            VectorExpression(invalid, list(values)).evaluate(values.get)
+
+
+def test_store_expressions():
+    store = SmryStore.from_frame(
+        pd.DataFrame(
+            {
+                "ENSEMBLE": ["iter-0"] * 2 + ["iter-1"] * 2,
+                "REAL": [0, 1, 0, 1],
+                "DATE": pd.to_datetime(["2020-01-01"] * 4),
+                "WOPR:A": [1.0, 2.0, 3.0, 4.0],
+                "WOPR:B": [1.0, 1.0, 1.0, 1.0],
+            }
+        )
+    )
+    store.add_expressions(
+        {"WOPR:A+B": "WOPR:A + WOPR:B", "WOPR:A+B_DOUBLE": "2 * WOPR:A+B"}
+    )
+    assert store.vectors[-2:] == ["WOPR:A+B", "WOPR:A+B_DOUBLE"]
+    assert "WOPR:A + WOPR:B" in repr(store)
+    ens_df = store.get(["WOPR:A+B_DOUBLE"], ["iter-1"])
+    assert ens_df["WOPR:A+B_DOUBLE"].tolist() == [8.0, 10.0]
+    with pytest.raises(ValueError):
+        store.add_expressions({"WOPR:A": "WOPR:B"})
@@ -0,0 +1,64 @@
+import flask
+import numpy as np
+import pandas as pd
+from webviz_config.common_cache import CACHE
+
+from webviz_subsurface._datainput.smry_resampling import resample_dates, resample_smry
+
+
+def test_resample_dates():
+    dates = resample_dates(
+        pd.Timestamp("2020-01-15"), pd.Timestamp("2020-03-01"), "monthly"
+    )
+    assert dates == list(pd.to_datetime(["2020-01-01", "2020-02-01", "2020-03-01"]))
+    assert len(resample_dates(dates[0], dates[-1], "daily")) == 61
+    assert resample_dates(dates[0], dates[-1], "weekly")[0] == pd.Timestamp(
+        "2019-12-30"
+    )
+
+
+def test_resample_smry():
+    # Daily rate of 1 in january, and 2 in february
+    dates = pd.date_range("2020-01-01", "2020-03-01", freq="D")
+    rate = np.where(dates > pd.Timestamp("2020-02-01"), 2.0, 1.0)
+    rate[0] = 0.0
+    smry = pd.DataFrame(
+        {
+            "ENSEMBLE": "iter-0",
+            "REAL": 0,
+            "DATE": dates,
+            "FOPR": rate,
+            "FOPT": np.cumsum(rate),
+        }
+    )
+    smry_meta = pd.DataFrame(
+        {"is_rate": [True, False], "is_total": [False, True]}, index=["FOPR", "FOPT"]
+    )
+    app = flask.Flask(__name__)
+    CACHE.init_app(app, config={"CACHE_TYPE": "simple"})
+    with app.app_context():
+        monthly = resample_smry(smry, "monthly", smry_meta)
+        assert resample_smry(smry, "raw", smry_meta).equals(smry)
+    assert monthly["DATE"].tolist() == list(
+        pd.to_datetime(["2020-01-01", "2020-02-01", "2020-03-01"])
+    )
+    assert np.allclose(monthly["FOPT"], [0.0, 31.0, 89.0])
+    assert np.allclose(monthly["FOPR"], [0.0, 1.0, 2.0])
+
+
+def test_resample_smry_realizations():
+    # Realizations with different dates are resampled together. Realization 1
+    # has a single date, and holds its value.
+    smry = pd.DataFrame(
+        {
+            "ENSEMBLE": "iter-0",
+            "REAL": [1, 0, 0, 0],
+            "DATE": pd.to_datetime(
+                ["2020-02-01", "2020-01-01", "2020-01-16", "2020-03-01"]
+            ),
+            "FOPT": [5.0, 0.0, 15.0, 60.0],
+        }
+    )
+    monthly = resample_smry.__wrapped__(smry, "monthly")
+    assert monthly["REAL"].tolist() == [0, 0, 0, 1, 1, 1]
+    assert np.allclose(monthly["FOPT"], [0.0, 31.0, 60.0, 5.0, 5.0, 5.0])
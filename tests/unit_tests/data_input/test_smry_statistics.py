@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface._datainput.smry_store import SmryStore
+from webviz_subsurface._datainput.smry_statistics import SmryStatistics
+
+
+def make_smry():
+    rng = np.random.default_rng(0)
+    dates = pd.to_datetime(["2020-01-01", "2020-02-01", "2020-03-01"])
+    dframe = pd.DataFrame(
+        {
+            "ENSEMBLE": np.repeat(["iter-0", "iter-1"], 15),
+            "REAL": np.tile(np.repeat(np.arange(5), 3), 2),
+            "DATE": np.tile(dates, 10),
+            "FOPT": rng.random(30),
+            "FOPR": rng.random(30),
+        }
+    )
+    # A realization stopping early
+    return dframe.drop(index=[2]).reset_index(drop=True)
+
+
+def test_statistics_as_groupby():
+    smry = make_smry()
+    stats = SmryStatistics.compute(SmryStore.from_frame(smry))
+    assert stats.ensembles == ["iter-0", "iter-1"]
+    for ensemble, ens_df in smry.groupby("ENSEMBLE"):
+        grouped = ens_df.groupby("DATE")["FOPR"]
+        vector_stats = stats.get(ensemble, "FOPR")
+        np.testing.assert_allclose(vector_stats["mean"], grouped.mean())
+        np.testing.assert_allclose(vector_stats["p10"], grouped.quantile(0.1))
+        np.testing.assert_allclose(vector_stats["p90"], grouped.quantile(0.9))
+        np.testing.assert_allclose(vector_stats["maximum"], grouped.max())
+        np.testing.assert_allclose(vector_stats["minimum"], grouped.min())
+    assert stats.get("iter-2", "FOPR") is None
+
+
+def test_statistics_frame_roundtrip():
+    stats = SmryStatistics.compute(SmryStore.from_frame(make_smry()), "monthly")
+    restored = SmryStatistics.from_frame(stats.to_frame(), source="test")
+    assert restored.vectors == stats.vectors
+    pd.testing.assert_frame_equal(
+        restored.get("iter-1", "FOPT"), stats.get("iter-1", "FOPT")
+    )
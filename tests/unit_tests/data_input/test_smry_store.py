@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface._datainput.smry_store import SmryStore
+
+
+def make_smry():
+    return pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-1"] * 4 + ["iter-0"] * 4,
+            "REAL": [0, 0, 1, 1] * 2,
+            "DATE": pd.to_datetime(["2020-01-01", "2020-02-01"] * 4),
+            "FOPT": np.arange(8.0),
+            "FOPR": np.arange(8.0) * 2,
+        }
+    )
+
+
+def test_parquet_store(tmp_path):
+    path = tmp_path / "smry.parquet"
+    make_smry().to_parquet(path, index=False)
+    store = SmryStore(path)
+    assert store.vectors == ["FOPT", "FOPR"]
+    assert store.ensembles == ["iter-1", "iter-0"]
+    dframe = store.get(["FOPR"], ["iter-0"])
+    assert list(dframe.columns) == ["ENSEMBLE", "REAL", "DATE", "FOPR"]
+    assert dframe["FOPR"].tolist() == [8.0, 10.0, 12.0, 14.0]
+    assert len(store.get(["FOPT"])) == 8
+
+
+def test_frame_store():
+    smry = make_smry().sample(frac=1, random_state=0)
+    store = SmryStore.from_frame(smry)
+    assert store.get(["FOPT"], ["iter-1", "missing"])["FOPT"].sum() == 6.0
+    assert set(store.ensembles) == {"iter-0", "iter-1"}
+
+
+def test_parquet_store_rewritten(tmp_path):
+    path = tmp_path / "smry.parquet"
+    make_smry().to_parquet(path, index=False)
+    assert SmryStore(path).get(["FOPT"])["FOPT"].sum() == 28.0
+    # A store rewritten at the same path does not get the cached columns
+    smry = make_smry().assign(FOPT=1.0)
+    smry.to_parquet(path, index=False)
+    os.utime(path, ns=(0, 0))
+    store = SmryStore(path)
+    assert store.get(["FOPT"])["FOPT"].sum() == 8.0
+    assert repr(store) != repr(SmryStore.from_frame(smry))
+
+
+def test_frame_store_repr():
+    assert repr(SmryStore.from_frame(make_smry())) == repr(
+        SmryStore.from_frame(make_smry())
+    )
+    assert repr(SmryStore.from_frame(make_smry())) != repr(
+        SmryStore.from_frame(make_smry().assign(FOPR=0.0))
+    )
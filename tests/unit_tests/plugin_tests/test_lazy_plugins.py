@@ -0,0 +1,52 @@
+import sys
+import json
+import subprocess  # nosec
+
+HEAVY_MODULES = ("xtgeo", "fmu.ensemble", "pyscal", "ecl2df", "matplotlib", "scipy")
+
+
+def _imported_heavy_modules(code: str, modules: tuple = HEAVY_MODULES) -> list:
+    """Runs code in a fresh interpreter, and returns the heavy modules imported"""
+    output = subprocess.run(  # nosec
+        [
+            sys.executable,
+            "-c",
+            f"import sys, json\n{code}\n"
+            f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+    return json.loads(output.decode().splitlines()[-1])
+
+
+def test_plugins_are_imported_lazily():
+    assert _imported_heavy_modules("import webviz_subsurface.plugins") == []
+    assert (
+        _imported_heavy_modules("from webviz_subsurface.plugins import DiskUsage") == []
+    )
+    assert "fmu.ensemble" in _imported_heavy_modules(
+        "from webviz_subsurface.plugins import ReservoirSimulationTimeSeries"
+    )
+
+
+def test_date_index_does_not_import_smry_store():
+    # The summary store depends on pyarrow
+    assert (
+        _imported_heavy_modules(
+            "from webviz_subsurface._datainput.date_index import DateIndex",
+            ("webviz_subsurface._datainput.smry_store",),
+        )
+        == []
+    )
+
+
+def test_all_plugins_are_exposed():
+    # pylint: disable=import-outside-toplevel
+    import webviz_subsurface.plugins
+
+    assert webviz_subsurface.plugins.__all__ == list(
+        webviz_subsurface.plugins.PLUGIN_MODULES
+    )
+    assert "RftPlotter" in dir(webviz_subsurface.plugins)
+    assert webviz_subsurface.plugins.DiskUsage.__name__ == "DiskUsage"
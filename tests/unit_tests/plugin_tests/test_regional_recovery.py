@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface.plugins._reservoir_simulation_timeseries_regional import (
+    calc_recovery,
+)
+
+
+def test_calc_recovery():
+    df = pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-0"] * 4 + ["iter-1"] * 2,
+            # Realizations are not sorted, recovery is relative to the first row
+            "REAL": [1, 0, 1, 0, 0, 0],
+            "DATE": pd.to_datetime(
+                ["2020-01-01"] * 2 + ["2021-01-01"] * 2 + ["2020-01-01", "2021-01-01"]
+            ),
+            "AGG_ROIP_filtered_on_Upper": [10.0, 20.0, 5.0, 15.0, 4.0, 1.0],
+        }
+    )
+    # Not memoized, as there is no cache in the tests
+    rec_df = calc_recovery.__wrapped__(df, ["AGG_ROIP_filtered_on_Upper"], ["iter-0"])
+    assert rec_df["ENSEMBLE"].unique().tolist() == ["iter-0"]
+    assert np.allclose(rec_df["REC_ROIP_filtered_on_Upper"], [0.0, 0.0, 0.5, 0.25])
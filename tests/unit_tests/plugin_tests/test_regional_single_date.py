@@ -0,0 +1,34 @@
+import pandas as pd
+
+from webviz_subsurface.plugins._reservoir_simulation_timeseries_regional import (
+    SingleDateData,
+    calc_recovery,
+    calc_statistics,
+)
+
+
+def test_single_date_data():
+    df = pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-0"] * 4 + ["iter-1"] * 2,
+            "REAL": [0, 1, 0, 1, 0, 0],
+            "DATE": pd.to_datetime(
+                ["2020-01-01", "2020-01-01", "2021-01-01", "2021-01-01"]
+                + ["2021-01-01", "2020-01-01"]
+            ),
+            "AGG_ROIP_filtered_on_Upper": [10.0, 20.0, 5.0, 15.0, 4.0, 1.0],
+        }
+    )
+    date_data = SingleDateData(df, calc_statistics(df), "ROIP:1")
+    values = date_data.values("2021-01-01")
+    assert values.index.tolist() == [2, 3, 4]
+    stat_df = date_data.statistics("2021-01-01")
+    assert stat_df["ENSEMBLE"].tolist() == ["iter-0", "iter-1"]
+    assert stat_df[("AGG_ROIP_filtered_on_Upper", "mean")].tolist() == [10.0, 4.0]
+    assert date_data.values("2022-01-01").empty
+
+    # Recovery of an ensemble where it can not be calculated has no rows
+    rec_df = calc_recovery.__wrapped__(df, ["AGG_ROIP_filtered_on_Upper"], [])
+    rec_data = SingleDateData(rec_df, calc_statistics(rec_df), "ROIP:1")
+    assert rec_data.values("2021-01-01").empty
+    assert rec_data.statistics("2021-01-01").empty
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from webviz_subsurface.plugins._reservoir_simulation_timeseries import (
+    filter_realizations,
+    add_statistic_traces,
+    add_histogram_traces,
+)
+
+COLORS = {"iter-0": "#ff0000", "iter-1": "#0000ff"}
+
+
+def make_smry():
+    return pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-0"] * 4 + ["iter-1"] * 2,
+            "REAL": [0, 0, 3, 3, 1, 1],
+            "DATE": pd.to_datetime(["2020-01-01", "2020-02-01"] * 3),
+            "FOPT": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }
+    )
+
+
+def test_filter_realizations():
+    smry = make_smry()
+    selected = filter_realizations(smry, {"iter-0": [3, 7]})
+    assert selected.index.tolist() == [2, 3, 4, 5]
+
+    # No realizations within the parameter range
+    empty = filter_realizations(smry, {"iter-0": [], "iter-1": []})
+    assert empty.empty
+    assert add_statistic_traces.__wrapped__(empty, "FOPT", COLORS, "linear", {}) == []
+    assert add_histogram_traces.__wrapped__(empty, "FOPT", "2020-01-01", COLORS) == []
@@ -0,0 +1,52 @@
+import numpy as np
+
+from webviz_subsurface._utils.downsampling import (
+    downsample_lines,
+    expand_steps,
+    lttb_indices,
+)
+
+
+def lttb_reference(x, y, n_out):
+    """Single line largest-triangle-three-buckets, as in the original paper"""
+    every = (len(x) - 2) / (n_out - 2)
+    kept = [0]
+    for bucket in range(n_out - 2):
+        start, stop = int(bucket * every) + 1, int((bucket + 1) * every) + 1
+        next_stop = int((bucket + 2) * every) + 1 if bucket < n_out - 3 else len(x)
+        avg_x, avg_y = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        prev = kept[-1]
+        areas = np.abs(
+            (x[prev] - avg_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (avg_y - y[prev])
+        )
+        kept.append(start + int(np.argmax(areas)))
+    return np.array(kept + [len(x) - 1])
+
+
+def test_lttb_indices():
+    x = np.arange(2000.0)
+    y = np.cumsum(np.random.default_rng(0).normal(size=(5, 2000)), axis=1)
+    indices = lttb_indices(x, y, 100)
+    assert indices.shape == (5, 100)
+    for line, line_indices in zip(y, indices):
+        assert np.array_equal(line_indices, lttb_reference(x, line, 100))
+    assert lttb_indices(x[:50], y[:, :50], 100).shape == (5, 50)
+
+
+def test_expand_steps():
+    x, y = np.array([0, 1, 2]), np.array([[5, 6, 7]])
+    assert expand_steps(x, y, "vh")[0].tolist() == [0, 0, 1, 1, 2]
+    assert expand_steps(x, y, "vh")[1].tolist() == [[5, 6, 6, 7, 7]]
+    assert expand_steps(x, y, "hv")[0].tolist() == [0, 1, 1, 2, 2]
+    assert expand_steps(x, y, "hv")[1].tolist() == [[5, 5, 6, 6, 7]]
+
+
+def test_downsample_step_lines():
+    dates = np.arange("2000-01-01", "2010-01-01", dtype="datetime64[D]")
+    rates = np.where(np.arange(len(dates)) % 500 < 250, 1.0, 2.0)[np.newaxis]
+    x, y, line_shape = downsample_lines(dates, rates, 200, "vh")
+    assert line_shape == "linear"
+    assert x.shape == y.shape == (1, 200)
+    # Steps are kept as vertical segments
+    assert np.sum(np.diff(x[0]) == np.timedelta64(0)) >= 14
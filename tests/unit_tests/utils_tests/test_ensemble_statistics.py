@@ -0,0 +1,145 @@
+import timeit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from webviz_subsurface._utils.ensemble_statistics import (
+    ensemble_statistics,
+    nan_statistics,
+)
+
+
+def make_smry(n_reals=50, n_dates=100, n_vectors=5):
+    rng = np.random.default_rng(0)
+    dframe = pd.DataFrame(
+        {
+            "ENSEMBLE": np.repeat(["iter-0", "iter-1"], n_reals * n_dates),
+            "REAL": np.tile(np.repeat(np.arange(n_reals), n_dates), 2),
+            "DATE": np.tile(pd.date_range("2020-01-01", periods=n_dates), 2 * n_reals),
+        }
+    )
+    for i in range(n_vectors):
+        dframe[f"V{i}"] = rng.random(len(dframe))
+    dframe.loc[3, "V0"] = np.nan
+    # A realization stopping early
+    return dframe.drop(index=range(n_dates - 10, n_dates)).reset_index(drop=True)
+
+
+def groupby_statistics(dframe):
+    """Statistics as previously calculated in the regional timeseries plugin"""
+
+    def p10(x):
+        return np.nanpercentile(x, q=90)
+
+    def p90(x):
+        return np.nanpercentile(x, q=10)
+
+    stat_dfs = []
+    for ens, ens_df in dframe.groupby("ENSEMBLE"):
+        stat_dfs.append(
+            ens_df.drop(columns=["REAL", "ENSEMBLE"])
+            .groupby("DATE")
+            .agg([np.nanmean, np.nanmin, np.nanmax, p10, p90])
+            .assign(ENSEMBLE=ens)
+        )
+    return pd.concat(stat_dfs)
+
+
+def groupby_quantiles(dframe):
+    """Statistics as previously calculated in the timeseries plugin"""
+    stat_dfs = {}
+    for ens, ens_df in dframe.groupby("ENSEMBLE"):
+        grouped = ens_df.drop(columns=["ENSEMBLE", "REAL"]).groupby("DATE")
+        stat_dfs[ens] = pd.concat(
+            {
+                "mean": grouped.mean(),
+                "p10": grouped.quantile(0.1),
+                "p90": grouped.quantile(0.9),
+                "maximum": grouped.max(),
+                "minimum": grouped.min(),
+            },
+            names=["STATISTIC"],
+        )
+    return stat_dfs
+
+
+def test_nan_statistics():
+    values = np.array([[1.0, np.nan], [2.0, np.nan], [4.0, 3.0]])
+    stats = nan_statistics(values, ["mean", "std", "p10", "maximum", "minimum"])
+    np.testing.assert_allclose(
+        stats[:, 0], [7 / 3, np.std([1, 2, 4], ddof=1), 1.2, 4, 1]
+    )
+    np.testing.assert_allclose(stats[:, 1], [3, np.nan, 3, 3, 3])
+    high = nan_statistics(values, ["p10", "p90"], high_p10=True)
+    np.testing.assert_allclose(high[:, 0], [3.6, 1.2])
+
+
+def test_as_groupby():
+    smry = make_smry()
+    vectors = ["V0", "V1"]
+    stat_df = ensemble_statistics(smry, vectors, x="DATE", group_by=["ENSEMBLE"])
+    for ens, reference in groupby_quantiles(
+        smry[["ENSEMBLE", "REAL", "DATE"] + vectors]
+    ).items():
+        for vector in vectors:
+            for stat in ["mean", "p10", "p90", "maximum", "minimum"]:
+                np.testing.assert_allclose(
+                    stat_df.loc[ens][vector][stat], reference[vector][stat]
+                )
+
+    high_df = ensemble_statistics(
+        smry,
+        vectors,
+        x="DATE",
+        group_by=["ENSEMBLE"],
+        statistics=["mean", "minimum", "maximum", "p10", "p90"],
+        high_p10=True,
+    )
+    reference = groupby_statistics(smry[["ENSEMBLE", "REAL", "DATE"] + vectors])
+    for ens in ["iter-0", "iter-1"]:
+        ens_ref = reference[reference["ENSEMBLE"] == ens]
+        for old, new in [("nanmean", "mean"), ("p10", "p10"), ("p90", "p90")]:
+            np.testing.assert_allclose(high_df.loc[ens]["V0"][new], ens_ref["V0"][old])
+
+
+def test_empty():
+    # No realizations gives NaN statistics, and no rows gives an empty table
+    stats = nan_statistics(np.empty((0, 2)), ["mean", "p10", "maximum"])
+    assert stats.shape == (3, 2) and np.isnan(stats).all()
+    smry = make_smry().iloc[:0]
+    stat_df = ensemble_statistics(smry, ["V0", "V1"], x="DATE", group_by=["ENSEMBLE"])
+    assert stat_df.empty
+    assert list(stat_df.columns.get_level_values(0).unique()) == ["V0", "V1"]
+
+
+@pytest.mark.benchmark
+def test_benchmark():
+    """Compares `ensemble_statistics` with the groupby implementations previously
+    used in the plugins, which call back to Python for each group. Only run when
+    selected, with `pytest -m benchmark`.
+    """
+    smry = make_smry()
+    vectors = [f"V{i}" for i in range(5)]
+    vectorized = min(
+        timeit.repeat(
+            lambda: ensemble_statistics(
+                smry,
+                vectors,
+                x="DATE",
+                group_by=["ENSEMBLE"],
+                statistics=["mean", "minimum", "maximum", "p10", "p90"],
+                high_p10=True,
+            ),
+            number=1,
+            repeat=3,
+        )
+    )
+    groupby_agg = min(
+        timeit.repeat(lambda: groupby_statistics(smry), number=1, repeat=3)
+    )
+    groupby_quantile = min(
+        timeit.repeat(lambda: groupby_quantiles(smry), number=1, repeat=3)
+    )
+    assert vectorized < groupby_agg
+    assert vectorized < groupby_quantile
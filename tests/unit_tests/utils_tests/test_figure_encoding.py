@@ -0,0 +1,39 @@
+import json
+
+import numpy as np
+
+from webviz_subsurface._utils.figure_encoding import (
+    decode_array,
+    encode_array,
+    encode_trace,
+)
+
+
+def test_encode_array():
+    values = np.array([[1.5, np.nan, -2.0], [3.0, 4.0, 1e6]])
+    encoded = encode_array(values)
+    assert encoded["dtype"] == "f4"
+    assert encoded["shape"] == "2, 3"
+    assert np.array_equal(decode_array(encoded), values, equal_nan=True)
+    assert decode_array(encode_array(np.arange(5), "i4")).tolist() == list(range(5))
+
+
+def test_encode_trace():
+    values = np.random.default_rng(0).normal(size=10000)
+    trace = {
+        "x": np.arange("2000-01-01", 10000, dtype="datetime64[D]"),
+        "y": list(values),
+        "customdata": np.arange(10000),
+        "name": "iter-0",
+    }
+    encoded = encode_trace(trace)
+    assert encoded["x"] is trace["x"]
+    assert encoded["name"] == "iter-0"
+    assert encoded["customdata"]["dtype"] == "i4"
+    assert np.allclose(decode_array(encoded["y"]), values, rtol=1e-6)
+    # Typed arrays are several times smaller than JSON number lists
+    assert len(json.dumps(encoded["y"])) * 3 < len(json.dumps(trace["y"]))
+    # Short arrays are left as they are
+    assert encode_trace({"y": [1.0, 2.0]})["y"] == [1.0, 2.0]
+    # Already encoded arrays are encoded with the requested dtype
+    assert encode_trace({"y": encode_array(values, "f8")})["y"]["dtype"] == "f4"
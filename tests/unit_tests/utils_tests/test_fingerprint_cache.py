@@ -0,0 +1,70 @@
+import flask
+import numpy as np
+import pandas as pd
+from webviz_config.common_cache import CACHE
+
+from webviz_subsurface._utils.fingerprint_cache import (
+    fingerprint_memoize,
+    set_fingerprint,
+    bump_fingerprint_version,
+    get_fingerprint,
+    cache_info,
+)
+from webviz_subsurface._utils import fingerprint_cache
+
+
+@fingerprint_memoize()
+def double(dframe, column):
+    return dframe[column] * 2
+
+
+@fingerprint_memoize(local_types=(np.ndarray,))
+def as_array(dframe, column):
+    return dframe[column].to_numpy(copy=True)
+
+
+def test_fingerprint():
+    dframe = pd.DataFrame({"A": [1, 2, 3]})
+    assert get_fingerprint(dframe) == get_fingerprint(dframe.copy())
+    # Untagged frames are hashed by their current content
+    fingerprint = get_fingerprint(dframe)
+    dframe.loc[0, "A"] = 4
+    assert get_fingerprint(dframe) != fingerprint
+    set_fingerprint(dframe, "source")
+    assert get_fingerprint(dframe) == "source@0"
+    bump_fingerprint_version(dframe)
+    assert get_fingerprint(dframe) == "source@1"
+
+
+def test_fingerprint_memoize():
+    app = flask.Flask(__name__)
+    CACHE.init_app(app, config={"CACHE_TYPE": "simple"})
+    dframe = set_fingerprint(pd.DataFrame({"A": [1, 2, 3]}), "test_memoize")
+    with app.app_context():
+        assert double(dframe, "A").tolist() == [2, 4, 6]
+        # Positional and keyword arguments give the same key
+        assert double(dframe, column="A").tolist() == [2, 4, 6]
+        assert double(dframe=dframe, column="A").tolist() == [2, 4, 6]
+        # Untagged frames changed in place are not served stale results
+        untagged = pd.DataFrame({"A": [1, 2, 3]})
+        assert double(untagged, "A").tolist() == [2, 4, 6]
+        untagged.loc[0, "A"] = 4
+        assert double(untagged, "A").tolist() == [8, 4, 6]
+    stats = cache_info()[f"{__name__}.double"]
+    assert stats == {"hits": 2, "misses": 3}
+
+
+def test_fingerprint_memoize_local(monkeypatch):
+    app = flask.Flask(__name__)
+    CACHE.init_app(app, config={"CACHE_TYPE": "simple"})
+    monkeypatch.setattr(fingerprint_cache, "LOCAL_MAXSIZE", 1)
+    dframe = set_fingerprint(pd.DataFrame({"A": [1, 2], "B": [3, 4]}), "test_local")
+    with app.app_context():
+        # Local results are not serialized, and the same object is returned
+        first = as_array(dframe, "A")
+        assert as_array(dframe, "A") is first
+        # Least recently used results are dropped
+        assert as_array(dframe, "B").tolist() == [3, 4]
+        assert as_array(dframe, "A") is not first
+    stats = cache_info()[f"{__name__}.as_array"]
+    assert stats == {"hits": 1, "misses": 3}
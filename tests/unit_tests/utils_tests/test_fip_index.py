@@ -0,0 +1,33 @@
+import pandas as pd
+
+from webviz_subsurface._utils.fip_index import FipIndex
+
+
+def test_fip_index_nodes():
+    fipdesc = pd.DataFrame(
+        [
+            ("FIPNUM", "ZONE", "Upper", 3),
+            ("FIPNUM", "ZONE", "Upper", 1),
+            ("FIPNUM", "ZONE", "Lower", 2),
+            ("FIPNUM", "ZONE", "Lower", 4),
+            ("FIPNUM", "REGION", "North", 1),
+            ("FIPNUM", "REGION", "North", 2),
+            ("FIPNUM", "REGION", "South", 3),
+        ],
+        columns=["FIP", "GROUP", "SUBGROUP", "NODE"],
+    )
+    fip_index = FipIndex(fipdesc)
+    assert "FIPNUM" in fip_index and "FIPREG" not in fip_index
+    assert fip_index.groups("FIPNUM") == ["ZONE", "REGION"]
+
+    filters = {"ZONE": ["Upper", "Lower"], "REGION": ["North", "South"]}
+    # Node 4 is not in any REGION subgroup
+    assert fip_index.nodes("FIPNUM", "ENSEMBLE", filters) == {"ENSEMBLE": [1, 2, 3]}
+    assert fip_index.nodes("FIPNUM", "ZONE", filters) == {
+        "Upper": [1, 3],
+        "Lower": [2],
+    }
+    assert fip_index.nodes(
+        "FIPNUM", "REGION", {"ZONE": ["Upper"], "REGION": ["North", "South"]}
+    ) == {"North": [1], "South": [3]}
+    assert fip_index.nodes("FIPNUM", "ZONE", {"ZONE": ["Lower"], "SEGMENT": []}) == {}
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface._utils.realization_traces import (
+    concatenate_realizations,
+    merged_realization_trace,
+)
+
+
+def test_concatenate_realizations():
+    x, y, reals = concatenate_realizations(
+        [1, 2, 1, 2, 3], [10, 20, 30, 40, 50], [0, 0, 4, 4, 4]
+    )
+    assert x.tolist() == [1, 2, 2, 1, 2, 3]
+    assert np.array_equal(y, [10, 20, np.nan, 30, 40, 50], equal_nan=True)
+    assert reals.tolist() == [0, 0, 0, 4, 4, 4]
+
+
+def test_merged_realization_trace():
+    dframe = pd.DataFrame(
+        {"REAL": [1, 0, 1, 0], "DATE": [1, 1, 2, 2], "FOPT": [3.0, 1.0, 4.0, 2.0]}
+    )
+    trace = merged_realization_trace(dframe, "DATE", "FOPT", hovertext="Real: {real}")
+    assert np.array_equal(trace["y"], [1.0, 2.0, np.nan, 3.0, 4.0], equal_nan=True)
+    assert trace["customdata"].tolist() == [0, 0, 0, 1, 1]
+    assert trace["hovertemplate"].endswith("Real: %{customdata}")
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from webviz_subsurface._utils.region_aggregation import RegionAggregation
+
+
+def test_region_aggregation():
+    columns = ["ROIP:1", "ROIP:2", "ROIP:3"]
+    values = np.array([[1.0, 2.0, 4.0], [0.0, 3.0, 5.0]])
+    subgroup_vectors = {"Upper": ["ROIP:1", "ROIP:2"], "Lower": ["ROIP:3"]}
+    aggregation = RegionAggregation(columns, subgroup_vectors)
+    assert aggregation.subgroups == ["Upper", "Lower"]
+
+    dframe = pd.DataFrame(values, columns=columns)
+    expected = np.column_stack(
+        [dframe[vectors].sum(axis=1) for vectors in subgroup_vectors.values()]
+    )
+    assert np.allclose(aggregation.apply(values), expected)
+
+    with pytest.raises(KeyError):
+        RegionAggregation(columns, {"All": ["ROIP:1", "ROIP:4"]})
@@ -0,0 +1,35 @@
+from webviz_subsurface._utils.region_vector_index import RegionVectorIndex
+
+
+def test_region_vector_index():
+    vectors = [
+        "ENSEMBLE",
+        "ROIP:2",
+        "ROIP:10",
+        "ROIP_REG:1",
+        "RPR__REG:3",
+        "FOPT",
+        "WOPR:OP_1",
+        "ROIPH:2",
+    ]
+    index = RegionVectorIndex(vectors)
+    assert index.fips == ["FIPNUM", "FIPREG"]
+    assert index.nodes("FIPNUM") == [2, 10]
+    assert index.nodes() == [1, 2, 3, 10]
+    assert index.nodes("FIPXYZ") == []
+    assert index.bases("FIPREG") == ["ROIP", "RPR"]
+    assert index.region_vectors("ROIP", "FIPNUM") == ["ROIP:2", "ROIP:10"]
+    assert index.position("ROIP", "FIPREG", 1) == 3
+    assert index.position("ROIP", "FIPREG", 2) is None
+    assert index.match("F[OWG]PT") == ["FOPT"]
+    assert index.match("ROIP*", "RPR*") == [
+        "ROIP:2",
+        "ROIP:10",
+        "ROIP_REG:1",
+        "RPR__REG:3",
+        "ROIPH:2",
+    ]
+
+    subset = index.subset(["ROIP_REG:1", "RPR__REG:3"])
+    assert subset.fips == ["FIPREG"]
+    assert subset.position("RPR", "FIPREG", 3) == 4
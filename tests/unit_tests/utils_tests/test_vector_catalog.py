@@ -0,0 +1,23 @@
+from webviz_subsurface._utils.vector_catalog import VectorCatalog
+
+
+def test_vector_catalog():
+    catalog = VectorCatalog(
+        ["FOPT", "WOPR:OP_1", "WOPT:OP_1", "ROIP:1", "ROIP_REG:2", "WOPRL_10:OP_1"]
+    )
+    assert len(catalog) == 6
+    assert catalog.info("ROIP_REG:2")["FIP"] == "FIPREG"
+    assert catalog.info("ROIP_REG:2")["TYPE"] == "region"
+    assert catalog.info("WOPR:OP_1")["NODE"] == "OP_1"
+    assert catalog.info("WOPRL_10:OP_1")["TYPE"] == "completion"
+
+    assert catalog.search("wopr") == ["WOPR:OP_1", "WOPRL_10:OP_1"]
+    assert catalog.search("W*:OP_1", limit=2) == ["WOPR:OP_1", "WOPT:OP_1"]
+    # Vectors matching by description follow the prefix matches
+    assert catalog.search("roip") == ["ROIP:1", "ROIP_REG:2"]
+    assert catalog.search("oil production total") == ["FOPT", "WOPT:OP_1"]
+    assert catalog.search("") == catalog.vectors
+
+    assert catalog.options(["FOPT"]) == [
+        {"label": "Oil Production Total (FOPT)", "value": "FOPT"}
+    ]
@@ -26,3 +26,34 @@ def subscribe(scratch_ensembles, config_folder, portable):
                 )
 
     return scratch_ensembles
+
+
+@webviz_config.SHARED_SETTINGS_SUBSCRIPTIONS.subscribe("ensemble_loader_workers")
+def subscribe_loader_workers(ensemble_loader_workers):
+    # Imported here in order to not load fmu.ensemble on package import
+    # pylint: disable=import-outside-toplevel
+    from ._datainput.fmu_input import set_loader_workers
+
+    set_loader_workers(ensemble_loader_workers)
+    return ensemble_loader_workers
+
+
+@webviz_config.SHARED_SETTINGS_SUBSCRIPTIONS.subscribe("compact_dtypes")
+def subscribe_compact_dtypes(compact_dtypes):
+    # pylint: disable=import-outside-toplevel
+    from ._datainput.dtypes import set_compact_dtypes
+
+    set_compact_dtypes(compact_dtypes)
+    return compact_dtypes
+
+
+@webviz_config.SHARED_SETTINGS_SUBSCRIPTIONS.subscribe("file_index_snapshot")
+def subscribe_file_index_snapshot(file_index_snapshot, config_folder):
+    # pylint: disable=import-outside-toplevel
+    from ._datainput.file_index import FILE_INDEX
+
+    if file_index_snapshot is not None:
+        if not pathlib.Path(file_index_snapshot).is_absolute():
+            file_index_snapshot = str(config_folder / file_index_snapshot)
+        FILE_INDEX.set_snapshot(file_index_snapshot)
+    return file_index_snapshot
@@ -0,0 +1,100 @@
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import pandas as pd
+from webviz_config.common_cache import CACHE
+
+from .smry_resampling import _resample
+from .._utils.fingerprint_cache import fingerprint_memoize
+
+if TYPE_CHECKING:
+    # Only for annotations, as the store depends on pyarrow
+    from .smry_store import SmryStore
+
+
+def _group_rows(groups: np.ndarray) -> list:
+    """(group, rows) for each unique value in a non-empty array of group codes"""
+    order = np.argsort(groups, kind="mergesort")
+    starts = np.flatnonzero(np.r_[True, np.diff(groups[order]) != 0])
+    stops = np.r_[starts[1:], len(order)]
+    return [
+        (groups[order[start]], order[start:stop]) for start, stop in zip(starts, stops)
+    ]
+
+
+class DateIndex:
+    """Rows of each date in a dataframe with DATE and (optionally) ENSEMBLE
+    columns, such that all realizations at a single date (a cross section) are
+    found by a lookup, instead of comparing the whole DATE column on every request.
+
+    Dates are looked up as timestamps, such that both `pd.Timestamp` and date
+    strings (e.g. the x value in plotly clickData) can be used.
+
+    `source` identifies the data, and is used as cache key when memoizing functions
+    taking the index as argument.
+    """
+
+    def __init__(self, dframe: pd.DataFrame, source: str = ""):
+        self.source = source
+        self._ensemble_rows: dict = {}
+        if dframe.empty:
+            return
+        ensemble_codes, ensembles = pd.factorize(
+            np.asarray(dframe["ENSEMBLE"])
+            if "ENSEMBLE" in dframe.columns
+            else np.zeros(len(dframe), dtype=int)
+        )
+        date_codes, dates = pd.factorize(pd.to_datetime(dframe["DATE"]).values)
+        groups = ensemble_codes.astype(np.int64) * len(dates) + date_codes
+        for group, rows in _group_rows(groups):
+            ensemble = ensembles[group // len(dates)]
+            date = pd.Timestamp(dates[group % len(dates)])
+            self._ensemble_rows.setdefault(ensemble, {})[date] = rows
+
+    def __repr__(self) -> str:
+        return f"DateIndex({self.source})"
+
+    @property
+    def ensembles(self) -> list:
+        return list(self._ensemble_rows)
+
+    def rows(self, date, ensemble: Optional[str] = None) -> np.ndarray:
+        """Rows at a date, for a single ensemble or for all ensembles. Returns no
+        rows if the date is not found.
+        """
+        try:
+            timestamp = pd.Timestamp(date)
+        except (TypeError, ValueError):
+            return np.array([], dtype=np.int64)
+        ensembles = self.ensembles if ensemble is None else [ensemble]
+        return np.concatenate(
+            [np.array([], dtype=np.int64)]
+            + [
+                self._ensemble_rows[ens].get(timestamp, np.array([], dtype=np.int64))
+                for ens in ensembles
+                if ens in self._ensemble_rows
+            ]
+        )
+
+    def cross_section(
+        self, dframe: pd.DataFrame, date, ensemble: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Rows of dframe at a date. dframe has to have the rows the index was made
+        from."""
+        return dframe.iloc[self.rows(date, ensemble)]
+
+
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def get_date_index(
+    smry_store: "SmryStore", ensembles: list, sampling: str = "raw"
+) -> DateIndex:
+    """Date index for the given ensembles in the store, as returned by `get`, and
+    resampled to the given frequency (see `resample_smry`). The index is the same
+    for all vectors, and is made from the ENSEMBLE, REAL and DATE columns alone.
+    """
+    index_df = smry_store.get([], ensembles)
+    # Not memoized, as the index itself is memoized
+    index_df = _resample(index_df, sampling)
+    return DateIndex(
+        index_df, source=f"{smry_store!r}[{ensembles!r}].resample({sampling!r})"
+    )
@@ -0,0 +1,81 @@
+import datetime
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+# Compact dtype mode for loaded ensemble data. Disabled by default. Set through
+# the shared setting `compact_dtypes` (see `set_compact_dtypes`).
+DTYPE_SETTINGS = {"compact": False, "float32": False}
+
+# Columns with few unique string values, stored as categoricals in compact mode
+LABEL_COLUMNS = ["ENSEMBLE", "ZONE", "REGION", "SOURCE"]
+
+
+def set_compact_dtypes(compact_dtypes: Union[bool, str, None]) -> None:
+    """Enables compact dtypes for frames returned by `load_smry`, `load_csv`,
+    `load_parameters` and `extract_volumes`. Given `True`, label columns are
+    stored as categoricals, REAL as the smallest integer type (int16 or int32)
+    and DATE as datetime64. Given `float32`, in addition all float64 columns are
+    stored as float32, at the cost of precision.
+    """
+    if compact_dtypes not in (None, False, True, "float32"):
+        raise ValueError(
+            f"Compact dtypes has to be either true, false or float32, "
+            f"got {compact_dtypes}."
+        )
+    DTYPE_SETTINGS["compact"] = bool(compact_dtypes)
+    DTYPE_SETTINGS["float32"] = compact_dtypes == "float32"
+
+
+def _is_string_column(column: pd.Series) -> bool:
+    return not isinstance(
+        column.dtype, pd.api.types.CategoricalDtype
+    ) and pd.api.types.is_string_dtype(column)
+
+
+def _is_datetime_objects(column: pd.Series) -> bool:
+    values = column.dropna()
+    return not values.empty and isinstance(values.iloc[0], datetime.date)
+
+
+def compact_frame(dframe: pd.DataFrame, float32: bool = False) -> pd.DataFrame:
+    """Returns a copy of the dataframe with compact dtypes (see `set_compact_dtypes`).
+    Columns that can not be converted without loss (e.g. REAL with missing values)
+    are kept as is.
+    """
+    dframe = dframe.copy()
+    for column in LABEL_COLUMNS:
+        if column in dframe and _is_string_column(dframe[column]):
+            dframe[column] = dframe[column].astype("category")
+    if "REAL" in dframe and pd.api.types.is_integer_dtype(dframe["REAL"]):
+        if dframe["REAL"].empty or (
+            dframe["REAL"].min() >= np.iinfo(np.int16).min
+            and dframe["REAL"].max() <= np.iinfo(np.int16).max
+        ):
+            dframe["REAL"] = dframe["REAL"].astype(np.int16)
+        else:
+            dframe["REAL"] = dframe["REAL"].astype(np.int32)
+    if (
+        "DATE" in dframe
+        and dframe["DATE"].dtype == object
+        and _is_datetime_objects(dframe["DATE"])
+    ):
+        # Dates outside of the datetime64[ns] range are kept as objects
+        try:
+            dframe["DATE"] = pd.to_datetime(dframe["DATE"])
+        except (ValueError, OverflowError):
+            pass
+    if float32:
+        columns = dframe.select_dtypes(include=[np.float64]).columns
+        dframe[columns] = dframe[columns].astype(np.float32)
+    return dframe
+
+
+def compact_dtypes(dframe: pd.DataFrame) -> pd.DataFrame:
+    """Applies compact dtypes to a loaded dataframe if enabled, otherwise the
+    dataframe is returned unchanged.
+    """
+    if not DTYPE_SETTINGS["compact"]:
+        return dframe
+    return compact_frame(dframe, float32=DTYPE_SETTINGS["float32"])
@@ -0,0 +1,134 @@
+import time
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+from webviz_config.common_cache import CACHE
+
+from .dtypes import compact_dtypes
+
+INDEX_COLUMNS = ["ENSEMBLE", "REAL", "DATE"]
+
+
+class EnsembleDataRegistry:
+    """Process wide registry of loaded summary data, shared between plugins.
+
+    For each key (typically ensemble, path and time index), a dataframe with the
+    vectors requested so far is kept. When a plugin requests vectors that are not
+    yet loaded, only the missing vectors are loaded, using the given loader, and
+    added to the registry. Each request is served a selection of the columns of the
+    registry dataframe. With copy-on-write in pandas (always enabled from pandas 3),
+    the selection shares the data with the registry, such that memory usage and
+    load time scale with the unique data rather than with the number of plugins.
+    Changing a served dataframe in place then copies the changed columns, and never
+    changes the data served to others.
+
+    Each key has a `version` (e.g. a fingerprint of the files the data is loaded
+    from), and the data of a key is dropped when it is requested with another
+    version, when it is invalidated (see `invalidate`), or when it has not been
+    requested for `timeout` seconds.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self._frames: dict = {}
+        self._versions: dict = {}
+        self._used: dict = {}
+
+    def _add(self, key: tuple, loaded: pd.DataFrame) -> None:
+        """Adds the vectors of a loaded dataframe, with the columns ENSEMBLE, REAL,
+        DATE and the vectors, to the dataframe of a key"""
+        loaded = compact_dtypes(loaded).reset_index(drop=True)
+        frame = self._frames.get(key)
+        if frame is None:
+            self._frames[key] = loaded
+        elif all(
+            np.array_equal(frame[column].to_numpy(), loaded[column].to_numpy())
+            for column in ["REAL", "DATE"]
+        ):
+            self._frames[key] = pd.concat(
+                [frame, loaded.drop(columns=INDEX_COLUMNS)], axis=1
+            )
+        else:
+            # Not the same rows as the vectors already loaded, align all vectors
+            self._frames[key] = compact_dtypes(
+                frame.drop(columns="ENSEMBLE")
+                .merge(
+                    loaded.drop(columns="ENSEMBLE"), on=["REAL", "DATE"], how="outer"
+                )
+                .assign(ENSEMBLE=frame["ENSEMBLE"].iloc[0])[
+                    INDEX_COLUMNS
+                    + [col for col in frame.columns if col not in INDEX_COLUMNS]
+                    + [col for col in loaded.columns if col not in INDEX_COLUMNS]
+                ]
+            )
+
+    def _drop(self, key: tuple) -> None:
+        for store in (self._frames, self._versions, self._used):
+            store.pop(key, None)
+
+    def _expire(self, key: tuple, version: Optional[str]) -> None:
+        """Drops data not used within the timeout, and the data of the key if it
+        has another version"""
+        if self.timeout is not None:
+            now = time.monotonic()
+            for old_key in [
+                old_key
+                for old_key, used in self._used.items()
+                if now - used > self.timeout
+            ]:
+                self._drop(old_key)
+        if key in self._frames and self._versions.get(key) != version:
+            self._drop(key)
+
+    def smry(
+        self,
+        key: tuple,
+        vectors: list,
+        loader: Optional[Callable[[list], pd.DataFrame]] = None,
+        version: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Summary data with the columns ENSEMBLE, REAL, DATE and the given vectors.
+        Vectors not already in the registry (for this `version` of the key) are
+        loaded by calling `loader` with the list of missing vectors, which has to
+        return a dataframe with the columns ENSEMBLE, REAL, DATE and (at least)
+        these vectors. If `loader` is None and any of the vectors are missing, None
+        is returned.
+        """
+        with self._lock:
+            self._expire(key, version)
+            frame = self._frames.get(key)
+            missing = [
+                vector for vector in vectors if frame is None or vector not in frame
+            ]
+            if missing or frame is None:
+                if loader is None:
+                    return None
+                loaded = loader(missing)
+                if loaded.empty:
+                    return loaded
+                self._add(key, loaded[INDEX_COLUMNS + missing])
+                self._versions[key] = version
+                frame = self._frames[key]
+            self._used[key] = time.monotonic()
+            return frame[INDEX_COLUMNS + vectors]
+
+    def invalidate(self, *key_start) -> None:
+        """Drops the data of all keys starting with the given values, e.g. all
+        time indices of an ensemble when its realizations have changed"""
+        with self._lock:
+            for key in [
+                key for key in self._frames if key[: len(key_start)] == key_start
+            ]:
+                self._drop(key)
+
+    def clear(self) -> None:
+        """Drops all data held by the registry"""
+        with self._lock:
+            for store in (self._frames, self._versions, self._used):
+                store.clear()
+
+
+ENSEMBLE_DATA = EnsembleDataRegistry(timeout=CACHE.TIMEOUT)
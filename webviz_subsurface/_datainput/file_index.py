@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import fnmatch
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+
+MAGIC = re.compile(r"[*?[]")
+
+
+class FileIndex:
+    """In-process index of directory listings, shared by everything that discovers
+    files in ensembles (realizations, surfaces, status files, well files etc.).
+
+    Each directory is listed once with `os.scandir`, and wildcard patterns are
+    matched against the cached listings. The directories needed on each level of a
+    pattern are listed in parallel, using a thread pool with `workers` threads.
+
+    A cached listing is only reused if the modification time of its directory is
+    unchanged, which costs a single `stat` per directory instead of a new listing.
+    The listings can be persisted to a snapshot file (see `set_snapshot`), which
+    callers write once after discovering files (see `save_snapshot`).
+    """
+
+    def __init__(self, workers: int = 8):
+        self.workers = workers
+        self._listings: dict = {}
+        self._snapshot: Optional[Path] = None
+        self._modified = False
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _scan(path: str) -> tuple:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with os.scandir(path) as entries:
+                return (
+                    mtime,
+                    {entry.name: entry.is_dir() for entry in entries},
+                )
+        except (NotADirectoryError, FileNotFoundError, PermissionError):
+            return (None, None)
+
+    def _is_valid(self, path: str) -> bool:
+        if path not in self._listings:
+            return False
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        return mtime == self._listings[path][0]
+
+    def listdir(self, path: str) -> Optional[dict]:
+        """Names in a directory, mapped to whether they are directories themselves.
+        Returns None if the path is not a directory.
+        """
+        return self._listdirs([path])[path]
+
+    def _listdirs(self, paths: list) -> dict:
+        with self._lock:
+            missing = [path for path in paths if not self._is_valid(path)]
+        if missing:
+            if len(missing) > 1 and self.workers is not None and self.workers > 1:
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    listings = list(executor.map(FileIndex._scan, missing))
+            else:
+                listings = [FileIndex._scan(path) for path in missing]
+            with self._lock:
+                self._listings.update(zip(missing, listings))
+                self._modified = True
+        with self._lock:
+            return {path: self._listings[path][1] for path in paths}
+
+    def glob(self, pattern: Union[str, Path]) -> list:
+        """Sorted paths matching the pattern, with the same wildcards as `glob.glob`
+        (except for the recursive `**`). Only directories containing wildcards, or
+        the final file name, are listed.
+        """
+        parts = Path(pattern).parts
+        if not parts:
+            return []
+        # Leading parts without wildcards are used as is. The last part is always
+        # matched against a listing, in order to only return existing paths.
+        first = next(
+            (i for i, part in enumerate(parts) if MAGIC.search(part)), len(parts) - 1
+        )
+        current = [os.path.join(*parts[:first]) if first > 0 else os.curdir]
+        remaining = parts[first:]
+        for level, part in enumerate(remaining):
+            is_last = level == len(remaining) - 1
+            listings = self._listdirs(current)
+            matches = []
+            for directory in current:
+                listing = listings[directory]
+                if not listing:
+                    continue
+                if MAGIC.search(part):
+                    names = [
+                        name
+                        for name in fnmatch.filter(listing, part)
+                        if not name.startswith(".") or part.startswith(".")
+                    ]
+                else:
+                    names = [part] if part in listing else []
+                matches.extend(
+                    os.path.join(directory, name)
+                    for name in names
+                    if is_last or listing[name]
+                )
+            current = matches
+        if first == 0:
+            return sorted(os.path.relpath(path) for path in current)
+        return sorted(current)
+
+    def glob_many(self, patterns: list) -> list:
+        """Matches for each of the patterns, found in parallel"""
+        if self.workers is None or self.workers <= 1 or len(patterns) <= 1:
+            return [self.glob(pattern) for pattern in patterns]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self.glob, patterns))
+
+    def set_snapshot(self, path: Optional[Union[str, Path]]) -> None:
+        """Persists listings to the given (JSON) file, and loads listings from it if
+        it exists. Loaded listings are revalidated against directory modification
+        times before use, as all other listings.
+        """
+        with self._lock:
+            self._snapshot = Path(path) if path is not None else None
+            if self._snapshot is None or not self._snapshot.exists():
+                return
+            try:
+                with open(self._snapshot, "r", encoding="utf-8") as fhandle:
+                    listings = json.load(fhandle)
+            except (OSError, ValueError):
+                return
+            for directory, (mtime, listing) in listings.items():
+                self._listings.setdefault(directory, (mtime, listing))
+
+    def save_snapshot(self) -> None:
+        """Writes the listings to the snapshot file, if any listings have changed
+        since it was loaded or last written
+        """
+        with self._lock:
+            if self._snapshot is None or not self._modified:
+                return
+            tmp_path = self._snapshot.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as fhandle:
+                    json.dump(self._listings, fhandle)
+                os.replace(tmp_path, self._snapshot)
+                self._modified = False
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+
+
+FILE_INDEX = FileIndex()
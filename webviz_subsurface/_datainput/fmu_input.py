@@ -1,16 +1,98 @@
-from pathlib import Path
+import os
 import glob
-from typing import Union, Optional
+from pathlib import Path
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Union, Optional, Callable
 
+import dateutil.parser
 import pandas as pd
-from fmu.ensemble import ScratchEnsemble, EnsembleSet
+from fmu.ensemble import ScratchEnsemble, ScratchRealization, EnsembleSet
+from fmu.ensemble.util.dates import unionize_smry_dates
 from webviz_config.common_cache import CACHE
 from webviz_config.webviz_store import webvizstore
 
+from .dtypes import compact_dtypes
+from .file_index import FILE_INDEX
+from .ensemble_registry import ENSEMBLE_DATA
+from .._utils.fingerprint_cache import hash_digest
+
+# Number of parallel workers used when loading ensembles. None or 1 gives
+# the default serial loading in fmu.ensemble. Set through the shared setting
+# `ensemble_loader_workers` (see `set_loader_workers`).
+LOADER_SETTINGS = {"workers": None}
+
+
+def set_loader_workers(workers: Optional[int]) -> None:
+    """Sets the number of parallel workers used by `load_ensemble_set`, `load_smry`
+    and `load_csv`. Realization discovery and csv files are read using a thread
+    pool, while summary files are parsed using a process pool. The same number of
+    workers is used for listing directories in the shared file index.
+    The output is independent of the number of workers.
+    """
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise ValueError(
+            f"Number of ensemble loader workers has to be a positive integer, "
+            f"got {workers}."
+        )
+    LOADER_SETTINGS["workers"] = workers
+    FILE_INDEX.workers = workers
+
+
+def _parallel_workers() -> Optional[int]:
+    workers = LOADER_SETTINGS["workers"]
+    return workers if workers is not None and workers > 1 else None
+
+
+def _map_ordered(
+    func: Callable, items: list, executor_class, workers: Optional[int]
+) -> list:
+    """Maps func over items using an executor, returning results in input order.
+    If workers is None the items are processed serially.
+    """
+    if workers is None:
+        return [func(item) for item in items]
+    with executor_class(max_workers=workers) as executor:
+        return list(executor.map(func, items))
+
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
 def scratch_ensemble(ensemble_name: str, ensemble_path: Path):
-    return ScratchEnsemble(ensemble_name, ensemble_path)
+    return _scratch_ensembles({ensemble_name: ensemble_path}, _parallel_workers())[0]
+
+
+def _scratch_ensembles(ensemble_paths: dict, workers: Optional[int]) -> list:
+    """Discovers the realization directories of all ensembles through the shared
+    file index, and returns ScratchEnsembles with these realizations added. The
+    realizations are initialized using a thread pool if workers is not None, and
+    are then added in order of realization index, such that the ensembles (and
+    data loaded from them) are the same for any number of workers.
+    """
+    realdirs = [
+        (ens_name, realdir)
+        for ens_name, ens_path in ensemble_paths.items()
+        for realdir in FILE_INDEX.glob(ens_path)
+    ]
+    FILE_INDEX.save_snapshot()
+    realizations = _map_ordered(
+        lambda realdir: ScratchRealization(realdir[1]),
+        realdirs,
+        ThreadPoolExecutor,
+        workers,
+    )
+    ensembles = {ens_name: ScratchEnsemble(ens_name) for ens_name in ensemble_paths}
+    for (ens_name, _), realization in sorted(
+        (
+            (realdir, realization)
+            for realdir, realization in zip(realdirs, realizations)
+            # As in ScratchEnsemble.add_realizations, directories without a
+            # realization index are skipped
+            if realization.index is not None
+        ),
+        key=lambda item: item[1].index,
+    ):
+        ensembles[ens_name].realizations[realization.index] = realization
+    return list(ensembles.values())
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
@@ -19,15 +101,113 @@ def load_ensemble_set(
     ensemble_set_name: str = "EnsembleSet",
     filter_file: Union[str, None] = "OK",
 ):
+    ensembles = _scratch_ensembles(ensemble_paths, _parallel_workers())
     return EnsembleSet(
         ensemble_set_name,
+        [ens if filter_file is None else ens.filter(filter_file) for ens in ensembles],
+    )
+
+
+def _realization_eclsum_dates(runpath_and_index: tuple) -> Optional[list]:
+    runpath, index = runpath_and_index
+    eclsum = ScratchRealization(runpath, index=index).get_eclsum()
+    return None if eclsum is None else eclsum.dates
+
+
+def _realization_smry(
+    runpath_and_index: tuple, time_index: Optional[list], column_keys: Optional[list]
+) -> pd.DataFrame:
+    runpath, index = runpath_and_index
+    return ScratchRealization(runpath, index=index).get_smry(
+        time_index=time_index, column_keys=column_keys
+    )
+
+
+def _get_smry_parallel(
+    ensemble: ScratchEnsemble,
+    time_index: Optional[Union[list, str]],
+    column_keys: Optional[list],
+    workers: int,
+) -> pd.DataFrame:
+    """Equivalent of ScratchEnsemble.get_smry, where the summary files are parsed
+    in a process pool. Realizations are ordered by realization index.
+
+    For a frequency time index, the dates of all summary files are collected in
+    the pool, and combined the same way as ScratchEnsemble.get_smry_dates does.
+    """
+    runpaths = [
+        (realization.runpath(), index)
+        for index, realization in sorted(ensemble.realizations.items())
+    ]
+    if isinstance(time_index, str):
+        try:
+            time_index = [dateutil.parser.isoparse(time_index)]
+        except ValueError:
+            time_index = unionize_smry_dates(
+                [
+                    dates
+                    for dates in _map_ordered(
+                        _realization_eclsum_dates,
+                        runpaths,
+                        ProcessPoolExecutor,
+                        workers,
+                    )
+                    if dates
+                ],
+                time_index,
+                normalize=True,
+            )
+    frames = _map_ordered(
+        partial(_realization_smry, time_index=time_index, column_keys=column_keys),
+        runpaths,
+        ProcessPoolExecutor,
+        workers,
+    )
+    for (_, index), dframe in zip(runpaths, frames):
+        dframe.insert(0, "REAL", index)
+        dframe.index.name = "DATE"
+    if frames:
+        return pd.concat(frames, sort=False).reset_index()
+    return pd.DataFrame()
+
+
+def get_ensemble_smry(
+    ensemble: ScratchEnsemble,
+    time_index: Optional[Union[list, str]] = None,
+    column_keys: Optional[list] = None,
+) -> pd.DataFrame:
+    """Summary data for a single ensemble, loaded in parallel if enabled
+    (see `set_loader_workers`).
+    """
+    workers = _parallel_workers()
+    if workers is None:
+        return ensemble.get_smry(time_index=time_index, column_keys=column_keys)
+    return _get_smry_parallel(ensemble, time_index, column_keys, workers)
+
+
+def _load_csv_parallel(
+    ensemble_set: EnsembleSet, csv_file: str, workers: int
+) -> pd.DataFrame:
+    """Equivalent of EnsembleSet.load_csv, where the csv files are read in a thread pool"""
+
+    def _load_realization_csv(realization):
+        try:
+            realization.load_csv(csv_file)
+        except IOError:
+            # As in fmu.ensemble, files are allowed to be missing in some realizations
+            pass
+
+    _map_ordered(
+        _load_realization_csv,
         [
-            ScratchEnsemble(ens_name, ens_path)
-            if filter_file is None
-            else ScratchEnsemble(ens_name, ens_path).filter(filter_file)
-            for ens_name, ens_path in ensemble_paths.items()
+            realization
+            for ens_name in ensemble_set.ensemblenames
+            for realization in ensemble_set[ens_name].realizations.values()
         ],
+        ThreadPoolExecutor,
+        workers,
     )
+    return ensemble_set.get_df(csv_file)
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
@@ -37,7 +217,9 @@ def load_parameters(
     ensemble_set_name: str = "EnsembleSet",
     filter_file: Union[str, None] = "OK",
 ) -> pd.DataFrame:
-    return load_ensemble_set(ensemble_paths, ensemble_set_name, filter_file).parameters
+    return compact_dtypes(
+        load_ensemble_set(ensemble_paths, ensemble_set_name, filter_file).parameters
+    )
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
@@ -46,10 +228,42 @@ def load_csv(
     ensemble_paths: dict, csv_file: str, ensemble_set_name: str = "EnsembleSet"
 ) -> pd.DataFrame:
 
-    return load_ensemble_set(ensemble_paths, ensemble_set_name).load_csv(csv_file)
+    ensemble_set = load_ensemble_set(ensemble_paths, ensemble_set_name)
+    workers = _parallel_workers()
+    if workers is None:
+        return compact_dtypes(ensemble_set.load_csv(csv_file))
+    return compact_dtypes(_load_csv_parallel(ensemble_set, csv_file, workers))
+
+
+def registry_smry(
+    ensemble: ScratchEnsemble,
+    ensemble_path: Union[str, Path],
+    time_index: Optional[Union[list, str]] = None,
+    column_keys: Optional[list] = None,
+    load: bool = True,
+) -> Optional[pd.DataFrame]:
+    """Summary data for a single ensemble, with columns ENSEMBLE, REAL, DATE and
+    the vectors matching `column_keys`, served from the process wide ensemble data
+    registry (see `EnsembleDataRegistry`). Only vectors not already in the
+    registry are loaded, unless `load` is False, in which case None is returned if
+    any of the vectors are missing. Data in the registry is reloaded if the summary
+    files of the ensemble have changed (see `ensemble_fingerprint`).
+    """
+
+    def _load(vectors: list) -> pd.DataFrame:
+        dframe = get_ensemble_smry(ensemble, time_index=time_index, column_keys=vectors)
+        if not dframe.empty:
+            dframe.insert(0, "ENSEMBLE", ensemble.name)
+        return dframe
+
+    return ENSEMBLE_DATA.smry(
+        (ensemble.name, str(ensemble_path), repr(time_index)),
+        sorted(ensemble.get_smrykeys(vector_match=column_keys)),
+        _load if load else None,
+        version=ensemble_fingerprint(ensemble),
+    )
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
 @webvizstore
 def load_smry(
     ensemble_paths: dict,
@@ -57,10 +271,26 @@ def load_smry(
     time_index: Optional[Union[list, str]] = None,
     column_keys: Optional[list] = None,
 ) -> pd.DataFrame:
-
-    return load_ensemble_set(ensemble_paths, ensemble_set_name).get_smry(
-        time_index=time_index, column_keys=column_keys
-    )
+    """Summary data for all ensembles in the ensemble set. The data is served from
+    the process wide ensemble data registry, such that vectors shared between
+    plugins are only loaded and held in memory once (see `registry_smry`). This is
+    not memoized, as the registry already holds the data. A single ensemble is
+    served without copying the data (see `EnsembleDataRegistry` for changing it),
+    while several ensembles are concatenated.
+    """
+    ensemble_set = load_ensemble_set(ensemble_paths, ensemble_set_name)
+    dfs = [
+        dframe
+        for dframe in (
+            registry_smry(ensemble_set[ens_name], ens_path, time_index, column_keys)
+            for ens_name, ens_path in ensemble_paths.items()
+            if ens_name in ensemble_set.ensemblenames
+        )
+        if not dframe.empty
+    ]
+    if len(dfs) == 1:
+        return dfs[0]
+    return compact_dtypes(pd.concat(dfs, sort=False)) if dfs else pd.DataFrame()
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
@@ -138,7 +368,7 @@ def find_surfaces(ensemble_paths: dict, suffix="*.gri", delimiter="--") -> pd.Da
     files = []
     for path in ensemble_paths.values():
         path = Path(path)
-        for realpath in glob.glob(str(path / "share" / "results" / "maps" / suffix)):
+        for realpath in FILE_INDEX.glob(path / "share" / "results" / "maps" / suffix):
             stem = Path(realpath).stem.split(delimiter)
             if len(stem) >= 2:
                 files.append(
@@ -149,6 +379,292 @@ def find_surfaces(ensemble_paths: dict, suffix="*.gri", delimiter="--") -> pd.Da
                         "date": stem[2] if len(stem) >= 3 else None,
                     }
                 )
+    FILE_INDEX.save_snapshot()
 
     # Store surface name, attribute and date as Pandas dataframe
     return pd.DataFrame(files)
+
+
+def _realization_smry_files(realization: ScratchRealization) -> list:
+    """Summary files of a realization, found the same way as in
+    ScratchRealization.get_eclsum: an UNSMRY file already registered in the
+    realization, or else the first match of eclipse/model/*.UNSMRY, and the
+    SMSPEC file next to it.
+    """
+    unsmry = realization.files[realization.files["FILETYPE"] == "UNSMRY"]
+    if len(unsmry) == 1:
+        unsmry_file = unsmry["FULLPATH"].values[0]
+    else:
+        matches = glob.glob(
+            os.path.join(realization.runpath(), "eclipse", "model", "*.UNSMRY")
+        )
+        if not matches:
+            return []
+        unsmry_file = matches[0]
+    return [unsmry_file, os.path.splitext(unsmry_file)[0] + ".SMSPEC"]
+
+
+def realization_fingerprint(
+    realization: ScratchRealization,
+    csv_files: Optional[list] = None,
+    filter_file: Optional[str] = "OK",
+) -> tuple:
+    """Returns a fingerprint of the files in a realization that the loaded data is
+    based on, i.e. modification time and size of the filter file (e.g. OK),
+    parameters.txt, the summary files and the given csv files. Missing files are
+    included with None values.
+    """
+    runpath = realization.runpath()
+    files = ([filter_file] if filter_file is not None else []) + ["parameters.txt"]
+    files.extend(csv_files if csv_files is not None else [])
+    files.extend(
+        os.path.relpath(path, runpath) for path in _realization_smry_files(realization)
+    )
+    fingerprint = []
+    for localpath in files:
+        try:
+            stat = os.stat(os.path.join(runpath, localpath))
+            fingerprint.append((localpath, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            fingerprint.append((localpath, None, None))
+    return tuple(fingerprint)
+
+
+def ensemble_fingerprint(ensemble: ScratchEnsemble) -> str:
+    """Fingerprint of the parameters and summary files of all realizations in an
+    ensemble (see `realization_fingerprint`)"""
+    return hash_digest(
+        repr(
+            [
+                (index, realization.runpath())
+                + realization_fingerprint(realization, filter_file=None)
+                for index, realization in sorted(ensemble.realizations.items())
+            ]
+        ).encode()
+    )
+
+
+def _load_realization(
+    runpath_and_index: tuple,
+    time_index: Optional[Union[list, str]],
+    column_keys: Optional[list],
+    csv_files: list,
+) -> dict:
+    """Loads summary data, parameters and csv files for a single realization"""
+    runpath, index = runpath_and_index
+    realization = ScratchRealization(runpath, index=index)
+    data = {}
+    smry = realization.get_smry(time_index=time_index, column_keys=column_keys)
+    smry.index.name = "DATE"
+    data["smry"] = smry.reset_index()
+    try:
+        data["parameters"] = pd.DataFrame([realization.parameters])
+    except KeyError:
+        data["parameters"] = pd.DataFrame(index=[0])
+    for csv_file in csv_files:
+        try:
+            data[csv_file] = realization.load_csv(csv_file)
+        except IOError:
+            pass
+    return data
+
+
+class IncrementalEnsembleLoader:
+    """Summary data, parameters and csv files for a set of ensembles, that can be
+    refreshed while the application is running. On `refresh()`, only realizations
+    that are new, or where any of the underlying files have been modified (see
+    `realization_fingerprint`), are read from disk. Realizations that have been
+    deleted, or no longer have the filter file, are dropped.
+
+    Realizations are read in parallel if enabled (see `set_loader_workers`).
+    If `time_index` is a frequency (e.g. `monthly`) and a new or changed realization
+    changes the dates of its ensemble, the whole ensemble is reloaded, in order to
+    have the same dates for all realizations.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        ensemble_paths: dict,
+        time_index: Optional[Union[list, str]] = None,
+        column_keys: Optional[list] = None,
+        csv_files: Optional[list] = None,
+        filter_file: Optional[str] = "OK",
+    ):
+        self.ensemble_paths = ensemble_paths
+        self.time_index = time_index
+        self.column_keys = column_keys
+        self.csv_files = csv_files if csv_files is not None else []
+        self.filter_file = filter_file
+        self._realizations: dict = {}
+        self._fingerprints: dict = {}
+        self._real_dates: dict = {}
+        self._ens_dates: dict = {}
+        self._data: dict = {}
+        self._frames: dict = {}
+        self.refresh()
+
+    @property
+    def _frequency(self) -> Optional[str]:
+        if not isinstance(self.time_index, str):
+            return None
+        try:
+            dateutil.parser.isoparse(self.time_index)
+            return None
+        except ValueError:
+            return self.time_index
+
+    def _discover(self) -> dict:
+        """Current realizations with the filter file, as (ensemble, index) mapped
+        to the realization and its fingerprint. Realizations are only initialized
+        when their runpath is new.
+        """
+        runpaths = {
+            realization.runpath(): realization
+            for realization in self._realizations.values()
+        }
+        current = {}
+        for ens_name, ens_path in self.ensemble_paths.items():
+            for runpath in FILE_INDEX.glob(ens_path):
+                realization = runpaths.get(os.path.abspath(runpath))
+                if realization is None:
+                    realization = ScratchRealization(runpath)
+                if realization.index is None:
+                    continue
+                fingerprint = realization_fingerprint(
+                    realization, self.csv_files, self.filter_file
+                )
+                if self.filter_file is None or fingerprint[0][1] is not None:
+                    current[(ens_name, realization.index)] = (realization, fingerprint)
+        FILE_INDEX.save_snapshot()
+        return current
+
+    def _ensemble_dates(self, ens_name: str) -> list:
+        return unionize_smry_dates(
+            [
+                dates
+                for (ens, _), dates in sorted(self._real_dates.items())
+                if ens == ens_name and dates
+            ],
+            self._frequency,
+            normalize=True,
+        )
+
+    def _update_dates(self, reload: list) -> list:
+        """Updates the summary dates of the realizations to reload, and returns
+        the realizations of ensembles where the dates have changed, which also need
+        to be reloaded.
+        """
+        self._real_dates.update(
+            zip(
+                reload,
+                _map_ordered(
+                    _realization_eclsum_dates,
+                    [(self._realizations[key].runpath(), key[1]) for key in reload],
+                    ProcessPoolExecutor,
+                    _parallel_workers(),
+                ),
+            )
+        )
+        extended = []
+        for ens_name in self.ensemble_paths:
+            ens_dates = self._ensemble_dates(ens_name)
+            if ens_dates != self._ens_dates.get(ens_name, ens_dates):
+                extended.extend(
+                    key
+                    for key in self._realizations
+                    if key[0] == ens_name and key not in reload
+                )
+            self._ens_dates[ens_name] = ens_dates
+        return extended
+
+    def _load(self, reload: list) -> None:
+        for ens_name in self.ensemble_paths:
+            ens_reload = [key for key in reload if key[0] == ens_name]
+            self._data.update(
+                zip(
+                    ens_reload,
+                    _map_ordered(
+                        partial(
+                            _load_realization,
+                            time_index=(
+                                self.time_index
+                                if self._frequency is None
+                                else self._ens_dates[ens_name]
+                            ),
+                            column_keys=self.column_keys,
+                            csv_files=self.csv_files,
+                        ),
+                        [
+                            (self._realizations[key].runpath(), key[1])
+                            for key in ens_reload
+                        ],
+                        ProcessPoolExecutor,
+                        _parallel_workers(),
+                    ),
+                )
+            )
+
+    def refresh(self) -> dict:
+        """Reloads new and changed realizations, and drops removed realizations.
+        Returns a dictionary with lists of (ensemble, realization) tuples that
+        have been `added`, `changed` and `removed`.
+        """
+        current = self._discover()
+        removed = [key for key in self._fingerprints if key not in current]
+        added = [key for key in current if key not in self._fingerprints]
+        changed = [
+            key
+            for key, (_, fingerprint) in current.items()
+            if key in self._fingerprints and fingerprint != self._fingerprints[key]
+        ]
+        for key in removed:
+            for store in (self._fingerprints, self._real_dates, self._data):
+                store.pop(key, None)
+        self._realizations = {
+            key: realization for key, (realization, _) in current.items()
+        }
+        reload = added + changed
+        if self._frequency is not None:
+            reload.extend(self._update_dates(reload))
+        self._load(reload)
+        self._fingerprints.update({key: current[key][1] for key in reload})
+        if reload or removed:
+            self._frames = {}
+        # Summary data of changed ensembles shared through the registry is stale
+        for ens_name in {key[0] for key in reload + removed}:
+            ENSEMBLE_DATA.invalidate(ens_name, str(self.ensemble_paths[ens_name]))
+        return {"added": added, "changed": changed, "removed": removed}
+
+    def _get_frame(self, name: str) -> pd.DataFrame:
+        if name not in self._frames:
+            dfs = []
+            for ens_name in self.ensemble_paths:
+                for (ens, real), data in sorted(self._data.items()):
+                    if ens == ens_name and name in data:
+                        dframe = data[name].copy()
+                        dframe.insert(0, "REAL", real)
+                        dframe.insert(0, "ENSEMBLE", ens)
+                        dfs.append(dframe)
+            self._frames[name] = (
+                compact_dtypes(pd.concat(dfs, sort=False, ignore_index=True))
+                if dfs
+                else pd.DataFrame()
+            )
+        return self._frames[name]
+
+    @property
+    def smry(self) -> pd.DataFrame:
+        """Summary data with columns ENSEMBLE, REAL, DATE and the vectors"""
+        return self._get_frame("smry")
+
+    @property
+    def parameters(self) -> pd.DataFrame:
+        """Parameters with columns ENSEMBLE, REAL and the parameters"""
+        return self._get_frame("parameters")
+
+    def csv(self, csv_file: str) -> pd.DataFrame:
+        """Aggregated csv file with columns ENSEMBLE and REAL added"""
+        if csv_file not in self.csv_files:
+            raise KeyError(f"{csv_file} is not one of the loaded csv files")
+        return self._get_frame(csv_file)
@@ -1,14 +1,11 @@
 import os
 
 import pandas as pd
-import fmu.ensemble
 from webviz_config.common_cache import CACHE
 from webviz_config.webviz_store import webvizstore
 
-
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def scratch_ensemble(ensemble_name, ensemble_path):
-    return fmu.ensemble.ScratchEnsemble(ensemble_name, ensemble_path)
+from .dtypes import compact_dtypes
+from .fmu_input import scratch_ensemble
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
@@ -39,4 +36,4 @@ def extract_volumes(ensemble_paths, volfolder, volfiles) -> pd.DataFrame:
             f"Error when aggregating inplace volumetric files: {list(volfiles)}. "
             f"Ensure that the files are present in relative folder {volfolder}"
         )
-    return pd.concat(dfs)
+    return compact_dtypes(pd.concat(dfs))
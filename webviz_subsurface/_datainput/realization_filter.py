@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+
+class RealizationFilter:
+    """Selects realizations from parameter ranges, given parameters on the format
+    given by `load_parameters` (ENSEMBLE, REAL and one column per parameter).
+
+    The values of each numeric parameter are sorted once per ensemble, such that
+    the realizations within a range are found by bisection. A selection is a boolean
+    mask over the realizations of an ensemble (in `reals` order), and selections on
+    several parameters are combined with `&`.
+    """
+
+    def __init__(self, parameters: pd.DataFrame):
+        self.parameters = [
+            col
+            for col in parameters.columns
+            if col not in ["ENSEMBLE", "REAL"]
+            and pd.api.types.is_numeric_dtype(parameters[col])
+        ]
+        self._reals = {}
+        self._sorted = {}
+        for ensemble, ens_df in parameters.groupby(
+            "ENSEMBLE", observed=True, sort=False
+        ):
+            ens_df = ens_df.sort_values("REAL")
+            self._reals[ensemble] = ens_df["REAL"].values.astype(np.int64)
+            values = ens_df[self.parameters].values.astype(np.float64)
+            order = np.argsort(values, axis=0, kind="mergesort")
+            # Per parameter: realization positions sorted by value, and the values
+            self._sorted[ensemble] = (order, np.take_along_axis(values, order, axis=0))
+        self._position = {parameter: i for i, parameter in enumerate(self.parameters)}
+
+    @property
+    def ensembles(self) -> list:
+        return list(self._reals)
+
+    def reals(self, ensemble: str) -> np.ndarray:
+        return self._reals[ensemble]
+
+    def parameter_range(self, parameter: str) -> tuple:
+        """Smallest and largest value of a parameter in all ensembles"""
+        column = self._position[parameter]
+        values = np.concatenate(
+            [sorted_values[:, column] for _, sorted_values in self._sorted.values()]
+        )
+        return np.nanmin(values), np.nanmax(values)
+
+    def mask(self, ensemble: str, ranges: dict) -> np.ndarray:
+        """Mask over the realizations of an ensemble, which is True for
+        realizations where each parameter in `ranges` (parameter name to
+        (low, high), both inclusive) is within its range. Realizations with a
+        missing value for a parameter are not selected.
+        """
+        order, sorted_values = self._sorted[ensemble]
+        mask = np.ones(len(self._reals[ensemble]), dtype=bool)
+        for parameter, (low, high) in ranges.items():
+            column = self._position[parameter]
+            # NaN values are sorted last, and are never within the range
+            start = np.searchsorted(sorted_values[:, column], low, side="left")
+            stop = np.searchsorted(sorted_values[:, column], high, side="right")
+            in_range = np.zeros(len(mask), dtype=bool)
+            in_range[order[start:stop, column]] = True
+            mask &= in_range
+        return mask
+
+    def realizations(self, ensemble: str, ranges: dict) -> np.ndarray:
+        """Realizations of an ensemble within the parameter ranges, or None for
+        ensembles without parameters (which are not filtered)."""
+        if ensemble not in self._reals:
+            return None
+        return self._reals[ensemble][self.mask(ensemble, ranges)]
@@ -0,0 +1,321 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .._utils.ensemble_statistics import STATISTICS, nan_statistics
+from .._utils.fingerprint_cache import hash_digest
+
+if TYPE_CHECKING:
+    # Only for annotations, as the store depends on pyarrow
+    from .smry_store import SmryStore
+
+
+class EnsembleCube:
+    """Summary data for a single ensemble as a dense array with axes
+    (REAL, DATE, VECTOR). Realizations without a value for a date are NaN, and
+    marked as not `present`. Positions along each axis are given by the index maps
+    `real_index`, `date_index` and `vector_index`.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        reals: np.ndarray,
+        dates: np.ndarray,
+        vectors: list,
+        values: np.ndarray,
+        present: np.ndarray,
+    ):
+        self.reals = np.asarray(reals)
+        self.dates = np.asarray(dates, dtype="datetime64[ns]")
+        self.vectors = list(vectors)
+        self.values = values
+        self.present = present
+        self.real_index = {real: i for i, real in enumerate(self.reals.tolist())}
+        self.date_index = {date: i for i, date in enumerate(self.dates)}
+        self.vector_index = {vector: i for i, vector in enumerate(self.vectors)}
+
+    @classmethod
+    def from_frame(
+        cls, dframe: pd.DataFrame, vectors: list, values: Optional[np.ndarray] = None
+    ) -> "EnsembleCube":
+        """Makes a cube from a dataframe with REAL, DATE and vector columns. The
+        values are written to `values` if given (e.g. a memory-mapped array).
+        """
+        reals, real_pos = np.unique(np.asarray(dframe["REAL"]), return_inverse=True)
+        dates, date_pos = np.unique(
+            pd.to_datetime(dframe["DATE"]).values, return_inverse=True
+        )
+        cube = cls.empty(reals, dates, vectors, values)
+        cube.present[real_pos, date_pos] = True
+        for i, vector in enumerate(vectors):
+            cube.values[real_pos, date_pos, i] = dframe[vector].values
+        return cube
+
+    @classmethod
+    def empty(
+        cls,
+        reals: np.ndarray,
+        dates: np.ndarray,
+        vectors: list,
+        values: Optional[np.ndarray] = None,
+    ) -> "EnsembleCube":
+        shape = (len(reals), len(dates), len(vectors))
+        if values is None:
+            values = np.empty(shape)
+        values[...] = np.nan
+        return cls(reals, dates, vectors, values, np.zeros(shape[:2], dtype=bool))
+
+    def vector(self, vector: str) -> np.ndarray:
+        """Values of a single vector, with axes (REAL, DATE)"""
+        return self.values[:, :, self.vector_index[vector]]
+
+    def subset(self, vectors: list) -> "EnsembleCube":
+        return EnsembleCube(
+            self.reals,
+            self.dates,
+            vectors,
+            self.values[:, :, [self.vector_index[vector] for vector in vectors]],
+            self.present,
+        )
+
+    def select_reals(self, reals: np.ndarray) -> "EnsembleCube":
+        """Cube with the given realizations, where present in the cube"""
+        mask = np.isin(self.reals, reals)
+        return EnsembleCube(
+            self.reals[mask],
+            self.dates,
+            self.vectors,
+            self.values[mask],
+            self.present[mask],
+        )
+
+    def reindex(self, reals: np.ndarray, dates: np.ndarray) -> "EnsembleCube":
+        """Cube with the given realizations and dates, where missing values are NaN"""
+        cube = EnsembleCube.empty(reals, dates, self.vectors)
+        real_pos = [cube.real_index[real] for real in self.reals.tolist()]
+        date_pos = [cube.date_index[date] for date in self.dates]
+        cube.values[np.ix_(real_pos, date_pos)] = self.values
+        cube.present[np.ix_(real_pos, date_pos)] = self.present
+        return cube
+
+    def statistics(self, vector: str) -> pd.DataFrame:
+        """Statistics over realizations per date, for dates where at least one
+        realization has a value. Columns are given by `STATISTICS`.
+        """
+        has_value = self.present.any(axis=0)
+        return pd.DataFrame(
+            nan_statistics(self.vector(vector)[:, has_value]).T,
+            columns=STATISTICS,
+            index=pd.DatetimeIndex(self.dates[has_value], name="DATE"),
+        )
+
+    def all_statistics(self) -> tuple:
+        """Statistics for all vectors in one pass. Returns the dates where at least
+        one realization has a value, and an array with axes (STATISTIC, DATE, VECTOR).
+        """
+        has_value = self.present.any(axis=0)
+        return (
+            self.dates[has_value],
+            nan_statistics(self.values[:, has_value]),
+        )
+
+
+def _read_values(
+    store: "SmryStore",
+    rows: slice,
+    positions: tuple,
+    shape: tuple,
+    path: Optional[Path],
+) -> np.ndarray:
+    """Reads all vectors of the given rows of the store into an array with axes
+    (REAL, DATE, VECTOR), at the given (REAL, DATE) positions. If `path` is given,
+    the array is written to a temporary file which is renamed to `path` when
+    complete, and returned memory-mapped (read-only) from `path`.
+    """
+    if path is None:
+        values = np.full(shape, np.nan)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        values = np.lib.format.open_memmap(str(tmp_path), mode="w+", shape=shape)
+        values[...] = np.nan
+    for i, vector in enumerate(store.vectors):
+        values[positions + (i,)] = store.vector_values(vector)[rows]
+    if path is None:
+        return values
+    values.flush()
+    del values
+    # Replace atomically, as several processes may be building the same cube
+    os.replace(tmp_path, path)
+    return np.load(str(path), mmap_mode="r")
+
+
+class SmryCube:
+    """Summary data for a set of ensembles, stored as one `EnsembleCube` per
+    ensemble. Filtering on ensembles and vectors is slicing, and statistics are
+    reductions along the realization axis, instead of pandas group-bys on long
+    format frames.
+
+    `source` identifies the data, and is used as cache key when memoizing functions
+    taking a cube as argument.
+    """
+
+    def __init__(self, ensembles: dict, source: str):
+        self.cubes = ensembles
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"SmryCube({self.source})"
+
+    @classmethod
+    def from_store(
+        cls, store: "SmryStore", mmap_folder: Optional[Union[str, Path]] = None
+    ) -> "SmryCube":
+        """Reads all vectors in the store into cubes, one vector at a time. Note that
+        all vectors are read up front, unlike the store itself which reads vectors
+        when they are first used. This is the cost of having filtering and
+        statistics as array operations.
+
+        If `mmap_folder` is given, the cubes are memory-mapped files in that folder,
+        such that only the parts in use are held in memory. The files are named
+        after the store content, and written to a temporary file which is then
+        renamed, such that processes sharing the folder reuse complete files
+        instead of reading the vectors again, and never see partly written files.
+        """
+        digest = hash_digest(repr(store).encode())
+        cubes = {}
+        for ens_no, ensemble in enumerate(store.ensembles):
+            index_df = store.get([], [ensemble])
+            reals, real_pos = np.unique(
+                np.asarray(index_df["REAL"]), return_inverse=True
+            )
+            dates, date_pos = np.unique(
+                pd.to_datetime(index_df["DATE"]).values, return_inverse=True
+            )
+            path = (
+                None
+                if mmap_folder is None
+                else Path(mmap_folder) / f"{digest}-{ens_no}.npy"
+            )
+            if path is not None and path.exists():
+                # Complete file from another process, or an earlier start
+                values = np.load(str(path), mmap_mode="r")
+            else:
+                values = _read_values(
+                    store,
+                    store.ensemble_rows(ensemble),
+                    (real_pos, date_pos),
+                    (len(reals), len(dates), len(store.vectors)),
+                    path,
+                )
+            present = np.zeros(values.shape[:2], dtype=bool)
+            present[real_pos, date_pos] = True
+            cubes[ensemble] = EnsembleCube(reals, dates, store.vectors, values, present)
+        return cls(cubes, source=repr(store))
+
+    @classmethod
+    def from_frame(cls, dframe: pd.DataFrame, source: str) -> "SmryCube":
+        """Makes cubes from a dataframe on the format given by `load_smry`"""
+        vectors = [
+            col for col in dframe.columns if col not in ["ENSEMBLE", "REAL", "DATE"]
+        ]
+        return cls(
+            {
+                ensemble: EnsembleCube.from_frame(ens_df, vectors)
+                for ensemble, ens_df in dframe.groupby(
+                    "ENSEMBLE", observed=True, sort=False
+                )
+            },
+            source=source,
+        )
+
+    @staticmethod
+    def default_mmap_folder() -> Path:
+        return Path(tempfile.gettempdir()) / "webviz_subsurface_smry_cube"
+
+    @property
+    def ensembles(self) -> list:
+        return list(self.cubes)
+
+    @property
+    def vectors(self) -> list:
+        return next(iter(self.cubes.values())).vectors if self.cubes else []
+
+    def subset(self, ensembles: list, vectors: list) -> "SmryCube":
+        """Cube with the given ensembles and vectors. Vector values are copied,
+        such that the subset does not depend on a memory-mapped parent.
+        """
+        return SmryCube(
+            {
+                ensemble: self.cubes[ensemble].subset(vectors)
+                for ensemble in ensembles
+                if ensemble in self.cubes
+            },
+            source=f"{self.source}[{ensembles!r},{vectors!r}]",
+        )
+
+    def select_realizations(self, realizations: dict) -> "SmryCube":
+        """Cube with only the given realizations (as a dictionary of ensemble and
+        realizations) of each ensemble. Ensembles not in `realizations` are kept
+        with all realizations.
+        """
+        selected = {
+            ensemble: list(map(int, reals)) for ensemble, reals in realizations.items()
+        }
+        return SmryCube(
+            {
+                ensemble: cube.select_reals(selected[ensemble])
+                if ensemble in selected
+                else cube
+                for ensemble, cube in self.cubes.items()
+            },
+            source=f"{self.source}.select_realizations({selected!r})",
+        )
+
+    def delta(self, base_ens: str, delta_ens: str) -> "SmryCube":
+        """Difference between two ensembles, for the union of realizations and
+        dates. Values missing in one of the ensembles give zero difference.
+        """
+        base, delta = self.cubes[base_ens], self.cubes[delta_ens]
+        reals = np.union1d(base.reals, delta.reals)
+        dates = np.union1d(base.dates, delta.dates)
+        base, delta = base.reindex(reals, dates), delta.reindex(reals, dates)
+        base.present = base.present | delta.present
+        base.values = np.nan_to_num(base.values - delta.values)
+        base.values[~base.present] = np.nan
+        return SmryCube(
+            {f"({base_ens}) - ({delta_ens})": base},
+            source=f"{self.source}.delta({base_ens!r},{delta_ens!r})",
+        )
+
+    def values_at_date(self, vector: str, date: str) -> dict:
+        """Values per ensemble at a date, given as string as in plotly clickData"""
+        try:
+            timestamp = pd.Timestamp(date).to_datetime64()
+        except (TypeError, ValueError):
+            return {}
+        values = {}
+        for ensemble, cube in self.cubes.items():
+            date_no = cube.date_index.get(timestamp)
+            if date_no is not None:
+                values[ensemble] = cube.vector(vector)[
+                    cube.present[:, date_no], date_no
+                ]
+        return values
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long format dataframe with ENSEMBLE, REAL, DATE and vector columns"""
+        dfs = []
+        for ensemble, cube in self.cubes.items():
+            real_pos, date_pos = np.nonzero(cube.present)
+            dframe = pd.DataFrame(cube.values[real_pos, date_pos], columns=cube.vectors)
+            dframe.insert(0, "DATE", cube.dates[date_pos])
+            dframe.insert(0, "REAL", cube.reals[real_pos])
+            dframe.insert(0, "ENSEMBLE", ensemble)
+            dfs.append(dframe)
+        return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from webviz_config.common_cache import CACHE
+
+from .smry_store import SmryStore
+from .smry_resampling import _resample
+from .._utils.fingerprint_cache import fingerprint_memoize
+
+
+class DeltaAlignment:
+    """Alignment of the rows of two ensembles in a summary dataframe (on the format
+    given by `load_smry`) on shared DATE and REAL. For each (DATE, REAL) found in
+    either ensemble, sorted by DATE and REAL, the alignment holds the row of the
+    base and the delta ensemble, or -1 if the ensemble has no such row.
+
+    The alignment only depends on the ENSEMBLE, REAL and DATE columns, and can be
+    reused for all vectors read from the same rows, such that the delta of a vector
+    is a single subtraction of aligned arrays.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        dates: np.ndarray,
+        reals: np.ndarray,
+        base_rows: np.ndarray,
+        delta_rows: np.ndarray,
+        n_rows: int,
+    ):
+        self.dates = dates
+        self.reals = reals
+        self.base_rows = base_rows
+        self.delta_rows = delta_rows
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_frame(
+        cls, dframe: pd.DataFrame, base_ens: str, delta_ens: str
+    ) -> "DeltaAlignment":
+        ensembles = np.asarray(dframe["ENSEMBLE"])
+        keys = pd.MultiIndex.from_arrays(
+            [pd.to_datetime(dframe["DATE"]).values, np.asarray(dframe["REAL"])],
+            names=["DATE", "REAL"],
+        )
+        rows = {
+            ensemble: np.flatnonzero(ensembles == ensemble)
+            for ensemble in (base_ens, delta_ens)
+        }
+        union = keys[np.concatenate(list(rows.values()))].unique().sort_values()
+        aligned_rows = []
+        for ensemble_rows in rows.values():
+            aligned = np.full(len(union), -1, dtype=np.int64)
+            aligned[union.get_indexer(keys[ensemble_rows])] = ensemble_rows
+            aligned_rows.append(aligned)
+        return cls(
+            dates=union.get_level_values("DATE").values,
+            reals=union.get_level_values("REAL").values,
+            base_rows=aligned_rows[0],
+            delta_rows=aligned_rows[1],
+            n_rows=len(dframe),
+        )
+
+    def delta(self, values: np.ndarray) -> np.ndarray:
+        """Base minus delta ensemble for a column of values, aligned on DATE and
+        REAL. Values missing in one of the ensembles give zero difference.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            delta = np.where(self.base_rows >= 0, values[self.base_rows], np.nan) - (
+                np.where(self.delta_rows >= 0, values[self.delta_rows], np.nan)
+            )
+        delta[np.isnan(delta)] = 0
+        return delta
+
+    def delta_frame(self, dframe: pd.DataFrame, vectors: list, name: str):
+        """Dataframe with DATE, REAL, the delta of the given vectors and ENSEMBLE
+        set to `name`. dframe has to have the rows the alignment was made from.
+        """
+        if len(dframe) != self.n_rows:
+            raise ValueError(
+                f"Alignment made for {self.n_rows} rows, got {len(dframe)} rows."
+            )
+        delta_df = pd.DataFrame({"DATE": self.dates, "REAL": self.reals})
+        for vector in vectors:
+            delta_df[vector] = self.delta(dframe[vector].values)
+        delta_df["ENSEMBLE"] = name
+        return delta_df
+
+
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def get_delta_alignment(
+    smry_store: SmryStore, base_ens: str, delta_ens: str, sampling: str = "raw"
+) -> DeltaAlignment:
+    """Alignment of two ensembles in the store, for data resampled to the given
+    frequency (see `resample_smry`). As the alignment is the same for all vectors,
+    it is made from the ENSEMBLE, REAL and DATE columns alone.
+    """
+    index_df = smry_store.get([], [base_ens, delta_ens])
+    # Not memoized, as the alignment itself is memoized
+    index_df = _resample(index_df, sampling)
+    return DeltaAlignment.from_frame(index_df, base_ens, delta_ens)
@@ -0,0 +1,146 @@
+import re
+from typing import Callable
+
+import numpy as np
+
+OPERATORS = "+-*/"
+# Binary operators as numpy functions, such that also operations on numbers alone
+# (e.g. `1/0`) follow numpy semantics instead of raising
+BINARY_OPERATORS = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.true_divide,
+}
+NUMBER = re.compile(r"(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+
+class VectorExpression:
+    """Arithmetic expression of summary vectors, e.g. `WOPR:A + WOPR:B` or
+    `FWPR / (FWPR + FOPR)`, with the operators `+`, `-`, `*` and `/`, unary minus,
+    parentheses and numbers.
+
+    Vector names may contain operator characters (e.g. `WOPR:A-1`), as names are
+    matched against the given vectors, preferring the longest matching name.
+    Operators therefore only need surrounding whitespace where a name would be
+    ambiguous.
+    """
+
+    def __init__(self, expression: str, vectors: list):
+        self.expression = expression
+        self._tokens = _tokenize(expression, set(vectors))
+        self._position = 0
+        self.tree = self._parse_sum()
+        if self._position != len(self._tokens):
+            raise ValueError(
+                f"Unexpected {self._tokens[self._position][1]!r} in expression "
+                f"{expression!r}."
+            )
+        self.vectors = list(dict.fromkeys(_tree_vectors(self.tree)))
+
+    def __repr__(self) -> str:
+        return f"VectorExpression({self.expression!r})"
+
+    def _peek(self):
+        return (
+            self._tokens[self._position] if self._position < len(self._tokens) else None
+        )
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of expression {self.expression!r}.")
+        self._position += 1
+        return token
+
+    def _parse_sum(self):
+        tree = self._parse_product()
+        while self._peek() in (("op", "+"), ("op", "-")):
+            tree = (self._next()[1], tree, self._parse_product())
+        return tree
+
+    def _parse_product(self):
+        tree = self._parse_factor()
+        while self._peek() in (("op", "*"), ("op", "/")):
+            tree = (self._next()[1], tree, self._parse_factor())
+        return tree
+
+    def _parse_factor(self):
+        kind, value = self._next()
+        if (kind, value) == ("op", "-"):
+            return ("neg", self._parse_factor())
+        if (kind, value) == ("op", "+"):
+            return self._parse_factor()
+        if (kind, value) == ("paren", "("):
+            tree = self._parse_sum()
+            if self._next() != ("paren", ")"):
+                raise ValueError(f"Missing ')' in expression {self.expression!r}.")
+            return tree
+        if kind in ("vector", "number"):
+            return (kind, value)
+        raise ValueError(f"Unexpected {value!r} in expression {self.expression!r}.")
+
+    def evaluate(self, values: Callable[[str], np.ndarray]) -> np.ndarray:
+        """Evaluates the expression with whole arrays, where `values` gives the
+        values of a vector (e.g. `SmryStore.vector_values`). Division by zero gives
+        NaN, such that it is shown as a gap in plots.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = np.asarray(_evaluate(self.tree, values), dtype=np.float64)
+        if result.ndim == 0:
+            raise ValueError(
+                f"Expression {self.expression!r} does not contain any vectors."
+            )
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+
+def _tokenize(expression: str, vectors: set) -> list:
+    tokens = []
+    for word in re.findall(r"[()]|[^\s()]+", expression):
+        if word in ("(", ")"):
+            tokens.append(("paren", word))
+            continue
+        while word:
+            if word[0] in OPERATORS:
+                tokens.append(("op", word[0]))
+                word = word[1:]
+                continue
+            number = NUMBER.match(word)
+            # The longest vector name that is followed by an operator or the end
+            ends = [len(word)] + [
+                i for i in range(len(word) - 1, 0, -1) if word[i] in OPERATORS
+            ]
+            end = next((end for end in ends if word[:end] in vectors), None)
+            if end is not None:
+                tokens.append(("vector", word[:end]))
+            elif number is not None:
+                end = number.end()
+                tokens.append(("number", float(word[:end])))
+            else:
+                raise ValueError(
+                    f"Unknown vector {word!r} in expression {expression!r}."
+                )
+            word = word[end:]
+    return tokens
+
+
+def _tree_vectors(tree):
+    if tree[0] == "vector":
+        yield tree[1]
+    elif tree[0] != "number":
+        for node in tree[1:]:
+            yield from _tree_vectors(node)
+
+
+def _evaluate(tree, values: Callable[[str], np.ndarray]):
+    kind = tree[0]
+    if kind == "vector":
+        return np.asarray(values(tree[1]), dtype=np.float64)
+    if kind == "number":
+        return np.float64(tree[1])
+    if kind == "neg":
+        return np.negative(_evaluate(tree[1], values))
+    return BINARY_OPERATORS[kind](
+        _evaluate(tree[1], values), _evaluate(tree[2], values)
+    )
@@ -0,0 +1,239 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from webviz_config.common_cache import CACHE
+
+from .._utils.fingerprint_cache import fingerprint_memoize
+from .smry_cube import SmryCube, EnsembleCube
+
+# Supported resampling frequencies. `raw` keeps the dates from the simulation.
+FREQUENCIES = ["raw", "daily", "weekly", "monthly", "yearly"]
+
+ENSEMBLE_COLUMNS = ["ENSEMBLE", "REAL", "DATE"]
+
+
+def _floor_date(date: pd.Timestamp, frequency: str) -> pd.Timestamp:
+    date = pd.Timestamp(date).normalize()
+    if frequency == "weekly":
+        return date - pd.Timedelta(days=date.weekday())
+    if frequency == "monthly":
+        return pd.Timestamp(year=date.year, month=date.month, day=1)
+    if frequency == "yearly":
+        return pd.Timestamp(year=date.year, month=1, day=1)
+    return date
+
+
+def _date_offset(frequency: str) -> pd.DateOffset:
+    return {
+        "daily": pd.DateOffset(days=1),
+        "weekly": pd.DateOffset(days=7),
+        "monthly": pd.DateOffset(months=1),
+        "yearly": pd.DateOffset(years=1),
+    }[frequency]
+
+
+def resample_dates(start: pd.Timestamp, end: pd.Timestamp, frequency: str) -> list:
+    """Regular dates with the given frequency, covering the interval from start to
+    end. As in fmu.ensemble, the first date is rounded down, and the last date is
+    rounded up, to the nearest day, monday, first of month or first of year.
+    """
+    if frequency not in FREQUENCIES[1:]:
+        raise ValueError(
+            f"Resampling frequency has to be one of {FREQUENCIES[1:]}, "
+            f"got {frequency}."
+        )
+    first = _floor_date(start, frequency)
+    last = _floor_date(end, frequency)
+    if last < pd.Timestamp(end):
+        last = last + _date_offset(frequency)
+    return list(pd.date_range(first, last, freq=_date_offset(frequency)))
+
+
+def _days(dates) -> np.ndarray:
+    return pd.to_datetime(pd.Series(dates)).values.astype("datetime64[s]").astype(
+        np.int64
+    ) / (24 * 3600)
+
+
+def _segment_positions(
+    times: np.ndarray, starts: np.ndarray, stops: np.ndarray, new_times: np.ndarray
+) -> tuple:
+    """Positions for interpolating each segment of `times` (e.g. the sorted dates of
+    each realization, given by `starts` and `stops`) to `new_times`. Returns the
+    lower and upper row, and the weight of the upper row, for each segment and new
+    time, all with shape (segment, new time). Times outside of a segment get the
+    first or last row of the segment. In addition the first row of each segment at
+    or after the first new time is returned.
+
+    The segments are searched all at once, by offsetting the times of each segment
+    such that the segments do not overlap.
+    """
+    offset = (
+        np.maximum(times.max(), new_times.max())
+        - np.minimum(times.min(), new_times.min())
+        + 1
+    ) * np.arange(len(starts))
+    keys = times + np.repeat(offset, stops - starts)
+    upper = np.searchsorted(
+        keys, offset[:, np.newaxis] + new_times[np.newaxis, :], side="right"
+    )
+    upper = np.clip(upper, (starts + 1)[:, np.newaxis], (stops - 1)[:, np.newaxis])
+    # Segments with a single row hold that value
+    upper = np.maximum(upper, starts[:, np.newaxis])
+    lower = np.maximum(upper - 1, starts[:, np.newaxis])
+    span = times[upper] - times[lower]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = np.where(
+            span > 0, np.clip((new_times - times[lower]) / span, 0, 1), 0.0
+        )
+    first = np.clip(
+        np.searchsorted(keys, offset + new_times[0], side="left"), starts, stops - 1
+    )
+    return lower, upper, weight, first
+
+
+def _resample_segments(
+    times: np.ndarray,
+    values: np.ndarray,
+    starts: np.ndarray,
+    stops: np.ndarray,
+    new_times: np.ndarray,
+    is_rate: np.ndarray,
+) -> np.ndarray:
+    """Resamples values with axes (row, VECTOR), where the rows are split into
+    segments (realizations) with sorted times, to new times. Returns an array with
+    axes (segment, new time, VECTOR).
+
+    Values are linearly interpolated, holding the first and last values constant
+    outside of each segment. Rates, where each rate applies to the period ending at
+    its date, are averaged over each new period, such that the produced volumes are
+    preserved. The first date of rates is backfilled.
+    """
+    lower, upper, weight, first = _segment_positions(times, starts, stops, new_times)
+    weight = weight[:, :, np.newaxis]
+    resampled = values[lower] * (1 - weight) + values[upper] * weight
+    if is_rate.any():
+        rates = values[:, is_rate]
+        # Cumulative volumes from the start of each segment
+        dtimes = np.diff(times, prepend=times[:1])
+        dtimes[starts] = 0
+        volumes = np.cumsum(rates * dtimes[:, np.newaxis], axis=0)
+        volumes -= np.repeat(volumes[starts], stops - starts, axis=0)
+        new_volumes = volumes[lower] * (1 - weight) + volumes[upper] * weight
+        with np.errstate(invalid="ignore", divide="ignore"):
+            resampled[:, :, is_rate] = np.concatenate(
+                [
+                    rates[first][:, np.newaxis, :],
+                    np.diff(new_volumes, axis=1)
+                    / np.diff(new_times)[np.newaxis, :, np.newaxis],
+                ],
+                axis=1,
+            )
+    return resampled
+
+
+def _vector_types(vectors: list, smry_meta: Optional[pd.DataFrame]) -> np.ndarray:
+    """Array with True for vectors that are rates according to smry_meta"""
+    is_rate = []
+    for vector in vectors:
+        try:
+            is_rate.append(bool(smry_meta.is_rate[vector]))
+        except (AttributeError, KeyError, TypeError):
+            is_rate.append(False)
+    return np.array(is_rate, dtype=bool)
+
+
+def _segments(keys: np.ndarray) -> tuple:
+    """Start and stop rows of each run of equal values in keys"""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return starts, np.r_[starts[1:], len(keys)]
+
+
+@fingerprint_memoize(timeout=CACHE.TIMEOUT, local_types=(SmryCube,))
+def resample_smry(
+    smry: pd.DataFrame, frequency: str, smry_meta: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Memoized `_resample`"""
+    return _resample(smry, frequency, smry_meta)
+
+
+def _resample(
+    smry: pd.DataFrame, frequency: str, smry_meta: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Resamples summary data on the format given by `load_smry` to regular dates
+    with the given frequency (see `FREQUENCIES`). Each ensemble gets dates covering
+    the dates of all its realizations. All realizations of an ensemble are
+    resampled at once (see `_resample_segments`).
+
+    Rates (`smry_meta.is_rate`) are averaged over each new period, such that
+    cumulative volumes are preserved. All other vectors, e.g. totals, are linearly
+    interpolated, and hold their last value after the end of a realization.
+    Without `smry_meta` all vectors are linearly interpolated.
+
+    A `SmryCube` can be given instead of a dataframe, in which case a resampled
+    `SmryCube` is returned.
+    """
+    if frequency == "raw":
+        return smry
+    if isinstance(smry, SmryCube):
+        return _resample_cube(smry, frequency, smry_meta)
+    if smry.empty:
+        return smry
+    vectors = [col for col in smry.columns if col not in ENSEMBLE_COLUMNS]
+    is_rate = _vector_types(vectors, smry_meta)
+    smry = (
+        smry.assign(DATE=pd.to_datetime(smry["DATE"]))
+        .sort_values(["ENSEMBLE", "REAL", "DATE"], kind="mergesort")
+        .drop_duplicates(["ENSEMBLE", "REAL", "DATE"], keep="last")
+    )
+    dfs = []
+    for ensemble, ens_df in smry.groupby("ENSEMBLE", observed=True, sort=False):
+        dates = resample_dates(ens_df["DATE"].min(), ens_df["DATE"].max(), frequency)
+        reals = ens_df["REAL"].to_numpy()
+        starts, stops = _segments(reals)
+        resampled = _resample_segments(
+            _days(ens_df["DATE"]),
+            ens_df[vectors].to_numpy(dtype=np.float64),
+            starts,
+            stops,
+            _days(dates),
+            is_rate,
+        )
+        ens_resampled = pd.DataFrame(
+            resampled.reshape(len(starts) * len(dates), len(vectors)), columns=vectors
+        )
+        ens_resampled.insert(0, "DATE", np.tile(np.asarray(dates), len(starts)))
+        ens_resampled.insert(0, "REAL", np.repeat(reals[starts], len(dates)))
+        ens_resampled.insert(0, "ENSEMBLE", ensemble)
+        dfs.append(ens_resampled)
+    return pd.concat(dfs, ignore_index=True)
+
+
+def _resample_cube(
+    cube: SmryCube, frequency: str, smry_meta: Optional[pd.DataFrame]
+) -> SmryCube:
+    is_rate = _vector_types(cube.vectors, smry_meta)
+    cubes = {}
+    for ensemble, ens_cube in cube.cubes.items():
+        has_value = ens_cube.present.any(axis=0)
+        if not has_value.any():
+            continue
+        dates = resample_dates(
+            ens_cube.dates[has_value].min(), ens_cube.dates[has_value].max(), frequency
+        )
+        new_cube = EnsembleCube.empty(ens_cube.reals, dates, ens_cube.vectors)
+        # The present values of all realizations, as rows sorted by REAL and DATE
+        real_pos, date_pos = np.nonzero(ens_cube.present)
+        starts, stops = _segments(real_pos)
+        new_cube.values[real_pos[starts]] = _resample_segments(
+            _days(ens_cube.dates)[date_pos],
+            np.asarray(ens_cube.values[real_pos, date_pos], dtype=np.float64),
+            starts,
+            stops,
+            _days(dates),
+            is_rate,
+        )
+        new_cube.present[real_pos[starts]] = True
+        cubes[ensemble] = new_cube
+    return SmryCube(cubes, source=f"{cube.source}.resample({frequency!r})")
@@ -0,0 +1,172 @@
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from webviz_config.common_cache import CACHE
+from webviz_config.webviz_store import webvizstore
+
+from .fmu_input import load_smry_meta
+from .dtypes import compact_dtypes
+from .smry_store import SmryStore, load_smry_store
+from .._utils.ensemble_statistics import STATISTICS
+from .smry_cube import EnsembleCube
+from .smry_resampling import _resample
+
+# Number of vectors held in memory at a time when computing statistics
+CHUNK_SIZE = 256
+
+
+class SmryStatistics:
+    """Precomputed statistics over realizations (see `STATISTICS`), per ensemble,
+    date and vector. For each ensemble the statistics are held as a dense array with
+    axes (STATISTIC, DATE, VECTOR), such that statistics for a vector are a lookup.
+
+    `source` identifies the data, and is used as cache key when memoizing functions
+    taking the statistics as argument.
+    """
+
+    def __init__(self, ensembles: dict, vectors: list, source: str):
+        self.arrays = ensembles
+        self.vectors = list(vectors)
+        self.source = source
+        self.vector_index = {vector: i for i, vector in enumerate(self.vectors)}
+
+    def __repr__(self) -> str:
+        return f"SmryStatistics({self.source})"
+
+    @classmethod
+    def compute(
+        cls,
+        store: SmryStore,
+        sampling: str = "raw",
+        smry_meta: Optional[pd.DataFrame] = None,
+    ) -> "SmryStatistics":
+        """Computes statistics for all vectors in the store, after resampling to
+        the given frequency (see `resample_smry`). Vectors are read and reduced
+        `CHUNK_SIZE` at a time, with one vectorized reduction per chunk.
+        """
+        ensembles = {}
+        for ensemble in store.ensembles:
+            dates, arrays = None, []
+            for start in range(0, len(store.vectors), CHUNK_SIZE):
+                vectors = store.vectors[start : start + CHUNK_SIZE]
+                ens_df = store.get(vectors, [ensemble])
+                if sampling != "raw":
+                    # Not memoized, as every chunk is only resampled once
+                    ens_df = _resample(ens_df, sampling, smry_meta)
+                dates, values = EnsembleCube.from_frame(
+                    ens_df, vectors
+                ).all_statistics()
+                arrays.append(values)
+            if dates is not None:
+                ensembles[ensemble] = (
+                    pd.DatetimeIndex(dates, name="DATE"),
+                    np.concatenate(arrays, axis=2),
+                )
+        return cls(ensembles, store.vectors, source=f"{store!r}:{sampling}")
+
+    @classmethod
+    def from_frame(cls, dframe: pd.DataFrame, source: str) -> "SmryStatistics":
+        """Statistics from a dataframe on the format given by `to_frame`"""
+        vectors = [
+            col
+            for col in dframe.columns
+            if col not in ["ENSEMBLE", "STATISTIC", "DATE"]
+        ]
+        ensembles = {}
+        for ensemble, ens_df in dframe.groupby("ENSEMBLE", observed=True, sort=False):
+            dates = pd.DatetimeIndex(
+                np.unique(pd.to_datetime(ens_df["DATE"]).values), name="DATE"
+            )
+            values = np.full((len(STATISTICS), len(dates), len(vectors)), np.nan)
+            stat_pos = ens_df["STATISTIC"].map(
+                {stat: i for i, stat in enumerate(STATISTICS)}
+            )
+            date_pos = dates.get_indexer(pd.to_datetime(ens_df["DATE"]))
+            values[stat_pos.values, date_pos] = ens_df[vectors].values
+            ensembles[ensemble] = (dates, values)
+        return cls(ensembles, vectors, source=source)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Dataframe with ENSEMBLE, STATISTIC, DATE and vector columns"""
+        dfs = []
+        for ensemble, (dates, values) in self.arrays.items():
+            for stat_no, statistic in enumerate(STATISTICS):
+                dframe = pd.DataFrame(values[stat_no], columns=self.vectors)
+                dframe.insert(0, "DATE", dates)
+                dframe.insert(0, "STATISTIC", statistic)
+                dframe.insert(0, "ENSEMBLE", ensemble)
+                dfs.append(dframe)
+        return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+
+    @property
+    def ensembles(self) -> list:
+        return list(self.arrays)
+
+    def get(self, ensemble: str, vector: str) -> Optional[pd.DataFrame]:
+        """Statistics for a vector in an ensemble, with a column per statistic and
+        DATE as index. Returns None if the ensemble or vector is not included.
+        """
+        if ensemble not in self.arrays or vector not in self.vector_index:
+            return None
+        dates, values = self.arrays[ensemble]
+        return pd.DataFrame(
+            values[:, :, self.vector_index[vector]].T, columns=STATISTICS, index=dates
+        )
+
+
+@CACHE.memoize(timeout=CACHE.TIMEOUT)
+@webvizstore
+def create_smry_statistics(
+    ensemble_paths: dict,
+    ensemble_set_name: str = "EnsembleSet",
+    time_index: Optional[Union[list, str]] = None,
+    column_keys: Optional[list] = None,
+    sampling: str = "raw",
+) -> pd.DataFrame:
+    """Computes statistics for all summary vectors in the ensembles, on the format
+    given by `SmryStatistics.to_frame`.
+    """
+    store = load_smry_store(
+        ensemble_paths=ensemble_paths,
+        ensemble_set_name=ensemble_set_name,
+        time_index=time_index,
+        column_keys=column_keys,
+    )
+    smry_meta = (
+        load_smry_meta(
+            ensemble_paths=ensemble_paths,
+            ensemble_set_name=ensemble_set_name,
+            column_keys=column_keys,
+        )
+        if sampling != "raw"
+        else None
+    )
+    return SmryStatistics.compute(store, sampling, smry_meta).to_frame()
+
+
+def load_smry_statistics(
+    ensemble_paths: dict,
+    ensemble_set_name: str = "EnsembleSet",
+    time_index: Optional[Union[list, str]] = None,
+    column_keys: Optional[list] = None,
+    sampling: str = "raw",
+) -> SmryStatistics:
+    """Returns precomputed statistics for the ensembles. The statistics are
+    computed the first time (see `create_smry_statistics`), and are part of the
+    portable build through webvizstore.
+    """
+    return SmryStatistics.from_frame(
+        compact_dtypes(
+            create_smry_statistics(
+                ensemble_paths=ensemble_paths,
+                ensemble_set_name=ensemble_set_name,
+                time_index=time_index,
+                column_keys=column_keys,
+                sampling=sampling,
+            )
+        ),
+        source=repr(
+            (ensemble_paths, ensemble_set_name, time_index, column_keys, sampling)
+        ),
+    )
@@ -0,0 +1,265 @@
+import os
+import tempfile
+from pathlib import Path
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from webviz_config.common_cache import CACHE
+from webviz_config.webviz_store import webvizstore
+
+from .fmu_input import load_ensemble_set, get_ensemble_smry, registry_smry
+from .dtypes import DTYPE_SETTINGS, compact_dtypes
+from .smry_expressions import VectorExpression
+from .._utils.fingerprint_cache import hash_digest
+
+ENSEMBLE_COLUMNS = ["ENSEMBLE", "REAL", "DATE"]
+
+
+def _store_folder() -> Path:
+    folder = Path(tempfile.gettempdir()) / "webviz_subsurface_smry_store"
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+@CACHE.memoize(timeout=CACHE.TIMEOUT)
+@webvizstore
+def create_smry_store(
+    ensemble_paths: dict,
+    ensemble_set_name: str = "EnsembleSet",
+    time_index: Optional[Union[list, str]] = None,
+    column_keys: Optional[list] = None,
+) -> Path:
+    """Writes summary data for all ensembles in the ensemble set to a single
+    parquet file, and returns the path to that file.
+    Each ensemble is written as a separate row group, and every vector is stored
+    as its own column chunk, such that single vectors for single ensembles can be
+    read without touching the rest of the data. Only one ensemble is held in memory
+    at a time while writing.
+    """
+    ens_set = load_ensemble_set(ensemble_paths, ensemble_set_name)
+    vectors = sorted(
+        {
+            vector
+            for ens_name in ens_set.ensemblenames
+            for vector in ens_set[ens_name].get_smrykeys(vector_match=column_keys)
+        }
+    )
+    digest = hash_digest(
+        repr((ensemble_paths, ensemble_set_name, time_index, column_keys)).encode()
+    )
+    path = _store_folder() / f"{digest}.parquet"
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+    writer = None
+    try:
+        for ens_name in ens_set.ensemblenames:
+            # Reuse data already loaded by other plugins, without keeping
+            # the data in memory if not.
+            ens_df = registry_smry(
+                ens_set[ens_name],
+                ensemble_paths[ens_name],
+                time_index,
+                column_keys,
+                load=False,
+            )
+            if ens_df is None:
+                ens_df = get_ensemble_smry(
+                    ens_set[ens_name], time_index=time_index, column_keys=column_keys
+                )
+            if ens_df.empty:
+                continue
+            ens_df = ens_df.reindex(columns=["REAL", "DATE"] + vectors)
+            ens_df.insert(0, "ENSEMBLE", ens_name)
+            ens_df["DATE"] = pd.to_datetime(ens_df["DATE"])
+            ens_df["REAL"] = ens_df["REAL"].astype(np.int64)
+            ens_df[vectors] = ens_df[vectors].astype(np.float64)
+            table = pa.Table.from_pandas(ens_df, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(str(tmp_path), table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(
+            f"No summary data found for ensembles {list(ensemble_paths.keys())}."
+        )
+    # Replace atomically, as several processes may be building the same store.
+    os.replace(tmp_path, path)
+    return path
+
+
+@lru_cache(maxsize=256)
+def _read_parquet_column(
+    path: str, stat: tuple, column: str, float32: bool = False
+) -> np.ndarray:
+    # pylint: disable=unused-argument
+    # `stat` (modification time and size) is part of the cache key, such that
+    # columns are not mixed between versions of a file rewritten at the same path.
+    values = pq.read_table(path, columns=[column]).column(0).to_numpy()
+    return values.astype(np.float32) if float32 else values
+
+
+class SmryStore:
+    """Read access to summary data where vectors are loaded lazily, one vector at
+    a time. The most recently used vectors are kept in memory. The ENSEMBLE, REAL
+    and DATE columns are always loaded, as these are needed to index the vectors.
+
+    Use `load_smry_store` to get a store for a set of ensembles, or
+    `SmryStore.from_frame` to wrap an already loaded (e.g. csv) dataframe.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self._path = str(path)
+        stat = os.stat(self._path)
+        self._stat = (stat.st_mtime_ns, stat.st_size)
+        self._source = f"{self._path}@{self._stat[0]}:{self._stat[1]}"
+        self._frame = None
+        self._vectors = [
+            name
+            for name in pq.read_schema(self._path).names
+            if name not in ENSEMBLE_COLUMNS
+        ]
+        self._index_df = compact_dtypes(
+            pq.read_table(self._path, columns=ENSEMBLE_COLUMNS).to_pandas()
+        )
+        self._expressions = {}
+        self._expression_values = {}
+        self._set_ensemble_slices()
+
+    @classmethod
+    def from_frame(cls, dframe: pd.DataFrame) -> "SmryStore":
+        """Make a store from a dataframe with ENSEMBLE, REAL and DATE columns
+        in addition to the vectors. The dataframe is kept in memory, with compact
+        dtypes if enabled (see `set_compact_dtypes`).
+        """
+        store = cls.__new__(cls)
+        # Make ensembles contiguous, keeping the order of first occurrence
+        codes = pd.Categorical(
+            dframe["ENSEMBLE"], categories=pd.unique(dframe["ENSEMBLE"])
+        ).codes
+        dframe = compact_dtypes(
+            dframe.iloc[np.argsort(codes, kind="mergesort")].reset_index(drop=True)
+        )
+        store._path = None
+        store._stat = None
+        store._source = hash_digest(
+            repr(list(dframe.columns)).encode(),
+            pd.util.hash_pandas_object(dframe, index=False).values.tobytes(),
+        )
+        store._frame = dframe
+        store._vectors = [col for col in dframe.columns if col not in ENSEMBLE_COLUMNS]
+        store._index_df = dframe[ENSEMBLE_COLUMNS]
+        store._expressions = {}
+        store._expression_values = {}
+        store._set_ensemble_slices()
+        return store
+
+    def __repr__(self) -> str:
+        # Used as key when memoizing functions taking a store as argument. The
+        # source identifies the content: the file and its version, or a hash of
+        # the dataframe.
+        if self._expressions:
+            expressions = {
+                name: expression.expression
+                for name, expression in self._expressions.items()
+            }
+            return f"SmryStore({self._source}, {expressions!r})"
+        return f"SmryStore({self._source})"
+
+    def add_expressions(self, expressions: dict) -> None:
+        """Adds calculated vectors, given as a dictionary of vector name and
+        expression (see `VectorExpression`). Expressions can use vectors in the
+        store, and calculated vectors added before them. The values of each
+        calculated vector are evaluated once, with whole arrays, when first used.
+        """
+        for name, expression in expressions.items():
+            if name in self._vectors:
+                raise ValueError(f"Calculated vector {name} is already a vector.")
+            self._expressions[name] = VectorExpression(expression, self._vectors)
+            self._vectors.append(name)
+
+    def _set_ensemble_slices(self):
+        ensembles = np.asarray(self._index_df["ENSEMBLE"])
+        starts = np.flatnonzero(np.r_[True, ensembles[1:] != ensembles[:-1]])
+        stops = np.r_[starts[1:], len(ensembles)]
+        self._ensemble_slices = {
+            ensembles[start]: slice(start, stop) for start, stop in zip(starts, stops)
+        }
+
+    @property
+    def vectors(self) -> list:
+        return self._vectors
+
+    @property
+    def ensembles(self) -> list:
+        return list(self._ensemble_slices)
+
+    @property
+    def dates(self) -> list:
+        return sorted(self._index_df["DATE"].unique())
+
+    def ensemble_rows(self, ensemble: str) -> slice:
+        """Rows of an ensemble, as given by `vector_values`"""
+        return self._ensemble_slices[ensemble]
+
+    def vector_values(self, vector: str) -> np.ndarray:
+        """All values of a single vector, in the row order of the store"""
+        if vector not in self._vectors:
+            raise KeyError(vector)
+        if vector in self._expressions:
+            if vector not in self._expression_values:
+                self._expression_values[vector] = self._expressions[vector].evaluate(
+                    self.vector_values
+                )
+            return self._expression_values[vector]
+        if self._path is None:
+            return self._frame[vector].values
+        return _read_parquet_column(
+            self._path, self._stat, vector, DTYPE_SETTINGS["float32"]
+        )
+
+    def get(self, vectors: list, ensembles: Optional[list] = None) -> pd.DataFrame:
+        """Returns a dataframe with ENSEMBLE, REAL and DATE, and the given vectors,
+        optionally only for the given ensembles. Only the requested vectors are read.
+        """
+        if ensembles is None:
+            rows = slice(None)
+        else:
+            slices = [
+                self._ensemble_slices[ens]
+                for ens in ensembles
+                if ens in self._ensemble_slices
+            ]
+            rows = np.concatenate(
+                [np.array([], dtype=int)]
+                + [np.arange(sl.start, sl.stop) for sl in slices]
+            )
+        dframe = self._index_df.iloc[rows].reset_index(drop=True)
+        for vector in vectors:
+            dframe[vector] = self.vector_values(vector)[rows]
+        return dframe
+
+
+def load_smry_store(
+    ensemble_paths: dict,
+    ensemble_set_name: str = "EnsembleSet",
+    time_index: Optional[Union[list, str]] = None,
+    column_keys: Optional[list] = None,
+) -> SmryStore:
+    """Returns a lazily loading SmryStore for the ensembles. The store is written
+    to disk the first time (see `create_smry_store`), and is part of the portable
+    build through webvizstore.
+    """
+    return SmryStore(
+        create_smry_store(
+            ensemble_paths=ensemble_paths,
+            ensemble_set_name=ensemble_set_name,
+            time_index=time_index,
+            column_keys=column_keys,
+        )
+    )
@@ -0,0 +1,119 @@
+import warnings
+
+import numpy as np
+
+
+def expand_steps(x: np.ndarray, y: np.ndarray, line_shape: str) -> tuple:
+    """Corner points of step shaped lines, such that drawing the returned points
+    with linear interpolation gives the same line as drawing x and y with the given
+    plotly step shape (`vh` or `hv`). y can hold several lines along the first axis.
+    Other line shapes are returned unchanged.
+    """
+    if line_shape == "vh":
+        return np.repeat(x, 2)[:-1], np.repeat(y, 2, axis=-1)[..., 1:]
+    if line_shape == "hv":
+        return np.repeat(x, 2)[1:], np.repeat(y, 2, axis=-1)[..., :-1]
+    return x, y
+
+
+def _largest_triangles(
+    x: np.ndarray,
+    y: np.ndarray,
+    prev_x: np.ndarray,
+    prev_y: np.ndarray,
+    edges: np.ndarray,
+) -> np.ndarray:
+    """Index of the point in a bucket making the largest triangle with the
+    previously kept point and the average of the next bucket, for each line.
+    `edges` are the start and end of the bucket, and the end of the next bucket
+    unless it is the last one."""
+    start, stop = edges[0], edges[1]
+    next_stop = edges[2] if len(edges) > 2 else len(x)
+    next_x = x[stop:next_stop].mean()
+    next_y = np.nanmean(y[:, stop:next_stop], axis=1)
+    next_y = np.where(np.isnan(next_y), prev_y, next_y)
+    areas = np.abs(
+        (prev_x - next_x)[:, np.newaxis] * (y[:, start:stop] - prev_y[:, np.newaxis])
+        - (prev_x[:, np.newaxis] - x[start:stop]) * (next_y - prev_y)[:, np.newaxis]
+    )
+    return start + np.argmax(np.nan_to_num(areas, nan=-1.0), axis=1)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the points to keep when downsampling lines to `n_out` points with
+    the largest-triangle-three-buckets algorithm (Steinarsson, 2013).
+
+    x is shared by all lines, and y holds one line per row. The points are split in
+    `n_out - 2` buckets between the first and last point, and from each bucket the
+    point making the largest triangle with the previously kept point and the average
+    of the next bucket is kept. Buckets are processed in sequence, but each bucket is
+    handled for all lines at once. NaN values in y are never preferred over numbers.
+
+    Returns an array with one row of increasing indices per line.
+    """
+    y = np.atleast_2d(y)
+    n_lines, n_points = y.shape
+    if n_out >= n_points or n_out < 3:
+        return np.broadcast_to(np.arange(n_points), (n_lines, n_points))
+
+    x = np.asarray(x, dtype=np.float64)
+    edges = (np.arange(n_out - 1) * (n_points - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n_points - 1
+    rows = np.arange(n_lines)
+    indices = np.empty((n_lines, n_out), dtype=np.int64)
+    indices[:, 0] = 0
+    indices[:, -1] = n_points - 1
+    # The previously kept point of each line, which is the last kept point that is
+    # not NaN, such that a bucket of NaN does not affect the following buckets
+    prev_x = np.full(n_lines, x[0])
+    prev_y = y[:, 0].astype(np.float64)
+    with warnings.catch_warnings():
+        # Mean of an all-NaN bucket
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        for bucket in range(n_out - 2):
+            selected = _largest_triangles(
+                x, y, prev_x, prev_y, edges[bucket : bucket + 3]
+            )
+            indices[:, bucket + 1] = selected
+            selected_y = y[rows, selected]
+            valid = ~np.isnan(selected_y)
+            prev_x = np.where(valid, x[selected], prev_x)
+            prev_y = np.where(valid, selected_y, prev_y)
+    return indices
+
+
+def _step_indices(x: np.ndarray, y: np.ndarray, n_out: int, line_shape: str):
+    """LTTB indices of expanded step shaped lines, where each picked corner is
+    kept together with the opposite end of its vertical segment"""
+    if len(x) <= n_out:
+        return lttb_indices(x, y, len(x))
+    indices = lttb_indices(x, y, n_out // 2)
+    # Vertical segments are (2k, 2k + 1) for vh and (2k - 1, 2k) for hv
+    offset = 0 if line_shape == "vh" else 1
+    partners = np.clip(((indices + offset) ^ 1) - offset, 0, len(x) - 1)
+    return np.sort(np.hstack([indices, partners]), axis=1)
+
+
+def downsample_lines(
+    x: np.ndarray, y: np.ndarray, n_out: int, line_shape: str
+) -> tuple:
+    """Downsamples lines with shared x values (e.g. the dates of an ensemble) and
+    one line per row of y (e.g. realizations), to at most `n_out` points per line.
+
+    Step shaped lines (`vh` and `hv`) are expanded to their corners before
+    downsampling, and are then to be drawn with linear interpolation. Half of the
+    points are picked by LTTB, and the other half are the opposite ends of the
+    vertical segments of the picked corners, such that the steps stay vertical.
+    Returns x and y with one row per line, and the line shape to draw them with.
+    """
+    x = np.asarray(x)
+    y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    numeric_x = x.astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    if line_shape in ("vh", "hv"):
+        numeric_x = expand_steps(numeric_x, y, line_shape)[0]
+        x, y = expand_steps(x, y, line_shape)
+        indices = _step_indices(numeric_x, y, n_out, line_shape)
+        line_shape = "linear"
+    else:
+        indices = lttb_indices(numeric_x, y, n_out)
+    return x[indices], np.take_along_axis(y, indices, axis=1), line_shape
@@ -0,0 +1,137 @@
+import warnings
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Default statistics, in the order returned by `nan_statistics`
+STATISTICS = ["mean", "p10", "p90", "maximum", "minimum"]
+
+
+def _percentile(statistic: str, high_p10: bool) -> Optional[float]:
+    if not statistic.startswith("p"):
+        return None
+    try:
+        percentile = float(statistic[1:])
+    except ValueError as exc:
+        raise ValueError(f"Unknown statistic {statistic}.") from exc
+    return 100 - percentile if high_p10 else percentile
+
+
+def _nanpercentiles(values: np.ndarray, percentiles: list) -> np.ndarray:
+    """Percentiles over the first axis ignoring NaN, with linear interpolation as
+    in `np.nanpercentile`. NaN are sorted last, such that the percentiles are
+    found by indexing into the sorted values for all columns at once, instead of
+    one column at a time as in `np.nanpercentile`.
+    """
+    sorted_values = np.sort(values, axis=0)
+    count = np.sum(~np.isnan(values), axis=0)
+    results = []
+    for percentile in percentiles:
+        position = np.maximum(count - 1, 0) * percentile / 100
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        lower_values = np.take_along_axis(sorted_values, lower[np.newaxis], axis=0)[0]
+        upper_values = np.take_along_axis(sorted_values, upper[np.newaxis], axis=0)[0]
+        result = lower_values + (upper_values - lower_values) * (position - lower)
+        result[count == 0] = np.nan
+        results.append(result)
+    return np.stack(results)
+
+
+def nan_statistics(
+    values: np.ndarray, statistics: Optional[list] = None, high_p10: bool = False
+) -> np.ndarray:
+    """Statistics over the first axis of values, ignoring NaN, stacked along the
+    first axis of the returned array in the order given by `statistics`.
+
+    Supported statistics are `mean`, `std` (with one degree of freedom, as in pandas),
+    `maximum`, `minimum` and percentiles given as `p<percentile>`, e.g. `p10`. All
+    percentiles are found from a single sort of the values. If `high_p10` is
+    True, percentiles follow the petroleum industry convention, where p10 is the
+    high estimate (i.e. the 90th percentile).
+    """
+    statistics = STATISTICS if statistics is None else statistics
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[0] == 0:
+        # No values to reduce over, which gives NaN for all statistics (as for
+        # all-NaN slices below), and an empty result if there are no columns.
+        values = np.full((1,) + values.shape[1:], np.nan)
+    percentiles = {
+        stat: _percentile(stat, high_p10)
+        for stat in statistics
+        if _percentile(stat, high_p10) is not None
+    }
+    results = {}
+    with warnings.catch_warnings():
+        # All-NaN slices give NaN statistics, as in pandas
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        if percentiles:
+            percentile_values = _nanpercentiles(values, list(percentiles.values()))
+            results.update(zip(percentiles, percentile_values))
+        for stat in statistics:
+            if stat == "mean":
+                results[stat] = np.nanmean(values, axis=0)
+            elif stat == "std":
+                results[stat] = np.nanstd(values, axis=0, ddof=1)
+            elif stat == "maximum":
+                results[stat] = np.nanmax(values, axis=0)
+            elif stat == "minimum":
+                results[stat] = np.nanmin(values, axis=0)
+            elif stat not in results:
+                raise ValueError(f"Unknown statistic {stat}.")
+    if not statistics:
+        return np.empty((0,) + values.shape[1:])
+    return np.stack([results[stat] for stat in statistics])
+
+
+def pivot_realizations(dframe: pd.DataFrame, keys: list, columns: list) -> tuple:
+    """Pivots the columns of a long format dataframe to an array with axes
+    (REALIZATION, GROUP, COLUMN), where each group is a unique combination of the
+    `keys` columns, and the rows within a group are laid out along the first axis.
+    Groups with fewer rows than the largest group are padded with NaN.
+
+    Returns the group keys as an index (sorted, as in `groupby`) and the array.
+    """
+    grouped = dframe.groupby(keys, observed=True, sort=True)
+    index = grouped.size().index
+    codes = grouped.ngroup().to_numpy()
+    valid = codes >= 0
+    codes = codes[valid]
+    order = np.argsort(codes, kind="mergesort")
+    counts = np.bincount(codes, minlength=len(index))
+    # Position of each row within its group
+    slots = np.empty(len(codes), dtype=np.int64)
+    slots[order] = np.arange(len(codes)) - np.repeat(np.cumsum(counts) - counts, counts)
+    array = np.full(
+        (counts.max() if len(counts) else 0, len(index), len(columns)), np.nan
+    )
+    array[slots, codes] = dframe.loc[valid, columns].to_numpy(dtype=np.float64)
+    return index, array
+
+
+def ensemble_statistics(
+    dframe: pd.DataFrame,
+    columns: list,
+    x: str,
+    group_by: Optional[list] = None,
+    statistics: Optional[list] = None,
+    high_p10: bool = False,
+) -> pd.DataFrame:
+    """Statistics of the given columns over realizations, for each value of `x`
+    (e.g. DATE or DEPTH) within each group of `group_by` (e.g. ENSEMBLE).
+
+    The data is pivoted to a single (realization, group, column) array, and each
+    statistic is computed with one vectorized call (see `nan_statistics`). The
+    returned table has the group keys and `x` as (multi)index, and columns
+    (column, statistic), such that `table.loc[ensemble][vector]` gives the
+    statistics of a vector with `x` as index, as used by the fanchart builders.
+    """
+    statistics = STATISTICS if statistics is None else statistics
+    index, array = pivot_realizations(dframe, (group_by or []) + [x], columns)
+    values = nan_statistics(array, statistics, high_p10)
+    return pd.DataFrame(
+        values.transpose(1, 2, 0).reshape(len(index), len(columns) * len(statistics)),
+        index=index,
+        columns=pd.MultiIndex.from_product([columns, statistics]),
+    )
@@ -0,0 +1,172 @@
+import time
+import hashlib
+import inspect
+import weakref
+import functools
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Optional
+
+import pandas as pd
+from webviz_config.common_cache import CACHE
+
+# Fingerprints of tagged objects, indexed by id(). Entries are removed when the
+# object is garbage collected.
+_FINGERPRINTS: dict = {}
+
+_CACHE_STATS: dict = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+# Results kept in this process instead of in CACHE (see `fingerprint_memoize`),
+# as key mapped to result and expiry time, least recently used first
+_LOCAL_RESULTS: OrderedDict = OrderedDict()
+_LOCAL_LOCK = threading.Lock()
+LOCAL_MAXSIZE = 32
+
+
+def hash_digest(*parts: bytes) -> str:
+    """Hex digest of the given bytes, used for all content hashes and cache keys"""
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _remove_fingerprint(obj_id: int) -> Callable:
+    def _remove(_ref):
+        _FINGERPRINTS.pop(obj_id, None)
+
+    return _remove
+
+
+def set_fingerprint(obj: Any, source: str, version: int = 0) -> Any:
+    """Tags an object (typically a pandas.DataFrame) with a cheap and stable identity,
+    made of a `source` fingerprint (e.g. describing how the data was loaded) and a
+    `version`. Functions decorated with `fingerprint_memoize` use this identity as
+    cache key instead of serializing the object. Returns the object.
+    """
+    _FINGERPRINTS[id(obj)] = (
+        weakref.ref(obj, _remove_fingerprint(id(obj))),
+        source,
+        version,
+    )
+    return obj
+
+
+def bump_fingerprint_version(obj: Any) -> Any:
+    """Increments the version of a tagged object. This has to be called if the
+    object is modified in place, in order to not get stale cache hits.
+    """
+    _, source, version = _tagged(obj)
+    return set_fingerprint(obj, source, version + 1)
+
+
+def _tagged(obj: Any) -> Optional[tuple]:
+    entry = _FINGERPRINTS.get(id(obj))
+    if entry is not None and entry[0]() is obj:
+        return entry
+    return None
+
+
+def get_fingerprint(obj: Any) -> str:
+    """Returns the fingerprint of an object. Pandas objects that have not been
+    tagged with `set_fingerprint` are hashed by content on every call, such that
+    changes made in place are always seen. Other objects use their `repr`.
+    """
+    entry = _tagged(obj)
+    if entry is not None:
+        return f"{entry[1]}@{entry[2]}"
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return "content:" + hash_digest(
+            pd.util.hash_pandas_object(obj, index=True).values.tobytes(),
+            repr(
+                (list(obj.columns), list(obj.dtypes))
+                if isinstance(obj, pd.DataFrame)
+                else (obj.name, obj.dtype)
+            ).encode(),
+        )
+    if isinstance(obj, (list, tuple)):
+        return f"{type(obj).__name__}({','.join(get_fingerprint(x) for x in obj)})"
+    if isinstance(obj, dict):
+        return (
+            "dict("
+            + ",".join(f"{key!r}:{get_fingerprint(val)}" for key, val in obj.items())
+            + ")"
+        )
+    return repr(obj)
+
+
+def _get_local(key: str) -> Optional[tuple]:
+    with _LOCAL_LOCK:
+        entry = _LOCAL_RESULTS.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] < time.monotonic():
+            del _LOCAL_RESULTS[key]
+            return None
+        _LOCAL_RESULTS.move_to_end(key)
+        return (entry[0],)
+
+
+def _set_local(key: str, result: Any, timeout: Optional[int]) -> None:
+    with _LOCAL_LOCK:
+        _LOCAL_RESULTS[key] = (
+            result,
+            time.monotonic() + timeout if timeout else None,
+        )
+        _LOCAL_RESULTS.move_to_end(key)
+        while len(_LOCAL_RESULTS) > LOCAL_MAXSIZE:
+            _LOCAL_RESULTS.popitem(last=False)
+
+
+def fingerprint_memoize(
+    timeout: Optional[int] = None, local_types: tuple = ()
+) -> Callable:
+    """Memoization decorator, to be used instead of `CACHE.memoize` for functions
+    taking dataframes as arguments. The cache key is built from the fingerprints of
+    the arguments (see `get_fingerprint`), such that dataframes are not serialized
+    on every call. Arguments are bound to the signature of the function first, such
+    that positional and keyword arguments (and defaults) give the same key.
+    Number of cache hits and misses per function are given by `cache_info()`.
+
+    Results that are instances of `local_types` (e.g. large arrays, or arrays
+    memory-mapped from disk) are not serialized to CACHE, but kept in this process,
+    in a cache of the `LOCAL_MAXSIZE` most recently used results.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            key = f"fingerprint_memoize:{name}:" + hash_digest(
+                get_fingerprint(dict(arguments.arguments)).encode()
+            )
+            cached = _get_local(key) if local_types else None
+            if cached is None:
+                cached = CACHE.get(key)
+            if cached is not None:
+                _CACHE_STATS[name]["hits"] += 1
+                result = cached[0]
+            else:
+                _CACHE_STATS[name]["misses"] += 1
+                result = func(*args, **kwargs)
+                if isinstance(result, local_types):
+                    _set_local(key, result, timeout)
+                else:
+                    # Wrapped in a tuple to be able to cache None results
+                    CACHE.set(key, (result,), timeout=timeout)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def cache_info() -> dict:
+    """Number of cache hits and misses per function decorated with
+    `fingerprint_memoize`.
+    """
+    return {name: dict(stats) for name, stats in _CACHE_STATS.items()}
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from .fingerprint_cache import hash_digest
+
+
+class FipIndex:
+    """Groups of the regions (nodes) of FIP arrays, given on the format returned by
+    `get_fipdesc` (columns FIP, GROUP, SUBGROUP and NODE), compiled once such that
+    the nodes matching a combination of filters are found with vectorized boolean
+    operations.
+
+    For each FIP array the nodes are held as a sorted array, and each group as an
+    array of integer subgroup codes per node (-1 for nodes not in the group).
+    """
+
+    def __init__(self, fipdesc: pd.DataFrame):
+        self.source = hash_digest(
+            pd.util.hash_pandas_object(fipdesc, index=False).values.tobytes()
+        )
+        self._fips = {}
+        for fip, fip_df in fipdesc.groupby("FIP", sort=False):
+            fip_df = fip_df.sort_values("NODE", kind="mergesort")
+            nodes, node_pos = np.unique(fip_df["NODE"].values, return_inverse=True)
+            groups = {}
+            for group, group_df in fip_df.groupby("GROUP", sort=False):
+                # Subgroups in order of their first node
+                sub_codes, subgroups = pd.factorize(group_df["SUBGROUP"])
+                codes = np.full(len(nodes), -1, dtype=np.int64)
+                codes[node_pos[fip_df["GROUP"].values == group]] = sub_codes
+                groups[group] = (codes, np.asarray(subgroups, dtype=object))
+            self._fips[fip] = (nodes, groups)
+
+    def __repr__(self) -> str:
+        return f"FipIndex({self.source})"
+
+    def __contains__(self, fip: str) -> bool:
+        return fip in self._fips
+
+    def groups(self, fip: str) -> list:
+        return list(self._fips[fip][1])
+
+    def nodes(self, fip: str, groupby: str, filters: dict) -> dict:
+        """Nodes of a FIP array where, for every group in `filters` (group name to
+        list of selected subgroups), the node is in one of the selected subgroups.
+        The nodes are given per subgroup of `groupby`, or all under the key
+        `ENSEMBLE` if grouped by ensemble.
+        """
+        nodes, groups = self._fips[fip]
+        included = np.ones(len(nodes), dtype=bool)
+        for group, subgroups in filters.items():
+            if group not in groups:
+                included[:] = False
+                break
+            codes, names = groups[group]
+            # Last entry is False, such that code -1 (not in the group) is excluded
+            selected = np.append(np.isin(names, list(subgroups)), False)
+            included &= selected[codes]
+        if groupby == "ENSEMBLE":
+            return {"ENSEMBLE": nodes[included].tolist()} if included.any() else {}
+        if groupby not in filters:
+            return {}
+        codes, names = groups[groupby]
+        included_codes = codes[included]
+        included_nodes = nodes[included]
+        return {
+            names[code]: included_nodes[included_codes == code].tolist()
+            for code in pd.unique(included_codes)
+        }
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+
+def concatenate_realizations(x, y, reals) -> tuple:
+    """Concatenates lines for several realizations into single arrays, where the
+    lines are separated by a gap (NaN in y). The rows of each realization must be
+    contiguous. Returns x, y and the realization of each point (including gaps).
+    """
+    x, y, reals = np.asarray(x), np.asarray(y, dtype=np.float64), np.asarray(reals)
+    if len(reals) == 0:
+        return x, y, reals
+    ends = np.flatnonzero(reals[1:] != reals[:-1]) + 1
+    return (
+        np.insert(x, ends, x[ends - 1]),
+        np.insert(y, ends, np.nan),
+        np.insert(reals, ends, reals[ends - 1]),
+    )
+
+
+def merged_realization_trace(
+    dframe: pd.DataFrame, x: str, y: str, hovertext: str = "Realization: {real}"
+) -> dict:
+    """Trace data (x, y, customdata and hovertemplate) for all realizations in
+    dframe as one line, instead of one trace per realization. The realization of
+    each point is given in customdata, and replaces `{real}` in the hovertext.
+    """
+    dframe = dframe.sort_values("REAL", kind="mergesort")
+    x_values, y_values, reals = concatenate_realizations(
+        dframe[x].values, dframe[y].values, dframe["REAL"].values
+    )
+    return {
+        "x": x_values,
+        "y": y_values,
+        "customdata": reals,
+        "hovertemplate": "(%{x}, %{y})<br>" + hovertext.format(real="%{customdata}"),
+    }
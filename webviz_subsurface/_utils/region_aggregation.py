@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from webviz_config.common_cache import CACHE
+
+from .fingerprint_cache import fingerprint_memoize
+
+
+class RegionAggregation:
+    """Sums of region vectors per subgroup, as a sparse (subgroup, region vector)
+    matrix of ones. Aggregating all subgroups for all rows is then a single
+    sparse-dense product with the (row, region vector) array of values.
+
+    `columns` are the region vectors in the order of the values, and
+    `subgroup_vectors` the region vectors to sum for each subgroup. A KeyError is
+    raised for region vectors not in `columns`.
+    """
+
+    def __init__(self, columns: list, subgroup_vectors: dict):
+        position = {column: i for i, column in enumerate(columns)}
+        subgroup_no, column_no = [], []
+        for i, vectors in enumerate(subgroup_vectors.values()):
+            for vector in vectors:
+                subgroup_no.append(i)
+                column_no.append(position[vector])
+        self.columns = list(columns)
+        self.subgroups = list(subgroup_vectors)
+        # Duplicated entries are summed, as when summing duplicated columns
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(column_no)), (subgroup_no, column_no)),
+            shape=(len(self.subgroups), len(self.columns)),
+        )
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """Aggregated values with axes (row, subgroup), from values with axes
+        (row, region vector)"""
+        return np.asarray(self.matrix.dot(np.asarray(values).T).T)
+
+
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def region_vector_frame(
+    smry: pd.DataFrame, ensembles: list, columns: list
+) -> pd.DataFrame:
+    """ENSEMBLE, REAL and DATE and the given region vectors (e.g. all region vectors
+    of a vector base and FIP array, see `RegionVectorIndex`), for the given
+    ensembles. Missing values are zero, as they are ignored when aggregated.
+    """
+    rows = smry["ENSEMBLE"].isin(ensembles).values
+    df = smry.loc[rows, ["ENSEMBLE", "REAL", "DATE"]]
+    values = smry.loc[rows, columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    values = np.where(np.isnan(values), 0, values)
+    return pd.concat(
+        [df, pd.DataFrame(values, columns=columns, index=df.index)], axis=1
+    )
+
+
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def get_region_aggregation(columns: list, subgroup_vectors: dict) -> RegionAggregation:
+    return RegionAggregation(columns, subgroup_vectors)
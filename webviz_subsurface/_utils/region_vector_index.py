@@ -0,0 +1,90 @@
+import re
+import fnmatch
+from typing import Optional
+
+import pandas as pd
+
+from .._abbreviations.reservoir_simulation import simulation_region_vector_breakdown
+from .fingerprint_cache import hash_digest
+
+
+class RegionVectorIndex:
+    """Summary vector names parsed once into a table with the vector base name, FIP
+    array and node (region number) of region vectors, and the position of each
+    vector in the given list (e.g. the columns of a summary dataframe).
+
+    Nodes of a FIP array, region vectors of a vector base and the position of a
+    single region vector are lookups, and vectors can be matched with glob patterns.
+    """
+
+    COLUMNS = ["VECTOR", "BASE", "FIP", "NODE", "POSITION"]
+
+    def __init__(self, vectors: list, table: Optional[pd.DataFrame] = None):
+        self.vectors = list(vectors)
+        if table is None:
+            rows = []
+            for position, vector in enumerate(self.vectors):
+                base, fip, node = simulation_region_vector_breakdown(vector)
+                is_region = fip is not None and fip != "FIELD" and node is not None
+                rows.append(
+                    (
+                        vector,
+                        base,
+                        fip if is_region and node.isdigit() else None,
+                        int(node) if is_region and node.isdigit() else -1,
+                        position,
+                    )
+                )
+            table = pd.DataFrame(rows, columns=RegionVectorIndex.COLUMNS)
+        self.table = table
+        self.source = hash_digest("\n".join(self.vectors).encode())
+        self._positions = {}
+        self._region_vectors = {}
+        nodes: dict = {}
+        for vector, base, fip, node, position in table[
+            table["FIP"].notnull()
+        ].itertuples(index=False):
+            self._positions[(base, fip, node)] = position
+            self._region_vectors.setdefault((base, fip), []).append(vector)
+            nodes.setdefault(fip, set()).add(node)
+        self._nodes = {fip: sorted(fip_nodes) for fip, fip_nodes in nodes.items()}
+
+    def __repr__(self) -> str:
+        return f"RegionVectorIndex({self.source})"
+
+    def subset(self, vectors: list) -> "RegionVectorIndex":
+        """Index of some of the vectors, keeping their positions, without parsing
+        the names again"""
+        return RegionVectorIndex(
+            vectors, self.table.set_index("VECTOR", drop=False).loc[vectors]
+        )
+
+    @property
+    def fips(self) -> list:
+        return list(self._nodes)
+
+    def nodes(self, fip: Optional[str] = None) -> list:
+        """Sorted nodes of a FIP array, or of all FIP arrays if not given"""
+        if fip is None:
+            return sorted(set().union(*self._nodes.values()))
+        return self._nodes.get(fip, [])
+
+    def bases(self, fip: str) -> list:
+        """Vector base names with region vectors for a FIP array"""
+        return sorted(
+            {base for base, base_fip in self._region_vectors if base_fip == fip}
+        )
+
+    def region_vectors(self, base: str, fip: str) -> list:
+        return self._region_vectors.get((base, fip), [])
+
+    def position(self, base: str, fip: str, node: int) -> Optional[int]:
+        """Position of a region vector, or None if not found"""
+        return self._positions.get((base, fip, int(node)))
+
+    def match(self, *patterns: str) -> list:
+        """Vectors matching any of the glob patterns, in the order of the index"""
+        regex = re.compile(
+            "|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns)
+        )
+        return [vector for vector in self.vectors if regex.match(vector)]
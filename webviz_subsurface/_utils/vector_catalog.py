@@ -0,0 +1,148 @@
+import re
+import fnmatch
+import warnings
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .._abbreviations.reservoir_simulation import (
+    SIMULATION_VECTOR_TERMINOLOGY,
+    simulation_vector_base,
+    simulation_vector_description,
+    simulation_region_vector_breakdown,
+    simulation_unit_reformat,
+)
+
+WILDCARDS = re.compile(r"[*?[]")
+
+
+class VectorCatalog:
+    """Index of simulation vector names, where each vector is parsed once into its
+    base name, type (as in the vector terminology, e.g. `well` or `region`), node
+    (e.g. well or region number), FIP array for region vectors, description and
+    unit (if `smry_meta` is given, on the format given by `load_smry_meta`).
+    Descriptions can be given for vectors not in the vector terminology (e.g.
+    calculated vectors) with `descriptions`.
+
+    Vectors are searched by name prefix, by wildcards (`*`, `?` and `[]`) on the
+    name, or by text in the name or description. This allows dropdowns to be served
+    only the options matching what the user types, instead of all vectors.
+    """
+
+    COLUMNS = ["VECTOR", "BASE", "TYPE", "NODE", "FIP", "DESCRIPTION", "UNIT"]
+
+    def __init__(
+        self,
+        vectors: list,
+        smry_meta: Optional[pd.DataFrame] = None,
+        descriptions: Optional[dict] = None,
+    ):
+        descriptions = descriptions if descriptions else {}
+        rows = []
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", category=UserWarning)
+            for vector in vectors:
+                base_name, fiparray, node = simulation_region_vector_breakdown(vector)
+                metadata = SIMULATION_VECTOR_TERMINOLOGY.get(
+                    base_name,
+                    SIMULATION_VECTOR_TERMINOLOGY.get(
+                        simulation_vector_base(vector), {}
+                    ),
+                )
+                rows.append(
+                    (
+                        vector,
+                        simulation_vector_base(vector),
+                        metadata.get("type"),
+                        node,
+                        fiparray if metadata.get("type") == "region" else None,
+                        descriptions[vector]
+                        if vector in descriptions
+                        else simulation_vector_description(vector),
+                        _unit(vector, smry_meta),
+                    )
+                )
+        if caught:
+            warnings.warn(
+                f"Could not find description for {len(caught)} vectors, e.g. "
+                f"{caught[0].message}",
+                UserWarning,
+            )
+        self.frame = pd.DataFrame(rows, columns=VectorCatalog.COLUMNS)
+        for column in ["BASE", "TYPE", "FIP", "UNIT"]:
+            self.frame[column] = self.frame[column].astype("category")
+        self.vectors = self.frame["VECTOR"].tolist()
+        self._position = {vector: i for i, vector in enumerate(self.vectors)}
+        # Upper case names in sorted order, for prefix search with bisection
+        upper = np.array([vector.upper() for vector in self.vectors], dtype=object)
+        self._sorted_order = np.argsort(upper, kind="mergesort")
+        self._sorted_upper = upper[self._sorted_order]
+        self._search_text = (
+            pd.Series(upper) + " " + self.frame["DESCRIPTION"].str.upper()
+        )
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def __contains__(self, vector: str) -> bool:
+        return vector in self._position
+
+    def info(self, vector: str) -> dict:
+        """Parsed metadata of a vector, with keys given by `COLUMNS`"""
+        return self.frame.iloc[self._position[vector]].to_dict()
+
+    def search(self, query: Optional[str], limit: Optional[int] = None) -> list:
+        """Vectors matching the query, in the order of the catalog for wildcard
+        queries. Otherwise vectors with the query as prefix (case insensitive) are
+        given first in alphabetical order, followed by other vectors with the query
+        in the name or description. An empty query gives all vectors.
+        """
+        query = (query or "").strip()
+        if not query:
+            return self.vectors[:limit]
+        if WILDCARDS.search(query):
+            regex = re.compile(fnmatch.translate(query), re.IGNORECASE)
+            matches = self.frame["VECTOR"][
+                self.frame["VECTOR"].str.match(regex)
+            ].tolist()
+            return matches[:limit]
+        upper = query.upper()
+        start = np.searchsorted(self._sorted_upper, upper, side="left")
+        # All names with the prefix sort before the prefix followed by the
+        # highest character
+        stop = np.searchsorted(self._sorted_upper, upper + "\uffff", side="left")
+        prefixed = self._sorted_order[start:stop]
+        matches = [self.vectors[i] for i in prefixed[:limit]]
+        if limit is not None and len(matches) >= limit:
+            return matches
+        contains = np.flatnonzero(
+            self._search_text.str.contains(upper, regex=False).values
+        )
+        contains = contains[~np.isin(contains, prefixed)]
+        matches.extend(self.vectors[i] for i in contains)
+        return matches[:limit]
+
+    def options(self, vectors: list, search: Optional[str] = None) -> list:
+        """Dropdown options for the given vectors. If `search` is given, it is
+        added to the searchable text of each option, such that the dropdown shows
+        the options as matched by `search` (e.g. with wildcards) without filtering
+        them again.
+        """
+        options = []
+        for vector in vectors:
+            label = (
+                f"{self.frame['DESCRIPTION'].iat[self._position[vector]]} ({vector})"
+            )
+            option = {"label": label, "value": vector}
+            if search:
+                option["search"] = f"{label} {search}"
+            options.append(option)
+        return options
+
+
+def _unit(vector: str, smry_meta: Optional[pd.DataFrame]) -> Optional[str]:
+    try:
+        return simulation_unit_reformat(smry_meta.unit[vector])
+    except (AttributeError, KeyError, TypeError):
+        return None
@@ -21,39 +21,65 @@ pages:
           - iter-0
           - iter-1
 ```
+
+Realizations are by default loaded one after another. On file systems with high
+latency per file, loading can be done in parallel by giving the number of
+parallel workers in `shared_settings`, e.g. `ensemble_loader_workers: 8`.
+
+Memory usage of loaded ensemble data can be reduced by setting `compact_dtypes: true`
+in `shared_settings`. Ensemble and label columns (e.g. zone and region) are then
+stored as categoricals, and realization numbers as small integers. Setting
+`compact_dtypes: float32` in addition stores all floating point values with single
+precision.
+
+Files in the ensembles are discovered through a shared index of directory listings.
+Giving a file in `shared_settings`, e.g. `file_index_snapshot: file_index.json`,
+persists the listings between runs. Listings in the snapshot are only reused for
+directories that have not been modified since.
 """
 
-from ._parameter_distribution import ParameterDistribution
-from ._parameter_correlation import ParameterCorrelation
-from ._parameter_response_correlation import ParameterResponseCorrelation
-from ._disk_usage import DiskUsage
-from ._subsurface_map import SubsurfaceMap
-from ._history_match import HistoryMatch
-from ._morris_plot import MorrisPlot
-from ._inplace_volumes import InplaceVolumes
-from ._inplace_volumes_onebyone import InplaceVolumesOneByOne
-from ._reservoir_simulation_timeseries import ReservoirSimulationTimeSeries
-from ._reservoir_simulation_timeseries_onebyone import (
-    ReservoirSimulationTimeSeriesOneByOne,
-)
-from ._segy_viewer import SegyViewer
-from ._surface_viewer_fmu import SurfaceViewerFMU
-from ._surface_with_grid_cross_section import SurfaceWithGridCrossSection
-from ._surface_with_seismic_cross_section import SurfaceWithSeismicCrossSection
-from ._well_cross_section import WellCrossSection
-from ._well_cross_section_fmu import WellCrossSectionFMU
-from ._parameter_parallel_coordinates import ParameterParallelCoordinates
-from ._running_time_analysis_fmu import RunningTimeAnalysisFMU
-from ._relative_permeability import RelativePermeability
-from ._reservoir_simulation_timeseries_regional import (
-    ReservoirSimulationTimeSeriesRegional,
-)
-from ._rft_plotter.rft_plotter import RftPlotter
+import sys
+import importlib
 
+# Plugin classes and the modules defining them. Plugin modules are only imported
+# when a plugin is accessed, such that heavy dependencies (e.g. xtgeo, pyscal,
+# ecl2df and fmu.ensemble) are not loaded for configurations not using them.
+PLUGIN_MODULES = {
+    "ParameterDistribution": "._parameter_distribution",
+    "ParameterCorrelation": "._parameter_correlation",
+    "ParameterResponseCorrelation": "._parameter_response_correlation",
+    "DiskUsage": "._disk_usage",
+    "SubsurfaceMap": "._subsurface_map",
+    "HistoryMatch": "._history_match",
+    "MorrisPlot": "._morris_plot",
+    "InplaceVolumes": "._inplace_volumes",
+    "InplaceVolumesOneByOne": "._inplace_volumes_onebyone",
+    "ReservoirSimulationTimeSeries": "._reservoir_simulation_timeseries",
+    "ReservoirSimulationTimeSeriesOneByOne": (
+        "._reservoir_simulation_timeseries_onebyone"
+    ),
+    "SegyViewer": "._segy_viewer",
+    "SurfaceViewerFMU": "._surface_viewer_fmu",
+    "SurfaceWithGridCrossSection": "._surface_with_grid_cross_section",
+    "SurfaceWithSeismicCrossSection": "._surface_with_seismic_cross_section",
+    "WellCrossSection": "._well_cross_section",
+    "WellCrossSectionFMU": "._well_cross_section_fmu",
+    "ParameterParallelCoordinates": "._parameter_parallel_coordinates",
+    "RunningTimeAnalysisFMU": "._running_time_analysis_fmu",
+    "RelativePermeability": "._relative_permeability",
+    "ReservoirSimulationTimeSeriesRegional": (
+        "._reservoir_simulation_timeseries_regional"
+    ),
+    "RftPlotter": "._rft_plotter.rft_plotter",
+}
 
+# The plugins are defined on access through __getattr__ below, which pylint can not
+# follow. Keep this list in sync with PLUGIN_MODULES.
+# pylint: disable=undefined-all-variable
 __all__ = [
     "ParameterDistribution",
     "ParameterCorrelation",
+    "ParameterResponseCorrelation",
     "DiskUsage",
     "SubsurfaceMap",
     "HistoryMatch",
@@ -67,9 +93,32 @@ __all__ = [
     "SurfaceWithGridCrossSection",
     "SurfaceWithSeismicCrossSection",
     "WellCrossSection",
+    "WellCrossSectionFMU",
     "ParameterParallelCoordinates",
     "RunningTimeAnalysisFMU",
     "RelativePermeability",
     "ReservoirSimulationTimeSeriesRegional",
     "RftPlotter",
 ]
+# pylint: enable=undefined-all-variable
+
+
+def __getattr__(name: str):
+    """Imports plugins on first access (PEP 562), e.g. when webviz-config loads
+    the `webviz_config_plugins` entry points given in setup.py.
+    """
+    if name in PLUGIN_MODULES:
+        plugin = getattr(importlib.import_module(PLUGIN_MODULES[name], __name__), name)
+        globals()[name] = plugin
+        return plugin
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported, all plugins are imported up front
+    for _plugin in __all__:
+        __getattr__(_plugin)
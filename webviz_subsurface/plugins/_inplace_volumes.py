@@ -15,6 +15,7 @@ from webviz_config import WebvizPluginABC
 from .._datainput.inplace_volumes import extract_volumes
 from .._abbreviations.volume_terminology import volume_description, volume_unit
 from .._abbreviations.number_formatting import table_statistics_base
+from .._utils.fingerprint_cache import fingerprint_memoize, set_fingerprint
 
 
 class InplaceVolumes(WebvizPluginABC):
@@ -79,7 +80,7 @@ but the following responses are given more descriptive names automatically:
                 'Incorrent arguments. Either provide a "csvfile" or "ensembles" and "volfiles"'
             )
         if csvfile:
-            self.volumes = read_csv(csvfile)
+            self.volumes = set_fingerprint(read_csv(csvfile), f"read_csv:{csvfile}")
 
         elif ensembles and volfiles:
             self.ens_paths = {
@@ -88,8 +89,9 @@ but the following responses are given more descriptive names automatically:
             }
             self.volfiles = volfiles
             self.volfolder = volfolder
-            self.volumes = extract_volumes(
-                self.ens_paths, self.volfolder, self.volfiles
+            self.volumes = set_fingerprint(
+                extract_volumes(self.ens_paths, self.volfolder, self.volfiles),
+                f"extract_volumes:{(self.ens_paths, self.volfolder, self.volfiles)}",
             )
 
         else:
@@ -394,15 +396,15 @@ but the following responses are given more descriptive names automatically:
 
             # If not grouped make one trace
             if not group:
-                dframe = data.groupby("REAL").sum().reset_index()
+                dframe = data.groupby("REAL")[response].sum().reset_index()
                 plot_traces = [plot_data(plot_type, dframe, response, "Total")]
                 table = [plot_table(dframe, response, "Total")]
             # Else make one trace for each group member
             else:
                 plot_traces = []
                 table = []
-                for name, vol_group_df in data.groupby(group):
-                    dframe = vol_group_df.groupby("REAL").sum().reset_index()
+                for name, vol_group_df in data.groupby(group, observed=True):
+                    dframe = vol_group_df.groupby("REAL")[response].sum().reset_index()
                     trace = plot_data(plot_type, dframe, response, name)
                     if trace is not None:
                         plot_traces.append(trace)
@@ -462,7 +464,7 @@ but the following responses are given more descriptive names automatically:
                 return False, selectors[0], 1
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
 def plot_data(plot_type, dframe, response, name):
     values = dframe[response]
 
@@ -480,7 +482,7 @@ def plot_data(plot_type, dframe, response, name):
     return output
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
 def plot_table(dframe, response, name):
     values = dframe[response]
     try:
@@ -539,7 +541,7 @@ def plot_layout(plot_type, response, theme):
     return layout
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
 def filter_dataframe(dframe, columns, column_values):
     df = dframe.copy()
     if not isinstance(columns, list):
@@ -464,7 +464,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
             tornado = json.dumps(
                 {
                     "ENSEMBLE": ensemble,
-                    "data": data.groupby("REAL")
+                    "data": data.groupby("REAL")[response]
                     .sum()
                     .reset_index()[["REAL", response]]
                     .values.tolist(),
@@ -550,7 +550,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
                         "yaxis": {"title": volume_title},
                     }
                 )
-                plot_data = data.groupby("REAL").sum().reset_index()
+                plot_data = data.groupby("REAL")[response].sum().reset_index()
 
                 if tornado_click:
                     figure_data = [
@@ -630,7 +630,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
                     figure={
                         "data": [
                             {
-                                "y": senscase_df.groupby("REAL")
+                                "y": senscase_df.groupby("REAL")[response]
                                 .sum()
                                 .reset_index()[response],
                                 "name": f"{sensname} ({senscase})",
@@ -658,7 +658,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
                     figure={
                         "data": [
                             {
-                                "y": sensname_df.groupby("REAL")
+                                "y": sensname_df.groupby("REAL")[response]
                                 .sum()
                                 .reset_index()[response],
                                 "name": f"{sensname}",
@@ -679,7 +679,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
 def calculate_table(df, response):
     table = []
     for (sensname, senscase), dframe in df.groupby(["SENSNAME", "SENSCASE"]):
-        values = dframe.groupby("REAL").sum().reset_index()[response]
+        values = dframe.groupby("REAL")[response].sum().reset_index()[response]
         try:
             table.append(
                 {
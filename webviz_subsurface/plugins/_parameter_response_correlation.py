@@ -493,9 +493,9 @@ def _filter_and_sum_responses(
                     & (df[opt["name"]] <= np.max(opt["values"]))
                 ]
     if aggregation == "sum":
-        return df.groupby("REAL").sum().reset_index()[["REAL", response]]
+        return df.groupby("REAL")[response].sum().reset_index()[["REAL", response]]
     if aggregation == "mean":
-        return df.groupby("REAL").mean().reset_index()[["REAL", response]]
+        return df.groupby("REAL")[response].mean().reset_index()[["REAL", response]]
     raise ValueError(
         f"Aggregation of response file specified as '{aggregation}'' is invalid. "
     )
@@ -2,7 +2,6 @@ import warnings
 from typing import Optional, Union
 from pathlib import Path
 
-import numpy as np
 import dash_html_components as html
 import dash_core_components as dcc
 from dash.dependencies import Input, Output, State
@@ -13,6 +12,8 @@ from webviz_config import WebvizPluginABC
 
 from .._datainput.relative_permeability import load_satfunc, load_scal_recommendation
 from .._datainput.fmu_input import load_csv
+from .._utils.ensemble_statistics import ensemble_statistics
+from .._utils.realization_traces import merged_realization_trace
 
 
 class RelativePermeability(WebvizPluginABC):
@@ -31,6 +32,9 @@ class RelativePermeability(WebvizPluginABC):
                           compatible. csv or xlsx file. (if xlsx, sheet can be defined with
                           scal_sheet). Path to a single file, not per realization/ensemble.
 * `sheet_name` (optional): Only relevant if `scalfile` is an xlsx file.
+* `merge_realization_traces` (optional): If `True`, all realizations are drawn as a single
+                          trace per curve and color group, which is faster to transfer and
+                          render for large ensembles.
 """
 
     SATURATIONS = ["SW", "SG", "SL"]
@@ -55,9 +59,11 @@ class RelativePermeability(WebvizPluginABC):
         relpermfile: str = None,
         scalfile: Path = None,
         sheet_name: Optional[Union[str, int, list]] = None,
+        merge_realization_traces: bool = False,
     ):
 
         super().__init__()
+        self.merge_realization_traces = merge_realization_traces
         self.ens_paths = {
             ens: app.webviz_settings["shared_settings"]["scratch_ensembles"][ens]
             for ens in ensembles
@@ -448,7 +454,13 @@ class RelativePermeability(WebvizPluginABC):
             )
             if visualization == "realizations" and not df.empty:
                 traces = add_realization_traces(
-                    df, color_by, curves, sataxis, colors, nplots
+                    df,
+                    color_by,
+                    curves,
+                    sataxis,
+                    colors,
+                    nplots,
+                    merge=self.merge_realization_traces,
                 )
             elif visualization == "statistics" and not df.empty:
                 traces = add_statistic_traces(
@@ -577,8 +589,14 @@ def filter_scal_df(df, curves, satnums, sataxis):
     return df[columns].dropna()
 
 
-def add_realization_traces(df, color_by, curves, sataxis, colors, nplots):
-    """Renders line traces for individual realizations"""
+# pylint: disable=too-many-arguments
+def add_realization_traces(df, color_by, curves, sataxis, colors, nplots, merge=False):
+    """Renders line traces for individual realizations. If merge is True, the
+    realizations are rendered as a single trace per curve and color group."""
+    if merge:
+        return add_merged_realization_traces(
+            df, color_by, curves, sataxis, colors, nplots
+        )
     traces = []
 
     for curve_no, curve in enumerate(curves):
@@ -637,7 +655,7 @@ def add_realization_traces(df, color_by, curves, sataxis, colors, nplots):
                         },
                         "showlegend": real_no == 0 and curve_no == 0,
                     }
-                    for (group, grouped_df) in df.groupby(color_by)
+                    for (group, grouped_df) in df.groupby(color_by, observed=True)
                     for real_no, (real, real_df) in enumerate(
                         grouped_df.groupby("REAL")
                     )
@@ -678,27 +696,69 @@ def add_scal_traces(df, curves, sataxis, nplots):
     return traces
 
 
+def add_merged_realization_traces(df, color_by, curves, sataxis, colors, nplots):
+    """Renders all realizations as a single line trace per curve and color group,
+    with the realization of each point given in customdata"""
+    traces = []
+    for curve_no, curve in enumerate(curves):
+        yaxis = "y" if nplots == 1 or curve.startswith("KR") else "y2"
+        xaxis = "x" if yaxis == "y" else "x2"
+        groups = (
+            [(curve, df)]
+            if color_by == "CURVE"
+            else df.groupby(color_by, observed=True)
+        )
+        for group, grouped_df in groups:
+            satnum = grouped_df["SATNUM"].iloc[0]
+            ensemble = grouped_df["ENSEMBLE"].iloc[0]
+            traces.append(
+                {
+                    "type": "scatter",
+                    **merged_realization_trace(
+                        grouped_df,
+                        sataxis,
+                        curve,
+                        hovertext=(
+                            f"{curve}, Satnum: {satnum}<br>"
+                            f"Realization: {{real}}, Ensemble: {ensemble}"
+                        ),
+                    ),
+                    "xaxis": xaxis,
+                    "yaxis": yaxis,
+                    "name": group,
+                    "legendgroup": group,
+                    "marker": {
+                        "color": colors.get(
+                            group,
+                            colors[
+                                list(colors.keys())[0 if color_by == "CURVE" else -1]
+                            ],
+                        )
+                    },
+                    "showlegend": color_by == "CURVE" or curve_no == 0,
+                }
+            )
+    return traces
+
+
 # pylint: disable=too-many-locals
 def add_statistic_traces(df, color_by, curves, sataxis, colors, nplots):
     """Calculate statistics and call fanchart rendering"""
     # Switched P10 and P90 due to convetion in petroleum industry
-    def p10(x):
-        return np.nanpercentile(x, q=90)
-
-    def p90(x):
-        return np.nanpercentile(x, q=10)
+    stat_df = ensemble_statistics(
+        df,
+        curves,
+        x=sataxis,
+        group_by=["ENSEMBLE", "SATNUM"],
+        statistics=["mean", "minimum", "maximum", "p10", "p90"],
+        high_p10=True,
+    )
 
     traces = []
-    for ens_no, (ens, ens_df) in enumerate(
-        df[["ENSEMBLE", "SATNUM"] + [sataxis] + curves].groupby(["ENSEMBLE"])
-    ):
-        for satnum_no, (satnum, satnum_df) in enumerate(ens_df.groupby("SATNUM")):
-            df_stat = (
-                satnum_df.groupby(sataxis)
-                .agg([np.nanmean, np.nanmin, np.nanmax, p10, p90])
-                .stack()
-                .swaplevel()
-            )
+    for ens_no, ens in enumerate(stat_df.index.unique(level="ENSEMBLE")):
+        ens_stat_df = stat_df.loc[ens]
+        for satnum_no, satnum in enumerate(ens_stat_df.index.unique(level="SATNUM")):
+            df_stat = ens_stat_df.loc[satnum]
             for curve_no, curve in enumerate(curves):
                 yaxis = "y" if nplots == 1 or curve.startswith("KR") else "y2"
                 xaxis = "x" if yaxis == "y" else "x2"
@@ -750,8 +810,8 @@ def add_fanchart_traces(
         {
             "name": legend_group,
             "hovertext": f"{curve} Maximum <br>" f"Ensemble: {ens}, Satnum: {satnum}",
-            "x": curve_stats["nanmax"].index.tolist(),
-            "y": curve_stats["nanmax"].values,
+            "x": curve_stats["maximum"].index.tolist(),
+            "y": curve_stats["maximum"].values,
             "xaxis": xaxis,
             "yaxis": yaxis,
             "mode": "lines",
@@ -776,8 +836,8 @@ def add_fanchart_traces(
         {
             "name": legend_group,
             "hovertext": f"{curve} Mean <br>" f"Ensemble: {ens}, Satnum: {satnum}",
-            "x": curve_stats["nanmean"].index.tolist(),
-            "y": curve_stats["nanmean"].values,
+            "x": curve_stats["mean"].index.tolist(),
+            "y": curve_stats["mean"].values,
             "xaxis": xaxis,
             "yaxis": yaxis,
             "mode": "lines",
@@ -804,8 +864,8 @@ def add_fanchart_traces(
         {
             "name": legend_group,
             "hovertext": f"{curve} Minimum <br>" f"Ensemble: {ens}, Satnum: {satnum}",
-            "x": curve_stats["nanmin"].index.tolist(),
-            "y": curve_stats["nanmin"].values,
+            "x": curve_stats["minimum"].index.tolist(),
+            "y": curve_stats["minimum"].values,
             "xaxis": xaxis,
             "yaxis": yaxis,
             "mode": "lines",
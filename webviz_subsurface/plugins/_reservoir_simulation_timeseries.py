@@ -2,6 +2,7 @@ from pathlib import Path
 import json
 
 import yaml
+import numpy as np
 import pandas as pd
 from plotly.subplots import make_subplots
 from dash.exceptions import PreventUpdate
@@ -13,16 +14,32 @@ from webviz_config import WebvizPluginABC
 from webviz_config.webviz_store import webvizstore
 from webviz_config.common_cache import CACHE
 
-from .._datainput.fmu_input import load_smry, load_smry_meta
-from .._abbreviations.reservoir_simulation import (
-    simulation_vector_description,
-    simulation_unit_reformat,
-    historical_vector,
+from .._datainput.fmu_input import load_smry_meta, load_parameters
+from .._datainput.smry_store import SmryStore, load_smry_store, create_smry_store
+from .._datainput.smry_resampling import FREQUENCIES, resample_smry
+from .._datainput.smry_cube import SmryCube
+from .._datainput.smry_delta import get_delta_alignment
+from .._datainput.date_index import DateIndex, get_date_index
+from .._datainput.realization_filter import RealizationFilter
+from .._datainput.smry_statistics import (
+    SmryStatistics,
+    create_smry_statistics,
+    load_smry_statistics,
 )
+from .._abbreviations.reservoir_simulation import historical_vector
+from .._utils.ensemble_statistics import ensemble_statistics
+from .._utils.realization_traces import (
+    concatenate_realizations,
+    merged_realization_trace,
+)
+from .._utils.downsampling import downsample_lines
+from .._utils.figure_encoding import encode_trace
+from .._utils.vector_catalog import VectorCatalog
 from .._utils.simulation_timeseries import (
     set_simulation_line_shape_fallback,
     get_simulation_line_shape,
 )
+from .._utils.fingerprint_cache import fingerprint_memoize
 
 
 class ReservoirSimulationTimeSeries(WebvizPluginABC):
@@ -37,14 +54,42 @@ in plugin settings.
 * `column_keys`: List of vectors to extract. If not given, all vectors
                  from the simulations will be extracted. Wild card asterisk *
                  can be used.
-* `sampling`: Time separation between extracted values. Can be e.g. `monthly`
-              or `yearly`.
+* `sampling`: Time separation between extracted values. Can be e.g. `monthly` (default) or
+              `yearly`.
+* `resample_on_request`: If `True`, the raw summary data is loaded once instead, and
+              can be resampled to `raw`, `daily`, `weekly`, `monthly` or `yearly` in
+              the plugin without reloading. `sampling` is then the initial frequency.
 * `options`: Options to initialize plots with. See below
 * `line_shape_fallback`: Fallback interpolation method between points. Vectors identified as rates
                 or phase ratios are always backfilled, vectors identified as cumulative (totals)
                 are always linearly interpolated. The rest use the fallback.
                 Supported: `linear` (default), `backfilled` + regular Plotly options: `hv`, `vh`,
                 `hvh`, `vhv` and `spline`.
+* `backend`: How the summary data is held in memory. `store` (default) reads vectors from
+             disk when selected. `cube` holds each ensemble as a dense
+             (realization, date, vector) array, which makes filtering and statistics faster,
+             at the cost of reading all vectors when the plugin is loaded.
+             `cube_mmap` is as `cube`, but with the arrays memory-mapped from disk. The files
+             are reused by other processes and later starts with the same data.
+* `merge_realization_traces`: If `True`, all realizations of an ensemble are drawn as a
+             single trace, which is faster to transfer and render for large ensembles.
+* `precompute_statistics`: If `True`, statistics for all vectors are calculated when
+             loading (or in the portable build), such that showing statistics is a
+             lookup. Only used with the initial `sampling`, statistics for other
+             sampling frequencies and delta ensembles are calculated on request.
+* `downsample_width`: If given, realization lines are downsampled to at most one point per
+             pixel of a plot of this width (e.g. `1000`), with the largest-triangle-three-buckets
+             algorithm, which keeps the visual shape of the lines. Useful with daily sampling
+             over long time spans.
+* `expressions`: Calculated vectors, given as vector name and an arithmetic expression of
+             other vectors, numbers and `+`, `-`, `*`, `/` and parentheses, e.g.
+             `{"WOPR:A+B": "WOPR:A + WOPR:B", "FWCT_CALC": "FWPR / (FWPR + FOPR)"}`.
+             Calculated vectors are shown as any other vector, and use the
+             `line_shape_fallback`.
+* `realization_filter`: If `True`, realizations can be filtered on the range of a
+             parameter (e.g. only realizations where `MULTFLT` > 0.5), such that
+             statistics and realization lines are shown for the selected realizations.
+             Only available with `ensembles`.
 
 Plot options:
     * `vector1` : First vector to display
@@ -55,6 +100,9 @@ Plot options:
 """
 
     ENSEMBLE_COLUMNS = ["REAL", "ENSEMBLE", "DATE"]
+    # Number of vectors given as options in the dropdowns at a time
+    MAX_VECTOR_OPTIONS = 100
+
     # pylint:disable=too-many-arguments
     def __init__(
         self,
@@ -66,14 +114,33 @@ Plot options:
         sampling: str = "monthly",
         options: dict = None,
         line_shape_fallback: str = "linear",
+        backend: str = "store",
+        precompute_statistics: bool = False,
+        merge_realization_traces: bool = False,
+        downsample_width: int = None,
+        expressions: dict = None,
+        realization_filter: bool = False,
+        resample_on_request: bool = False,
     ):
 
         super().__init__()
 
         self.csvfile = csvfile
         self.obsfile = obsfile
-        self.time_index = sampling
+        self.resample_on_request = resample_on_request and sampling in FREQUENCIES
+        if self.resample_on_request:
+            # Raw summary data is loaded, and resampled on request
+            self.time_index = None
+            self.sampling = sampling if ensembles else "raw"
+        else:
+            # The summary data is loaded with the given time index
+            self.time_index = sampling
+            self.sampling = "raw"
         self.column_keys = column_keys
+        self.precompute_statistics = precompute_statistics
+        self.merge_realization_traces = merge_realization_traces
+        self.downsample_width = downsample_width
+        self.smry_stats = None
         if csvfile and ensembles:
             raise ValueError(
                 'Incorrent arguments. Either provide a "csvfile" or "ensembles"'
@@ -85,8 +152,11 @@ Plot options:
                     yaml.safe_load(stream).get("smry", [dict()])
                 )
         if csvfile:
-            self.smry = read_csv(csvfile)
+            self.smry_store = SmryStore.from_frame(read_csv(csvfile))
+            self.smry_store.add_expressions(expressions if expressions else {})
             self.smry_meta = None
+            if precompute_statistics:
+                self.smry_stats = SmryStatistics.compute(self.smry_store)
         elif ensembles:
             self.ens_paths = {
                 ensemble: app.webviz_settings["shared_settings"]["scratch_ensembles"][
@@ -94,35 +164,68 @@ Plot options:
                 ]
                 for ensemble in ensembles
             }
-            self.smry = load_smry(
+            # Vectors are read from the store only when selected in the plugin
+            self.smry_store = load_smry_store(
                 ensemble_paths=self.ens_paths,
                 ensemble_set_name="EnsembleSet",
                 time_index=self.time_index,
                 column_keys=self.column_keys,
             )
+            self.smry_store.add_expressions(expressions if expressions else {})
             self.smry_meta = load_smry_meta(
                 ensemble_paths=self.ens_paths,
                 ensemble_set_name="EnsembleSet",
                 column_keys=self.column_keys,
             )
+            if precompute_statistics:
+                self.smry_stats = load_smry_statistics(
+                    ensemble_paths=self.ens_paths,
+                    ensemble_set_name="EnsembleSet",
+                    time_index=self.time_index,
+                    column_keys=self.column_keys,
+                    sampling=self.sampling,
+                )
         else:
             raise ValueError(
                 'Incorrent arguments. Either provide a "csvfile" or "ensembles"'
             )
+        self.realization_filter = None
+        if realization_filter:
+            if not ensembles:
+                raise ValueError(
+                    'Filtering realizations on parameters requires "ensembles".'
+                )
+            self.realization_filter = RealizationFilter(
+                load_parameters(
+                    ensemble_paths=self.ens_paths, ensemble_set_name="EnsembleSet"
+                )
+            )
+        if backend in ("cube", "cube_mmap"):
+            self.smry_store = SmryCube.from_store(
+                self.smry_store,
+                mmap_folder=SmryCube.default_mmap_folder()
+                if backend == "cube_mmap"
+                else None,
+            )
+        elif backend != "store":
+            raise ValueError(
+                f"Backend has to be either store, cube or cube_mmap, got {backend}."
+            )
 
         self.smry_cols = [
             c
-            for c in self.smry.columns
+            for c in self.smry_store.vectors
             if c not in ReservoirSimulationTimeSeries.ENSEMBLE_COLUMNS
-            and not historical_vector(c, self.smry_meta, False) in self.smry.columns
+            and not historical_vector(c, self.smry_meta, False)
+            in self.smry_store.vectors
         ]
 
-        self.dropdown_options = [
-            {"label": f"{simulation_vector_description(vec)} ({vec})", "value": vec}
-            for vec in self.smry_cols
-        ]
+        # Dropdowns are given the options matching the search, not all vectors
+        self.vector_catalog = VectorCatalog(
+            self.smry_cols, self.smry_meta, descriptions=expressions
+        )
 
-        self.ensembles = list(self.smry["ENSEMBLE"].unique())
+        self.ensembles = self.smry_store.ensembles
         self.theme = app.webviz_settings["theme"]
         self.plot_options = options if options else {}
         self.plot_options["date"] = (
@@ -327,6 +430,66 @@ Plot options:
             ]
         )
 
+    @property
+    def realization_filter_layout(self):
+        return html.Div(
+            style={"marginTop": "25px"}
+            if self.realization_filter is not None
+            else {"display": "none"},
+            children=[
+                html.Span("Filter realizations:", style={"font-weight": "bold"}),
+                dcc.Dropdown(
+                    id=self.uuid("filter_parameter"),
+                    clearable=True,
+                    placeholder="Select parameter",
+                    options=[
+                        {"label": parameter, "value": parameter}
+                        for parameter in (
+                            self.realization_filter.parameters
+                            if self.realization_filter is not None
+                            else []
+                        )
+                    ],
+                ),
+                dcc.RangeSlider(
+                    id=self.uuid("filter_range"),
+                    min=0,
+                    max=1,
+                    step=0.01,
+                    value=[0, 1],
+                    disabled=True,
+                ),
+            ],
+        )
+
+    def selected_realizations(self, ensembles, parameter, parameter_range):
+        """Realizations of each ensemble within the selected parameter range, or
+        None if all realizations are selected"""
+        if self.realization_filter is None or not parameter or not parameter_range:
+            return None
+        ranges = {parameter: parameter_range}
+        realizations = {
+            ensemble: self.realization_filter.realizations(ensemble, ranges)
+            for ensemble in ensembles
+            if ensemble in self.realization_filter.ensembles
+        }
+        if all(
+            len(reals) == len(self.realization_filter.reals(ensemble))
+            for ensemble, reals in realizations.items()
+        ):
+            return None
+        return realizations
+
+    def vector_options(self, value, search_value=None):
+        """Dropdown options for vectors matching the search (see `VectorCatalog`),
+        always including the selected vector"""
+        vectors = self.vector_catalog.search(
+            search_value, limit=ReservoirSimulationTimeSeries.MAX_VECTOR_OPTIONS
+        )
+        if value and value not in vectors:
+            vectors.insert(0, value)
+        return self.vector_catalog.options(vectors, search=search_value)
+
     @property
     def layout(self):
         return wcc.FlexBox(
@@ -353,7 +516,11 @@ Plot options:
                                     id=self.uuid("vector1"),
                                     clearable=False,
                                     multi=False,
-                                    options=self.dropdown_options,
+                                    options=self.vector_options(
+                                        self.plot_options.get(
+                                            "vector1", self.smry_cols[0]
+                                        )
+                                    ),
                                     value=self.plot_options.get(
                                         "vector1", self.smry_cols[0]
                                     ),
@@ -365,7 +532,9 @@ Plot options:
                                     clearable=True,
                                     multi=False,
                                     placeholder="Add additional series",
-                                    options=self.dropdown_options,
+                                    options=self.vector_options(
+                                        self.plot_options.get("vector2", None)
+                                    ),
                                     value=self.plot_options.get("vector2", None),
                                 ),
                                 dcc.Dropdown(
@@ -375,7 +544,9 @@ Plot options:
                                     clearable=True,
                                     multi=False,
                                     placeholder="Add additional series",
-                                    options=self.dropdown_options,
+                                    options=self.vector_options(
+                                        self.plot_options.get("vector3", None)
+                                    ),
                                     value=self.plot_options.get("vector3", None),
                                 ),
                             ],
@@ -409,6 +580,24 @@ Plot options:
                                 ),
                             ],
                         ),
+                        html.Div(
+                            style={"marginTop": "25px"}
+                            if self.resample_on_request
+                            else {"display": "none"},
+                            children=[
+                                html.Span("Sampling:", style={"font-weight": "bold"}),
+                                dcc.Dropdown(
+                                    id=self.uuid("sampling"),
+                                    clearable=False,
+                                    options=[
+                                        {"label": freq.capitalize(), "value": freq}
+                                        for freq in FREQUENCIES
+                                    ],
+                                    value=self.sampling,
+                                ),
+                            ],
+                        ),
+                        self.realization_filter_layout,
                     ],
                 ),
                 html.Div(
@@ -441,6 +630,9 @@ Plot options:
                 Input(self.uuid("delta_ens"), "value"),
                 Input(self.uuid("statistics"), "value"),
                 Input(self.uuid("date"), "data"),
+                Input(self.uuid("sampling"), "value"),
+                Input(self.uuid("filter_parameter"), "value"),
+                Input(self.uuid("filter_range"), "value"),
             ],
         )
         # pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals, too-many-branches
@@ -454,6 +646,9 @@ Plot options:
             delta_ens,
             visualization,
             stored_date,
+            sampling,
+            filter_parameter,
+            filter_range,
         ):
             """Callback to update all graphs based on selections"""
 
@@ -470,15 +665,39 @@ Plot options:
             # Retrieve previous/current selected date
             date = json.loads(stored_date) if stored_date else None
 
+            # Realizations within the parameter filter, None if not filtered
+            if calc_mode == "delta_ensembles":
+                realizations = self.selected_realizations(
+                    [base_ens, delta_ens], filter_parameter, filter_range
+                )
+                if realizations is not None:
+                    # Realizations selected in both ensembles
+                    selected = list(realizations.values())
+                    realizations = {
+                        f"({base_ens}) - ({delta_ens})": selected[0]
+                        if len(selected) == 1
+                        else np.intersect1d(*selected)
+                    }
+            else:
+                realizations = self.selected_realizations(
+                    ensembles, filter_parameter, filter_range
+                )
+            if realizations is not None and not any(
+                len(reals) for reals in realizations.values()
+            ):
+                return message_figure(
+                    "No realizations within the selected parameter range.", self.theme,
+                )
+
             # Titles for subplots
             titles = []
             for vect in vectors:
-                if self.smry_meta is None:
-                    titles.append(simulation_vector_description(vect))
+                vector_info = self.vector_catalog.info(vect)
+                if pd.isna(vector_info["UNIT"]):
+                    titles.append(vector_info["DESCRIPTION"])
                 else:
                     titles.append(
-                        f"{simulation_vector_description(vect)}"
-                        f" [{simulation_unit_reformat(self.smry_meta.unit[vect])}]"
+                        f"{vector_info['DESCRIPTION']} [{vector_info['UNIT']}]"
                     )
                 if visualization == "statistics_hist":
                     titles.append(date)
@@ -501,15 +720,33 @@ Plot options:
                     smry_meta=self.smry_meta,
                 )
                 if calc_mode == "ensembles":
-                    data = filter_df(self.smry, ensembles, vector, self.smry_meta)
+                    data = filter_df(self.smry_store, ensembles, vector, self.smry_meta)
+                    data = resample_smry(data, sampling, self.smry_meta)
                 elif calc_mode == "delta_ensembles":
-                    data = filter_df(
-                        self.smry, [base_ens, delta_ens], vector, self.smry_meta
+                    data = calculate_delta(
+                        self.smry_store,
+                        base_ens,
+                        delta_ens,
+                        vector,
+                        sampling,
+                        self.smry_meta,
                     )
-                    data = calculate_delta(data, base_ens, delta_ens)
                 else:
                     raise PreventUpdate
+                if realizations is not None:
+                    data = filter_realizations(data, realizations)
 
+                # Precomputed statistics are only valid for the initial sampling and
+                # all realizations, and are not available for calculated vectors
+                smry_stats = (
+                    self.smry_stats
+                    if calc_mode == "ensembles"
+                    and realizations is None
+                    and sampling == self.sampling
+                    and self.smry_stats is not None
+                    and vector in self.smry_stats.vector_index
+                    else None
+                )
                 if visualization == "statistics":
                     traces = add_statistic_traces(
                         data,
@@ -517,6 +754,7 @@ Plot options:
                         colors=self.ens_colors,
                         line_shape=line_shape,
                         smry_meta=self.smry_meta,
+                        smry_stats=smry_stats,
                     )
                 elif visualization == "realizations":
                     traces = add_realization_traces(
@@ -525,6 +763,8 @@ Plot options:
                         colors=self.ens_colors,
                         line_shape=line_shape,
                         smry_meta=self.smry_meta,
+                        merge=self.merge_realization_traces,
+                        max_points=self.downsample_width,
                     )
                 elif visualization == "statistics_hist":
                     traces = add_statistic_traces(
@@ -533,9 +773,18 @@ Plot options:
                         colors=self.ens_colors,
                         line_shape=line_shape,
                         smry_meta=self.smry_meta,
+                        smry_stats=smry_stats,
                     )
                     histdata = add_histogram_traces(
-                        data, vector, date=date, colors=self.ens_colors
+                        data,
+                        vector,
+                        date=date,
+                        colors=self.ens_colors,
+                        date_index=get_date_index(self.smry_store, ensembles, sampling)
+                        if calc_mode == "ensembles"
+                        and realizations is None
+                        and isinstance(self.smry_store, SmryStore)
+                        else None,
                     )
                     for trace in histdata:
                         fig.add_trace(trace, i + 1, 2)
@@ -593,6 +842,45 @@ Plot options:
                 style = {"display": "none"}, {"display": "block"}
             return style
 
+        @app.callback(
+            [
+                Output(self.uuid("filter_range"), "min"),
+                Output(self.uuid("filter_range"), "max"),
+                Output(self.uuid("filter_range"), "step"),
+                Output(self.uuid("filter_range"), "value"),
+                Output(self.uuid("filter_range"), "disabled"),
+            ],
+            [Input(self.uuid("filter_parameter"), "value")],
+        )
+        def _update_filter_range(parameter):
+            """Set the range slider to the range of the selected parameter"""
+            if self.realization_filter is None or not parameter:
+                return 0, 1, 0.01, [0, 1], True
+            low, high = (
+                float(value)
+                for value in self.realization_filter.parameter_range(parameter)
+            )
+            return (
+                low,
+                high,
+                (high - low) / 100 if high > low else 1,
+                [low, high],
+                False,
+            )
+
+        for vector_id in ["vector1", "vector2", "vector3"]:
+
+            @app.callback(
+                Output(self.uuid(vector_id), "options"),
+                [Input(self.uuid(vector_id), "search_value")],
+                [State(self.uuid(vector_id), "value")],
+            )
+            def _update_vector_options(search_value, value):
+                """Serve the vectors matching the search as dropdown options"""
+                if not search_value:
+                    raise PreventUpdate
+                return self.vector_options(value, search_value)
+
         @app.callback(
             Output(self.uuid("date"), "data"),
             [Input(self.uuid("graph"), "clickData")],
@@ -610,7 +898,7 @@ Plot options:
         else:
             functions.append(
                 (
-                    load_smry,
+                    create_smry_store,
                     [
                         {
                             "ensemble_paths": self.ens_paths,
@@ -621,6 +909,21 @@ Plot options:
                     ],
                 )
             )
+            if self.precompute_statistics:
+                functions.append(
+                    (
+                        create_smry_statistics,
+                        [
+                            {
+                                "ensemble_paths": self.ens_paths,
+                                "ensemble_set_name": "EnsembleSet",
+                                "time_index": self.time_index,
+                                "column_keys": self.column_keys,
+                                "sampling": self.sampling,
+                            }
+                        ],
+                    )
+                )
             functions.append(
                 (
                     load_smry_meta,
@@ -633,6 +936,18 @@ Plot options:
                     ],
                 )
             )
+        if self.realization_filter is not None:
+            functions.append(
+                (
+                    load_parameters,
+                    [
+                        {
+                            "ensemble_paths": self.ens_paths,
+                            "ensemble_set_name": "EnsembleSet",
+                        }
+                    ],
+                )
+            )
         if self.obsfile:
             functions.append((get_path, [{"path": self.obsfile}]))
         return functions
@@ -645,45 +960,101 @@ def format_observations(obslist):
         raise KeyError("Observation file has invalid format")
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def filter_df(df, ensembles, vector, smry_meta):
-    """Filter dataframe for current vector. Include history
-    vector if present"""
-    columns = ["REAL", "ENSEMBLE", vector, "DATE"]
-    if historical_vector(vector=vector, smry_meta=smry_meta) in df.columns:
+@fingerprint_memoize(timeout=CACHE.TIMEOUT, local_types=(SmryCube,))
+def filter_df(smry_store, ensembles, vector, smry_meta):
+    """Load dataframe for current vector and ensembles from the summary store.
+    Include history vector if present"""
+    columns = [vector]
+    if historical_vector(vector=vector, smry_meta=smry_meta) in smry_store.vectors:
         columns.append(historical_vector(vector=vector, smry_meta=smry_meta))
 
-    return df.loc[df["ENSEMBLE"].isin(ensembles)][columns]
+    if isinstance(smry_store, SmryCube):
+        return smry_store.subset(ensembles, columns)
+    return smry_store.get(columns, ensembles)
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def calculate_delta(df, base_ens, delta_ens):
-    """Calculate delta between two ensembles"""
-    base_df = (
-        df.loc[df["ENSEMBLE"] == base_ens]
-        .set_index(["DATE", "REAL"])
-        .drop("ENSEMBLE", axis=1)
+def message_figure(message, theme):
+    """Figure without data, showing a message"""
+    return {
+        "data": [],
+        "layout": theme.create_themed_layout(
+            {
+                "height": 800,
+                "xaxis": {"visible": False},
+                "yaxis": {"visible": False},
+                "annotations": [
+                    {
+                        "text": message,
+                        "showarrow": False,
+                        "xref": "paper",
+                        "yref": "paper",
+                        "x": 0.5,
+                        "y": 0.5,
+                        "font": {"size": 16},
+                    }
+                ],
+            }
+        ),
+    }
+
+
+def filter_realizations(data, realizations):
+    """Rows of data (as given by `filter_df` or `calculate_delta`) for the given
+    realizations of each ensemble. Ensembles not in `realizations` are kept as is.
+    """
+    if isinstance(data, SmryCube):
+        return data.select_realizations(realizations)
+    ensembles = np.asarray(data["ENSEMBLE"])
+    reals = np.asarray(data["REAL"], dtype=np.int64)
+    keep = np.ones(len(data), dtype=bool)
+    for ensemble, ens_reals in realizations.items():
+        rows = ensembles == ensemble
+        # Lookup table of selected realization numbers
+        selected = np.zeros(
+            max(reals.max(initial=0), max(ens_reals, default=0)) + 1, dtype=bool
+        )
+        selected[np.asarray(ens_reals, dtype=np.int64)] = True
+        keep[rows] = selected[reals[rows]]
+    return data[keep]
+
+
+# pylint: disable=too-many-arguments
+@fingerprint_memoize(timeout=CACHE.TIMEOUT, local_types=(SmryCube,))
+def calculate_delta(smry_store, base_ens, delta_ens, vector, sampling, smry_meta):
+    """Calculate delta between two ensembles for a vector (and its history vector
+    if present). The alignment of the ensembles on DATE and REAL is shared by all
+    vectors (see `get_delta_alignment`)."""
+    data = resample_smry(
+        filter_df(smry_store, [base_ens, delta_ens], vector, smry_meta),
+        sampling,
+        smry_meta,
     )
-    delta_df = (
-        df.loc[df["ENSEMBLE"] == delta_ens]
-        .set_index(["DATE", "REAL"])
-        .drop("ENSEMBLE", axis=1)
+    if isinstance(data, SmryCube):
+        return data.delta(base_ens, delta_ens)
+    alignment = get_delta_alignment(smry_store, base_ens, delta_ens, sampling)
+    return alignment.delta_frame(
+        data,
+        [col for col in data.columns if col not in ["ENSEMBLE", "REAL", "DATE"]],
+        name=f"({base_ens}) - ({delta_ens})",
     )
-    dframe = base_df.sub(delta_df).reset_index()
-    dframe["ENSEMBLE"] = f"({base_ens}) - ({delta_ens})"
-    return dframe.fillna(0)
-
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def add_histogram_traces(dframe, vector, date, colors):
-    """Renders a histogram trace per ensemble for a given date"""
-    dframe["DATE"] = dframe["DATE"].astype(str)
-    data = dframe.loc[dframe["DATE"] == date]
 
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def add_histogram_traces(dframe, vector, date, colors, date_index=None):
+    """Renders a histogram trace per ensemble for a given date. The rows of the date
+    are found with date_index if given (see `get_date_index`)"""
+    if isinstance(dframe, SmryCube):
+        values = dframe.values_at_date(vector, date).items()
+    else:
+        date_index = date_index if date_index is not None else DateIndex(dframe)
+        values = [
+            (ensemble, dframe[vector].values[date_index.rows(date, ensemble)])
+            for ensemble in date_index.ensembles
+        ]
     return [
         {
             "type": "histogram",
-            "x": list(ens_df[vector]),
+            "x": list(ens_values),
             "name": ensemble,
             "marker": {
                 "color": colors.get(ensemble, colors[list(colors.keys())[0]]),
@@ -691,7 +1062,8 @@ def add_histogram_traces(dframe, vector, date, colors):
             },
             "showlegend": False,
         }
-        for ensemble, ens_df in data.groupby("ENSEMBLE")
+        for ensemble, ens_values in values
+        if len(ens_values)
     ]
 
 
@@ -715,25 +1087,71 @@ def add_observation_trace(obs):
     ]
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def add_realization_traces(dframe, vector, colors, line_shape, smry_meta):
-    """Renders line trace for each realization, includes history line if present"""
-    traces = [
-        {
-            "line": {"shape": line_shape},
-            "x": list(real_df["DATE"]),
-            "y": list(real_df[vector]),
-            "hovertext": f"Realization: {real_no}, Ensemble: {ensemble}",
-            "name": ensemble,
-            "legendgroup": ensemble,
-            "marker": {"color": colors.get(ensemble, colors[list(colors.keys())[0]])},
-            "showlegend": real_no == 0,
-        }
-        for ens_no, (ensemble, ens_df) in enumerate(dframe.groupby("ENSEMBLE"))
-        for real_no, (real, real_df) in enumerate(ens_df.groupby("REAL"))
-    ]
+# pylint: disable=too-many-arguments
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def add_realization_traces(
+    dframe, vector, colors, line_shape, smry_meta, merge=False, max_points=None
+):
+    """Renders line trace for each realization, includes history line if present.
+    If merge is True, all realizations of an ensemble are rendered as a single trace.
+    If max_points is given, the realization lines are downsampled to at most
+    max_points points each. Values are sent as typed arrays (see `encode_trace`).
+    """
+    if max_points:
+        traces = _downsampled_realization_traces(
+            dframe, vector, colors, line_shape, merge, max_points
+        )
+    elif merge:
+        traces = [
+            {
+                "line": {"shape": line_shape},
+                **realization_data,
+                "name": ensemble,
+                "legendgroup": ensemble,
+                "marker": {
+                    "color": colors.get(ensemble, colors[list(colors.keys())[0]])
+                },
+                "showlegend": True,
+            }
+            for ensemble, realization_data in _merged_realizations(dframe, vector)
+        ]
+    else:
+        if isinstance(dframe, SmryCube):
+            realizations = (
+                (
+                    ensemble,
+                    real_no,
+                    pd.to_datetime(cube.dates[present]),
+                    values[present],
+                )
+                for ensemble, cube in dframe.cubes.items()
+                for real_no, (present, values) in enumerate(
+                    zip(cube.present, cube.vector(vector))
+                )
+            )
+        else:
+            realizations = (
+                (ensemble, real_no, real_df["DATE"], real_df[vector])
+                for ensemble, ens_df in dframe.groupby("ENSEMBLE", observed=True)
+                for real_no, (real, real_df) in enumerate(ens_df.groupby("REAL"))
+            )
+        traces = [
+            {
+                "line": {"shape": line_shape},
+                "x": list(dates),
+                "y": list(values),
+                "hovertext": f"Realization: {real_no}, Ensemble: {ensemble}",
+                "name": ensemble,
+                "legendgroup": ensemble,
+                "marker": {
+                    "color": colors.get(ensemble, colors[list(colors.keys())[0]])
+                },
+                "showlegend": real_no == 0,
+            }
+            for ensemble, real_no, dates, values in realizations
+        ]
 
-    if historical_vector(vector=vector, smry_meta=smry_meta) in dframe.columns:
+    if historical_vector(vector=vector, smry_meta=smry_meta) in _columns(dframe):
         traces.append(
             add_history_trace(
                 dframe,
@@ -741,19 +1159,114 @@ def add_realization_traces(dframe, vector, colors, line_shape, smry_meta):
                 line_shape,
             )
         )
+    return [encode_trace(trace, keys=("y", "customdata")) for trace in traces]
+
+
+# pylint: disable=too-many-arguments
+def _downsampled_realization_traces(
+    dframe, vector, colors, line_shape, merge, max_points
+):
+    """Realization traces, where the lines of all realizations in an ensemble are
+    downsampled together (see `downsample_lines`)"""
+    if not isinstance(dframe, SmryCube):
+        dframe = SmryCube.from_frame(
+            dframe[["ENSEMBLE", "REAL", "DATE", vector]], source=""
+        )
+    traces = []
+    for ensemble, cube in dframe.cubes.items():
+        dates, values, shape = downsample_lines(
+            cube.dates, cube.vector(vector), max_points, line_shape
+        )
+        valid = ~np.isnan(values)
+        color = colors.get(ensemble, colors[list(colors.keys())[0]])
+        if merge:
+            x, y, reals = concatenate_realizations(
+                dates[valid],
+                values[valid],
+                np.broadcast_to(cube.reals[:, np.newaxis], valid.shape)[valid],
+            )
+            traces.append(
+                {
+                    "line": {"shape": shape},
+                    "x": x,
+                    "y": y,
+                    "customdata": reals,
+                    "hovertemplate": "(%{x}, %{y})<br>"
+                    f"Realization: %{{customdata}}, Ensemble: {ensemble}",
+                    "name": ensemble,
+                    "legendgroup": ensemble,
+                    "marker": {"color": color},
+                    "showlegend": True,
+                }
+            )
+            continue
+        traces.extend(
+            {
+                "line": {"shape": shape},
+                "x": list(pd.to_datetime(dates[real_no][valid[real_no]])),
+                "y": list(values[real_no][valid[real_no]]),
+                "hovertext": f"Realization: {real_no}, Ensemble: {ensemble}",
+                "name": ensemble,
+                "legendgroup": ensemble,
+                "marker": {"color": color},
+                "showlegend": real_no == 0,
+            }
+            for real_no in range(len(cube.reals))
+            if valid[real_no].any()
+        )
     return traces
 
 
+def _merged_realizations(dframe, vector):
+    """Trace data per ensemble with all realizations in a single line"""
+    if not isinstance(dframe, SmryCube):
+        for ensemble, ens_df in dframe.groupby("ENSEMBLE", observed=True):
+            yield ensemble, merged_realization_trace(
+                ens_df,
+                "DATE",
+                vector,
+                hovertext=f"Realization: {{real}}, Ensemble: {ensemble}",
+            )
+        return
+    for ensemble, cube in dframe.cubes.items():
+        # A column of NaN is appended to separate the realizations
+        gap = np.ones((len(cube.reals), 1), dtype=bool)
+        mask = np.hstack([cube.present, gap & cube.present.any(axis=1, keepdims=True)])
+        dates = np.append(cube.dates, cube.dates[-1:])
+        values = np.hstack([cube.vector(vector), np.full(gap.shape, np.nan)])
+        # The gap after the last realization is left out
+        last = max(mask.sum() - 1, 0)
+        yield ensemble, {
+            "x": np.broadcast_to(dates, mask.shape)[mask][:last],
+            "y": values[mask][:last],
+            "customdata": np.broadcast_to(cube.reals[:, np.newaxis], mask.shape)[mask][
+                :last
+            ],
+            "hovertemplate": "(%{x}, %{y})<br>"
+            f"Realization: %{{customdata}}, Ensemble: {ensemble}",
+        }
+
+
+def _columns(data):
+    return data.vectors if isinstance(data, SmryCube) else data.columns
+
+
 def add_history_trace(dframe, vector, line_shape):
     """Renders the history line"""
-    df = dframe.loc[
-        (dframe["REAL"] == dframe["REAL"].unique()[0])
-        & (dframe["ENSEMBLE"] == dframe["ENSEMBLE"].unique()[0])
-    ]
+    if isinstance(dframe, SmryCube):
+        cube = dframe.cubes[dframe.ensembles[0]]
+        dates = pd.to_datetime(cube.dates[cube.present[0]])
+        values = cube.vector(vector)[0, cube.present[0]]
+    else:
+        df = dframe.loc[
+            (dframe["REAL"] == dframe["REAL"].unique()[0])
+            & (dframe["ENSEMBLE"] == dframe["ENSEMBLE"].unique()[0])
+        ]
+        dates, values = df["DATE"], df[vector]
     return {
         "line": {"shape": line_shape},
-        "x": df["DATE"],
-        "y": df[vector],
+        "x": dates,
+        "y": values,
         "hovertext": "History",
         "hoverinfo": "y+x+text",
         "name": "History",
@@ -762,32 +1275,44 @@ def add_history_trace(dframe, vector, line_shape):
     }
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def add_statistic_traces(df, vector, colors, line_shape, smry_meta):
-    """Calculate statistics for a given vector for relevant ensembles"""
-    quantiles = [10, 90]
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def add_statistic_traces(df, vector, colors, line_shape, smry_meta, smry_stats=None):
+    """Calculate statistics for a given vector for relevant ensembles.
+    If precomputed statistics are given, these are looked up instead."""
     traces = []
-
-    for ensemble, ens_df in df.groupby("ENSEMBLE"):
-        dframe = ens_df.drop(columns=["ENSEMBLE", "REAL"]).groupby("DATE")
-
-        # Build a dictionary of dataframes to be concatenated
-        dframes = {}
-        dframes["mean"] = dframe.mean()
-        for quantile in quantiles:
-            quantile_str = "p" + str(quantile)
-            dframes[quantile_str] = dframe.quantile(q=quantile / 100.0)
-        dframes["maximum"] = dframe.max()
-        dframes["minimum"] = dframe.min()
+    if smry_stats is not None:
+        ensemble_stats = (
+            (ensemble, smry_stats.get(ensemble, vector))
+            for ensemble in (
+                df.ensembles
+                if isinstance(df, SmryCube)
+                else sorted(df["ENSEMBLE"].unique())
+            )
+            if smry_stats.get(ensemble, vector) is not None
+        )
+    elif isinstance(df, SmryCube):
+        # Reductions along the realization axis of each ensemble cube
+        ensemble_stats = (
+            (ensemble, cube.statistics(vector))
+            for ensemble, cube in df.cubes.items()
+            if len(cube.reals)
+        )
+    else:
+        stat_df = ensemble_statistics(df, [vector], x="DATE", group_by=["ENSEMBLE"])
+        ensemble_stats = (
+            (ensemble, stat_df.loc[ensemble][vector])
+            for ensemble in stat_df.index.unique(level="ENSEMBLE")
+        )
+    for ensemble, vector_stats in ensemble_stats:
         traces.extend(
             add_fanchart_traces(
-                pd.concat(dframes, names=["STATISTIC"], sort=False)[vector],
+                vector_stats,
                 colors.get(ensemble, colors[list(colors.keys())[0]]),
                 ensemble,
                 line_shape,
             )
         )
-    if historical_vector(vector=vector, smry_meta=smry_meta) in df.columns:
+    if historical_vector(vector=vector, smry_meta=smry_meta) in _columns(df):
         traces.append(
             add_history_trace(
                 df, historical_vector(vector=vector, smry_meta=smry_meta), line_shape,
@@ -22,12 +22,14 @@ from .._datainput.fmu_input import (
     find_sens_type,
     load_smry_meta,
 )
+from .._datainput.date_index import DateIndex
 from .._abbreviations.reservoir_simulation import (
     simulation_vector_description,
     simulation_unit_reformat,
     historical_vector,
 )
 from .._abbreviations.number_formatting import table_statistics_base
+from .._utils.realization_traces import merged_realization_trace
 from .._utils.simulation_timeseries import (
     set_simulation_line_shape_fallback,
     get_simulation_line_shape,
@@ -73,6 +75,9 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
                 are always linearly interpolated. The rest use the fallback.
                 Supported: `linear` (default), `backfilled` + regular Plotly options: `hv`, `vh`,
                 `hvh`, `vhv` and `spline`.
+* `merge_realization_traces`: If `True`, realizations are drawn as a single trace per
+                              highlight category (e.g. low and high case of the selected
+                              sensitivity), instead of one trace per realization.
 """
 
     ENSEMBLE_COLUMNS = [
@@ -98,6 +103,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
         initial_vector=None,
         sampling: str = "monthly",
         line_shape_fallback: str = "linear",
+        merge_realization_traces: bool = False,
     ):
 
         super().__init__()
@@ -149,6 +155,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
             )
 
         self.data = pd.merge(smry, parameters, on=["ENSEMBLE", "REAL"])
+        self.date_index = DateIndex(self.data)
         self.smry_cols = [
             c
             for c in self.data.columns
@@ -163,6 +170,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
         self.line_shape_fallback = set_simulation_line_shape_fallback(
             line_shape_fallback
         )
+        self.merge_realization_traces = merge_realization_traces
         self.tornadoplot = TornadoPlot(app, parameters, allow_click=True)
         self.uid = uuid4()
         self.theme = app.webviz_settings["theme"]
@@ -356,7 +364,141 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
             ]
         )
 
-    # pylint: disable=too-many-statements
+    def merged_traces(self, ensemble, vector, tornado_click=None):
+        """Realizations as a single trace, or if a sensitivity is selected, one trace
+        each for the low case, the high case and the remaining realizations"""
+        hist_vector = historical_vector(vector, self.smry_meta, True)
+        has_history = hist_vector in self.data.columns
+        data = filter_ensemble(
+            self.data, ensemble, [vector, hist_vector] if has_history else [vector]
+        )
+        line_shape = get_simulation_line_shape(
+            line_shape_fallback=self.line_shape_fallback,
+            vector=vector,
+            smry_meta=self.smry_meta,
+        )
+        groups = _sensitivity_groups(
+            data,
+            ensemble,
+            tornado_click,
+            self.theme.plotly_theme["layout"]["colorway"],
+        )
+        traces = [
+            {
+                "type": "line",
+                **merged_realization_trace(
+                    df, "DATE", vector, hovertext="Real: {real}"
+                ),
+                "line": {"shape": line_shape},
+                "legendgroup": ensemble,
+                "showlegend": True,
+                **properties,
+            }
+            for df, properties in groups
+            if not df.empty
+        ]
+        if has_history:
+            hist = data[data["REAL"] == data["REAL"].iloc[0]]
+            traces.append(
+                {
+                    "type": "line",
+                    "x": hist["DATE"],
+                    "y": hist[hist_vector],
+                    "line": {"shape": line_shape, "color": "black", "width": 3},
+                    "name": "History",
+                    "legendgroup": "History",
+                    "showlegend": True,
+                }
+            )
+        return traces
+
+    def realization_traces(self, ensemble, vector):
+        """One trace per realization, with sensitivity metadata used when
+        highlighting a selected sensitivity"""
+        hist_vector = historical_vector(vector, self.smry_meta, True)
+        if hist_vector in self.data.columns:
+            data = filter_ensemble(self.data, ensemble, [vector, hist_vector])
+        else:
+            data = filter_ensemble(self.data, ensemble, [vector])
+        line_shape = get_simulation_line_shape(
+            line_shape_fallback=self.line_shape_fallback,
+            vector=vector,
+            smry_meta=self.smry_meta,
+        )
+        traces = [
+            {
+                "type": "line",
+                "marker": {"color": "grey"},
+                "hoverinfo": "x+y+text",
+                "hovertext": f"Real: {r}",
+                "x": df["DATE"],
+                "y": df[vector],
+                "customdata": r,
+                "line": {"shape": line_shape},
+                "meta": {
+                    "SENSCASE": df["SENSCASE"].values[0],
+                    "SENSTYPE": df["SENSTYPE"].values[0],
+                },
+                "name": ensemble,
+                "legendgroup": ensemble,
+                "showlegend": r == data["REAL"][0],
+            }
+            for r, df in data.groupby(["REAL"])
+        ]
+        if hist_vector in data.columns:
+            hist = data[data["REAL"] == data["REAL"][0]]
+            traces.append(
+                {
+                    "type": "line",
+                    "x": hist["DATE"],
+                    "y": hist[hist_vector],
+                    "line": {"shape": line_shape, "color": "black", "width": 3},
+                    "name": "History",
+                    "legendgroup": "History",
+                    "showlegend": True,
+                }
+            )
+        return traces
+
+    def highlight_traces(self, traces, ensemble, tornado_click=None):
+        """Colors the realization traces in place by the low and high case of the
+        selected sensitivity, or resets them if no sensitivity is given"""
+        colorway = self.theme.plotly_theme["layout"]["colorway"]
+        legend_added = set()
+        for trace in traces:
+            if trace["name"] == "History":
+                continue
+            if tornado_click is None:
+                group = None
+                trace.update(
+                    {
+                        "marker": {"color": "grey"},
+                        "opacity": 1,
+                        "name": ensemble,
+                        "legendgroup": ensemble,
+                        "hoverinfo": "all",
+                        "hovertext": f"Real: {trace['customdata']}",
+                    }
+                )
+            elif trace["customdata"] in tornado_click["real_low"]:
+                group = "real_low"
+                trace.update(_case_properties(trace, group, colorway[0], "Below ref"))
+            elif trace["customdata"] in tornado_click["real_high"]:
+                group = "real_high"
+                trace.update(_case_properties(trace, group, colorway[1], "Above ref"))
+            else:
+                trace.update(
+                    {
+                        "marker": {"color": "lightgrey"},
+                        "opacity": 0.02,
+                        "showlegend": False,
+                        "hoverinfo": "skip",
+                    }
+                )
+                continue
+            trace["showlegend"] = group not in legend_added
+            legend_added.add(group)
+
     def set_callbacks(self, app):
         @app.callback(
             [
@@ -377,10 +519,11 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
             to table"""
             try:
                 date = clickdata["points"][0]["x"]
-            except TypeError:
-                raise PreventUpdate
-            data = filter_ensemble(self.data, ensemble, [vector])
-            data = data.loc[data["DATE"].astype(str) == date]
+            except TypeError as exc:
+                raise PreventUpdate from exc
+            data = self.date_index.cross_section(self.data, date, ensemble)[
+                ["DATE", "REAL", "SENSCASE", "SENSNAME", "SENSTYPE", vector]
+            ]
             table_rows, table_columns = calculate_table(data, vector)
             return (
                 # json.dumps(f"{date}"),
@@ -420,7 +563,7 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
                 State(self.ids("graph"), "clickData"),
                 State(self.ids("graph"), "figure"),
             ],
-        )  # pylint: disable=too-many-branches, too-many-locals
+        )
         def _render_tornado(
             tornado_click, high_low_storage, ensemble, vector, date_click, figure
         ):
@@ -434,142 +577,57 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
             else:
                 reset_click = False
 
-            # Draw initial figure and redraw if ensemble/vector changes
-            if ctx in ["", self.tornadoplot.high_low_storage_id] or reset_click:
-                if historical_vector(vector, self.smry_meta, True) in self.data.columns:
-                    data = filter_ensemble(
-                        self.data,
-                        ensemble,
-                        [vector, historical_vector(vector, self.smry_meta, True)],
-                    )
-                else:
-                    data = filter_ensemble(self.data, ensemble, [vector])
-                line_shape = get_simulation_line_shape(
-                    line_shape_fallback=self.line_shape_fallback,
-                    vector=vector,
-                    smry_meta=self.smry_meta,
-                )
-                traces = [
-                    {
-                        "type": "line",
-                        "marker": {"color": "grey"},
-                        "hoverinfo": "x+y+text",
-                        "hovertext": f"Real: {r}",
-                        "x": df["DATE"],
-                        "y": df[vector],
-                        "customdata": r,
-                        "line": {"shape": line_shape},
-                        "meta": {
-                            "SENSCASE": df["SENSCASE"].values[0],
-                            "SENSTYPE": df["SENSTYPE"].values[0],
-                        },
-                        "name": ensemble,
-                        "legendgroup": ensemble,
-                        "showlegend": r == data["REAL"][0],
-                    }
-                    for r, df in data.groupby(["REAL"])
-                ]
-                if historical_vector(vector, self.smry_meta, True) in data.columns:
-                    hist = data[data["REAL"] == data["REAL"][0]]
-                    traces.append(
-                        {
-                            "type": "line",
-                            "x": hist["DATE"],
-                            "y": hist[historical_vector(vector, self.smry_meta, True)],
-                            "line": {
-                                "shape": line_shape,
-                                "color": "black",
-                                "width": 3,
-                            },
-                            "name": "History",
-                            "legendgroup": "History",
-                            "showlegend": True,
-                        }
-                    )
-                # traces[0]["hoverinfo"] = "x"
+            if (
+                tornado_click
+                and tornado_click["sens_name"] in high_low_storage
+                and ctx == self.tornadoplot.high_low_storage_id
+            ):
+                tornado_click["real_low"] = high_low_storage[
+                    tornado_click["sens_name"]
+                ].get("real_low")
+                tornado_click["real_high"] = high_low_storage[
+                    tornado_click["sens_name"]
+                ].get("real_high")
+
+            if self.merge_realization_traces:
+                # All traces are rebuilt, as the realizations in each merged trace
+                # depend on the selected sensitivity
                 figure = {
-                    "data": traces,
+                    "data": self.merged_traces(
+                        ensemble,
+                        vector,
+                        tornado_click
+                        if tornado_click
+                        and not reset_click
+                        and tornado_click["sens_name"] in high_low_storage
+                        else None,
+                    ),
                     "layout": {"margin": {"t": 60}, "hovermode": "closest"},
                 }
-
-            # Update line colors if a sensitivity is selected in tornado
-            # pylint: disable=too-many-nested-blocks
-            if tornado_click and tornado_click["sens_name"] in high_low_storage:
-                if ctx == self.tornadoplot.high_low_storage_id:
-                    tornado_click["real_low"] = high_low_storage[
-                        tornado_click["sens_name"]
-                    ].get("real_low")
-                    tornado_click["real_high"] = high_low_storage[
-                        tornado_click["sens_name"]
-                    ].get("real_high")
-                if reset_click:
-                    add_legend = True
-                    for trace in figure["data"]:
-                        if trace["name"] != "History":
-                            if add_legend:
-                                trace["showlegend"] = True
-                                add_legend = False
-                            else:
-                                trace["showlegend"] = False
-                            trace["marker"] = {"color": "grey"}
-                            trace["opacity"] = 1
-                            trace["name"] = ensemble
-                            trace["legendgroup"] = ensemble
-                            trace["hoverinfo"] = "all"
-                            trace["hovertext"] = f"Real: {trace['customdata']}"
-
-                else:
-                    add_legend_low = True
-                    add_legend_high = True
-                    for trace in figure["data"]:
-                        if trace["name"] != "History":
-                            if trace["customdata"] in tornado_click["real_low"]:
-                                trace["marker"] = {
-                                    "color": self.theme.plotly_theme["layout"][
-                                        "colorway"
-                                    ][0]
-                                }
-                                trace["opacity"] = 1
-                                trace["legendgroup"] = "real_low"
-                                trace["hoverinfo"] = "all"
-                                trace["name"] = (
-                                    "Below ref"
-                                    if trace["meta"]["SENSTYPE"] == "mc"
-                                    else trace["meta"]["SENSCASE"]
-                                )
-                                if add_legend_low:
-                                    add_legend_low = False
-                                    trace["showlegend"] = True
-                                else:
-                                    trace["showlegend"] = False
-                            elif trace["customdata"] in tornado_click["real_high"]:
-                                trace["marker"] = {
-                                    "color": self.theme.plotly_theme["layout"][
-                                        "colorway"
-                                    ][1]
-                                }
-                                trace["opacity"] = 1
-                                trace["legendgroup"] = "real_high"
-                                trace["hoverinfo"] = "all"
-                                trace["name"] = (
-                                    "Above ref"
-                                    if trace["meta"]["SENSTYPE"] == "mc"
-                                    else trace["meta"]["SENSCASE"]
-                                )
-                                if add_legend_high:
-                                    add_legend_high = False
-                                    trace["showlegend"] = True
-                                else:
-                                    trace["showlegend"] = False
-                            else:
-                                trace["marker"] = {"color": "lightgrey"}
-                                trace["opacity"] = 0.02
-                                trace["showlegend"] = False
-                                trace["hoverinfo"] = "skip"
+            else:
+                # Draw initial figure and redraw if ensemble/vector changes
+                if ctx in ["", self.tornadoplot.high_low_storage_id] or reset_click:
+                    figure = {
+                        "data": self.realization_traces(ensemble, vector),
+                        "layout": {"margin": {"t": 60}, "hovermode": "closest"},
+                    }
+                # Update line colors if a sensitivity is selected in tornado
+                if tornado_click and tornado_click["sens_name"] in high_low_storage:
+                    self.highlight_traces(
+                        figure["data"],
+                        ensemble,
+                        None if reset_click else tornado_click,
+                    )
 
             date = date_click["points"][0]["x"]
-            ymin = min([min(trace["y"]) for trace in figure["data"]])
-            ymax = max([max(trace["y"]) for trace in figure["data"]])
+            ymin = min(
+                np.nanmin(np.asarray(trace["y"], dtype=float))
+                for trace in figure["data"]
+            )
+            ymax = max(
+                np.nanmax(np.asarray(trace["y"], dtype=float))
+                for trace in figure["data"]
+            )
             figure["layout"]["shapes"] = [
                 {"type": "line", "x0": date, "x1": date, "y0": ymin, "y1": ymax}
             ]
@@ -596,6 +654,59 @@ https://github.com/equinor/webviz-subsurface-testdata/blob/master/aggregated_dat
             return figure
 
 
+def _sensitivity_groups(data, ensemble, tornado_click, colorway):
+    """Realizations split into the low case, the high case and the remaining
+    realizations of a selected sensitivity, with trace properties for each"""
+    if tornado_click is None:
+        groups = [(data, {"name": ensemble, "marker": {"color": "grey"}})]
+    else:
+        low = data["REAL"].isin(tornado_click["real_low"])
+        high = data["REAL"].isin(tornado_click["real_high"]) & ~low
+        groups = [
+            (
+                data[~low & ~high],
+                {
+                    "name": ensemble,
+                    "marker": {"color": "lightgrey"},
+                    "opacity": 0.02,
+                    "showlegend": False,
+                    "hoverinfo": "skip",
+                },
+            )
+        ]
+        for mask, legendgroup, color, mc_name in [
+            (low, "real_low", colorway[0], "Below ref"),
+            (high, "real_high", colorway[1], "Above ref"),
+        ]:
+            if mask.any():
+                groups.append(
+                    (
+                        data[mask],
+                        {
+                            "name": mc_name
+                            if data.loc[mask, "SENSTYPE"].iloc[0] == "mc"
+                            else data.loc[mask, "SENSCASE"].iloc[0],
+                            "legendgroup": legendgroup,
+                            "marker": {"color": color},
+                        },
+                    )
+                )
+    return groups
+
+
+def _case_properties(trace, legendgroup, color, mc_name):
+    """Trace properties of a realization in the low or high case of a sensitivity"""
+    return {
+        "marker": {"color": color},
+        "opacity": 1,
+        "legendgroup": legendgroup,
+        "hoverinfo": "all",
+        "name": mc_name
+        if trace["meta"]["SENSTYPE"] == "mc"
+        else trace["meta"]["SENSCASE"],
+    }
+
+
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
 def calculate_table(df, vector):
     table = []
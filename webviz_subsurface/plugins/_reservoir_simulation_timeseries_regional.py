@@ -21,20 +21,26 @@ from webviz_config.webviz_store import webvizstore
 from webviz_config import WebvizPluginABC
 
 from .._datainput.fmu_input import load_smry, load_smry_meta
+from .._datainput.date_index import DateIndex
 from .._abbreviations.reservoir_simulation import (
     simulation_vector_base,
     simulation_vector_description,
-    simulation_region_vector_breakdown,
     simulation_region_vector_recompose,
     simulation_unit_reformat,
     historical_vector,
 )
 from .._abbreviations.number_formatting import table_statistics_base
 from .._utils.unique_theming import unique_colors
+from .._utils.ensemble_statistics import ensemble_statistics
+from .._utils.realization_traces import merged_realization_trace
+from .._utils.region_aggregation import region_vector_frame, get_region_aggregation
+from .._utils.fip_index import FipIndex
+from .._utils.region_vector_index import RegionVectorIndex
 from .._utils.simulation_timeseries import (
     set_simulation_line_shape_fallback,
     get_simulation_line_shape,
 )
+from .._utils.fingerprint_cache import fingerprint_memoize, set_fingerprint
 
 # pylint: disable=too-many-instance-attributes
 class ReservoirSimulationTimeSeriesRegional(WebvizPluginABC):
@@ -76,6 +82,8 @@ Vectors that don't match the following patterns will be filtered out for this pl
     * `hvh` (regular Plotly option)
     * `vhv` (regular Plotly option)
     * `spline` (regular Plotly option)
+* `merge_realization_traces`: If `True`, all realizations are drawn as a single trace per
+ ensemble and group, which is faster to transfer and render for large ensembles.
 """
 
     TABLE_STATISTICS = [("Group", {})] + table_statistics_base()
@@ -91,10 +99,12 @@ Vectors that don't match the following patterns will be filtered out for this pl
         column_keys: Optional[list] = None,
         sampling: str = "monthly",
         line_shape_fallback: str = "linear",
+        merge_realization_traces: bool = False,
     ):
 
         super().__init__()
         self.column_keys = column_keys
+        self.merge_realization_traces = merge_realization_traces
         self.time_index = sampling
         if self.time_index not in ("daily", "monthly", "yearly"):
             raise ValueError(
@@ -108,24 +118,27 @@ Vectors that don't match the following patterns will be filtered out for this pl
             ]
             for ensemble in ensembles
         }
-        self.smry = load_smry(
-            ensemble_paths=self.ens_paths,
-            column_keys=self.column_keys,
-            time_index=self.time_index,
+        self.smry = set_fingerprint(
+            load_smry(
+                ensemble_paths=self.ens_paths,
+                column_keys=self.column_keys,
+                time_index=self.time_index,
+            ),
+            f"load_smry:{(self.ens_paths, self.column_keys, self.time_index)}",
         )
         self.smry_meta = load_smry_meta(
             ensemble_paths=self.ens_paths, column_keys=self.column_keys
         )
-        self.field_totals = [
-            col for col in self.smry.columns if fnmatch.fnmatch(col, "F[OWG]PT")
-        ]
+        # Column names parsed once, for lookups of region vectors and nodes
+        self.vector_index = RegionVectorIndex(list(self.smry.columns))
+        self.field_totals = self.vector_index.match("F[OWG]PT")
         if self.field_totals:
             self.smry_init_prod = pd.concat(
                 [
                     df[["ENSEMBLE", "DATE"] + self.field_totals][
                         df["DATE"] == min(df["DATE"])
                     ]
-                    for _, df in self.smry.groupby("ENSEMBLE")
+                    for _, df in self.smry.groupby("ENSEMBLE", observed=True)
                 ]
             )
         else:
@@ -153,16 +166,14 @@ Vectors that don't match the following patterns will be filtered out for this pl
                         self.rec_ensembles.discard(ens)
         self.smry_cols = []
         self.smry_options = []
-        for col in self.smry.columns:
+        for col in self.vector_index.match("R[OGW]IP*", "R[OGW][IP][RT]*"):
             if (
                 col in ReservoirSimulationTimeSeriesRegional.ENSEMBLE_COLUMNS
                 or historical_vector(col, False) in self.smry_cols
             ):
                 continue
-            if fnmatch.fnmatch(col, "R[OGW]IP*") or fnmatch.fnmatch(
-                col, "R[OGW][IP][RT]*"
-            ):
-                self.smry_cols.append(col)
+            self.smry_cols.append(col)
+        self.region_index = self.vector_index.subset(self.smry_cols)
 
         if not self.smry_cols:
             raise ValueError(
@@ -184,13 +195,12 @@ Vectors that don't match the following patterns will be filtered out for this pl
         self.fipdesc = (
             None if self.fipfile is None else get_fipdesc(self.fipfile, self.smry_cols)
         )
+        self.fip_index = None if self.fipdesc is None else FipIndex(self.fipdesc)
         self.theme = app.webviz_settings["theme"]
         self.line_shape_fallback = set_simulation_line_shape_fallback(
             line_shape_fallback
         )
-        self.fip_arrays = list(
-            {simulation_region_vector_breakdown(col)[1] for col in self.smry_cols}
-        )
+        self.fip_arrays = self.region_index.fips
         self.set_callbacks(app)
 
     @property
@@ -279,16 +289,7 @@ Vectors that don't match the following patterns will be filtered out for this pl
 
     @property
     def all_nodes(self):
-        sorted_int_list = sorted(
-            list(
-                {
-                    int(col.split(":")[1])
-                    for col in self.smry_cols
-                    if len(col.split(":")) > 1 and col.split(":")[1].isdigit()
-                }
-            )
-        )
-        return [str(i) for i in sorted_int_list]
+        return [str(i) for i in self.region_index.nodes()]
 
     @property
     def groupby_colors(self):
@@ -527,12 +528,12 @@ Vectors that don't match the following patterns will be filtered out for this pl
             """
             fipdesc = (
                 None
-                if self.fipdesc is None or fip not in self.fipdesc["FIP"].values
+                if self.fip_index is None or fip not in self.fip_index
                 else self.fipdesc[self.fipdesc["FIP"] == fip]
             )
             # Creating wcc.Select components
             if fipdesc is None:
-                nodes = get_fip_array_nodes(fip, self.smry_cols)
+                nodes = [str(node) for node in self.region_index.nodes(fip)]
                 filters = [
                     html.Details(
                         open=True,
@@ -569,16 +570,14 @@ Vectors that don't match the following patterns will be filtered out for this pl
 
             # Update vectors
             vectors = set()
-            for col in self.smry_cols:
-                if simulation_region_vector_breakdown(col)[1] == fip:
-                    vector_base = simulation_vector_base(col)
-                    vectors.add(vector_base)
-                    if fnmatch.fnmatch(vector_base, "R[OG]IP*"):
-                        vectors.add(
-                            f"Recovery Factor of {simulation_vector_description(vector_base)} (("
-                            f"{vector_base} (initial) - {vector_base} (now))/{vector_base}"
-                            " (initial))"
-                        )
+            for vector_base in self.region_index.bases(fip):
+                vectors.add(vector_base)
+                if fnmatch.fnmatch(vector_base, "R[OG]IP*"):
+                    vectors.add(
+                        f"Recovery Factor of {simulation_vector_description(vector_base)} (("
+                        f"{vector_base} (initial) - {vector_base} (now))/{vector_base}"
+                        " (initial))"
+                    )
             vector_options = [
                 {
                     "label": simulation_vector_description(i)
@@ -618,9 +617,13 @@ Vectors that don't match the following patterns will be filtered out for this pl
             ],
             [Input(self.uuid("date"), "data")]
             + [Input({"page": self.uuid("selectors"), "value": ALL}, "value")],
-            [State(self.uuid("fip"), "value")],
+            [State(self.uuid("fip"), "value"), State(self.uuid("ref_vec"), "data")],
         )  # pylint: disable=too-many-locals
-        def _render_charts(date, _, fip_array):
+        def _render_charts(date, _, fip_array, stored_ref_vector):
+            # Only the single date view is updated when a date is clicked
+            date_clicked = [
+                trigger["prop_id"] for trigger in dash.callback_context.triggered
+            ] == [f"{self.uuid('date')}.data"]
             inputs = dash.callback_context.inputs
             date = json.loads(inputs.pop(f"{self.uuid('date')}.data"))
             ensembles = inputs.pop(self.selectors_context_string("ensemble", "value"))
@@ -647,6 +650,39 @@ Vectors that don't match the following patterns will be filtered out for this pl
             else:
                 mode = "agg"
                 vector_base = vector
+            single_date_args = {
+                "smry": self.smry,
+                "ensembles": ensembles,
+                "rec_ensembles": sorted(self.rec_ensembles),
+                "groupby": groupby,
+                "vector": vector_base,
+                "filters": filters,
+                "fip_index": self.fip_index,
+                "fip": fip_array,
+                "vector_index": self.vector_index,
+                "mode": mode,
+            }
+            if date_clicked:
+                if json.loads(stored_ref_vector) == "":
+                    # No data for the current selection
+                    raise PreventUpdate
+                date_data = get_single_date_data(**single_date_args)
+                return (
+                    dash.no_update,
+                    render_date_view(
+                        date_viz=date_viz,
+                        date_data=date_data,
+                        mode=mode,
+                        groupby=groupby,
+                        date=date,
+                        theme=self.theme,
+                        title=make_title(
+                            self.smry_meta, date_data.ref_vector, vector, mode
+                        ),
+                        colors=self.groupby_colors[groupby],
+                    ),
+                    dash.no_update,
+                )
             try:
                 df, ref_vector = filter_and_aggregate_vectors(
                     smry=self.smry,
@@ -654,8 +690,9 @@ Vectors that don't match the following patterns will be filtered out for this pl
                     groupby=groupby,
                     vector=vector_base,
                     filters=filters,
-                    fipdesc=self.fipdesc,
+                    fip_index=self.fip_index,
                     fip=fip_array,
+                    vector_index=self.vector_index,
                 )
             except KeyError as exception:
                 return [
@@ -700,35 +737,43 @@ Vectors that don't match the following patterns will be filtered out for this pl
                 mode=mode,
                 visualization=time_series_viz,
                 line_shape=line_shape,
+                merge_traces=self.merge_realization_traces,
             )
-            if time_series_viz == "statistics" or date_viz == "table":
-                stat_df = calc_statistics(df)
+            if df.empty:
+                # Recovery is not calculated for any of the selected ensembles
+                return [
+                    [{}],
+                    html.Div(
+                        children=(
+                            "Recovery can not be calculated for the selected "
+                            "ensemble(s), due to non-zero initial production."
+                        ),
+                        style={"textAlign": "center", "font-weight": "bold"},
+                    ),
+                    json.dumps(""),
+                ]
+            # Values and statistics for all dates, shared by the statistics time
+            # series and the single date views
+            date_data = get_single_date_data(**single_date_args)
             if time_series_viz == "statistics":
                 timeseries_traces = add_statistic_traces(
-                    stat_df=stat_df,
+                    stat_df=date_data.stat_df,
                     ensembles=ensembles,
                     mode=mode,
                     groupby=groupby,
                     groupby_color=self.groupby_colors,
                     line_shape=line_shape,
                 )
-            if date_viz == "table":
-                date_view = render_table(
-                    stat_df=stat_df, mode=mode, groupby=groupby, date=date
-                )
-            elif date_viz in ["box plot", "histogram", "per realization"]:
-                date_view = render_single_date_graph(
-                    date_viz=date_viz,
-                    df=df,
-                    mode=mode,
-                    groupby=groupby,
-                    date=date,
-                    theme=self.theme,
-                    title=make_title(self.smry_meta, ref_vector, vector, mode),
-                    colors=self.groupby_colors[groupby],
-                )
-            else:
-                date_view = html.Div(children="")
+            date_view = render_date_view(
+                date_viz=date_viz,
+                date_data=date_data,
+                mode=mode,
+                groupby=groupby,
+                date=date,
+                theme=self.theme,
+                title=make_title(self.smry_meta, ref_vector, vector, mode),
+                colors=self.groupby_colors[groupby],
+            )
             timeseries_layout = {
                 "hovermode": "closest",
                 "yaxis": {
@@ -829,7 +874,78 @@ def make_title(smry_meta: pd.DataFrame, ref_vector: str, vector: str, mode: str)
     )
 
 
-def render_single_date_graph(date_viz, df, mode, groupby, date, theme, title, colors):
+class SingleDateData:
+    """Aggregated vectors (or recovery) per realization and their statistics for
+    all dates, with the rows of each date indexed, such that showing a single date
+    is a lookup instead of filtering the time series.
+    """
+
+    def __init__(self, df: pd.DataFrame, stat_df: pd.DataFrame, ref_vector: str):
+        self.df = df
+        self.stat_df = stat_df
+        self.ref_vector = ref_vector
+        self._rows = DateIndex(df)
+        self._stat_rows = DateIndex(stat_df)
+
+    def values(self, date: str) -> pd.DataFrame:
+        return self.df.iloc[np.sort(self._rows.rows(date))]
+
+    def statistics(self, date: str) -> pd.DataFrame:
+        return self.stat_df.iloc[np.sort(self._stat_rows.rows(date))]
+
+
+# pylint: disable=too-many-arguments
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def get_single_date_data(
+    smry: pd.DataFrame,
+    ensembles: list,
+    rec_ensembles: list,
+    groupby: str,
+    vector: str,
+    filters: dict,
+    fip_index: Optional[FipIndex],
+    fip: str,
+    vector_index: RegionVectorIndex,
+    mode: str,
+) -> SingleDateData:
+    """Values and statistics for all dates for a selection, made once per selection
+    from the same (memoized) aggregation and recovery as the time series."""
+    df, ref_vector = filter_and_aggregate_vectors(
+        smry=smry,
+        ensembles=ensembles,
+        groupby=groupby,
+        vector=vector,
+        filters=filters,
+        fip_index=fip_index,
+        fip=fip,
+        vector_index=vector_index,
+    )
+    if mode == "rec":
+        df = calc_recovery(
+            df, [col for col in df.columns if col.startswith("AGG_")], rec_ensembles
+        )
+    return SingleDateData(df, calc_statistics(df), ref_vector)
+
+
+def render_date_view(date_viz, date_data, mode, groupby, date, theme, title, colors):
+    if date_viz == "table":
+        return render_table(
+            stat_df=date_data.statistics(date), mode=mode, groupby=groupby
+        )
+    if date_viz in ["box plot", "histogram", "per realization"]:
+        return render_single_date_graph(
+            date_viz=date_viz,
+            df=date_data.values(date),
+            mode=mode,
+            groupby=groupby,
+            theme=theme,
+            title=title,
+            colors=colors,
+        )
+    return html.Div(children="")
+
+
+def render_single_date_graph(date_viz, df, mode, groupby, theme, title, colors):
     def _make_trace(date_viz, df, col, name, color):
         if date_viz == "histogram":
             return {
@@ -866,8 +982,6 @@ def render_single_date_graph(date_viz, df, mode, groupby, date, theme, title, co
         dict.fromkeys(columns)
     )  # Make unique while preserving order of first occurance.
     traces = []
-    df["DATE"] = df["DATE"].astype(str)
-    df = df.loc[df["DATE"] == date]
     if groupby == "ENSEMBLE":
         for ens in df["ENSEMBLE"].unique():
             if len(columns) != 1:
@@ -944,7 +1058,7 @@ def render_single_date_graph(date_viz, df, mode, groupby, date, theme, title, co
     )
 
 
-def render_table(stat_df, mode, groupby, date):
+def render_table(stat_df, mode, groupby):
     columns = []
     if mode == "agg":
         columns = [col[0] for col in stat_df.columns if col[0].startswith("AGG_")]
@@ -956,8 +1070,6 @@ def render_table(stat_df, mode, groupby, date):
         dict.fromkeys(columns)
     )  # Make unique while preserving order of first occurance.
 
-    stat_df["DATE"] = stat_df["DATE"].astype(str)
-    stat_df = stat_df.loc[stat_df["DATE"] == date]
     table = []
     for col in columns:
         if groupby == "ENSEMBLE":
@@ -971,10 +1083,10 @@ def render_table(stat_df, mode, groupby, date):
                 table.append(
                     {
                         "Group": ens,
-                        "Minimum": df["nanmin"].iat[0],
-                        "Maximum": df["nanmax"].iat[0],
-                        "Mean": df["nanmean"].iat[0],
-                        "Stddev": df["nanstd"].iat[0],
+                        "Minimum": df["minimum"].iat[0],
+                        "Maximum": df["maximum"].iat[0],
+                        "Mean": df["mean"].iat[0],
+                        "Stddev": df["std"].iat[0],
                         "P10": df["p10"].iat[0],
                         "P90": df["p90"].iat[0],
                     }
@@ -987,10 +1099,10 @@ def render_table(stat_df, mode, groupby, date):
             table.append(
                 {
                     "Group": col.split("_")[-1],
-                    "Minimum": df["nanmin"].iat[0],
-                    "Maximum": df["nanmax"].iat[0],
-                    "Mean": df["nanmean"].iat[0],
-                    "Stddev": df["nanstd"].iat[0],
+                    "Minimum": df["minimum"].iat[0],
+                    "Maximum": df["maximum"].iat[0],
+                    "Mean": df["mean"].iat[0],
+                    "Stddev": df["std"].iat[0],
                     "P10": df["p10"].iat[0],
                     "P90": df["p90"].iat[0],
                 }
@@ -1017,15 +1129,16 @@ def render_table(stat_df, mode, groupby, date):
     )
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
 def filter_and_aggregate_vectors(
     smry: pd.DataFrame,
     ensembles: list,
     groupby: str,
     vector: str,
     filters: dict,
-    fipdesc: pd.DataFrame,
+    fip_index: Optional[FipIndex],
     fip: str,
+    vector_index: RegionVectorIndex,
 ) -> pd.DataFrame:
     """Aggregate inplace vectors based on filters
     Note: ensemble is only in the list of inputs to reduce risk with caching
@@ -1034,14 +1147,13 @@ def filter_and_aggregate_vectors(
     """
     if groupby != "ENSEMBLE" and len(ensembles) > 1:  # This should never happen
         raise ValueError("Cannot have multiple ensembles unless you group by ensemble")
-    df = smry[smry["ENSEMBLE"].isin(ensembles)]
-    if fipdesc is None or fip not in fipdesc["FIP"].values:
+    if fip_index is None or fip not in fip_index:
         if groupby == "ENSEMBLE":
             nodes = filters
         else:
             nodes = {str(node): [node] for node in filters["regions"]}
     else:
-        nodes = get_nodes(groupby=groupby, fipdesc=fipdesc, fip=fip, filters=filters,)
+        nodes = fip_index.nodes(fip=fip, groupby=groupby, filters=filters)
     subgroup_vectors = {
         subgroup: [
             simulation_region_vector_recompose(
@@ -1062,13 +1174,23 @@ def filter_and_aggregate_vectors(
             continue
         break
 
-    # Aggregate, concatenate and return.
+    # Aggregate all subgroups at once. The region vectors are shared by all
+    # filters, such that changing filters only makes a new aggregation.
+    columns = vector_index.region_vectors(vector, fip)
+    df = region_vector_frame(smry, ensembles, columns)
+    aggregation = get_region_aggregation(columns, subgroup_vectors)
     return (
         pd.concat(
-            [df[["ENSEMBLE", "REAL", "DATE"]]]
-            + [
-                df[vectors].sum(axis=1).to_frame(f"AGG_{vector}_filtered_on_{subgroup}")
-                for subgroup, vectors in subgroup_vectors.items()
+            [
+                df[["ENSEMBLE", "REAL", "DATE"]],
+                pd.DataFrame(
+                    aggregation.apply(df[columns].values),
+                    columns=[
+                        f"AGG_{vector}_filtered_on_{subgroup}"
+                        for subgroup in aggregation.subgroups
+                    ],
+                    index=df.index,
+                ),
             ],
             axis=1,
         ),
@@ -1076,49 +1198,30 @@ def filter_and_aggregate_vectors(
     )
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def get_nodes(groupby: str, fipdesc: pd.DataFrame, fip: str, filters: dict):
-    df = fipdesc[fipdesc["FIP"] == fip]
-    nodes = dict()
-    for node, dfn in df.groupby("NODE"):
-        node_inc = True
-        node_subgroups = []
-        for group, subgroups in filters.items():
-            if dfn[dfn["GROUP"] == group].empty or not all(
-                dfn[dfn["GROUP"] == group]["SUBGROUP"].isin(subgroups)
-            ):
-                node_inc = False
-                break
-            if group == groupby and groupby != "ENSEMBLE":
-                node_subgroups.extend(dfn[dfn["GROUP"] == group]["SUBGROUP"])
-        if node_inc:
-            if groupby == "ENSEMBLE":
-                if "ENSEMBLE" in nodes:
-                    nodes["ENSEMBLE"].append(node)
-                else:
-                    nodes["ENSEMBLE"] = [node]
-            elif len(node_subgroups) == 1:
-                if node_subgroups[0] in nodes:
-                    nodes[node_subgroups[0]].append(node)
-                else:
-                    nodes[node_subgroups[0]] = [node]
-            elif len(node_subgroups) > 1:
-                raise ValueError(
-                    f"This should not occur, likely to be a bug. Vector nr {node} matched several"
-                    f"{groupby} that your tried to group by."
-                    "Please report this at https://github.com/equinor/webviz-subsurface/issues"
-                )
-    return nodes
-
-
-def calc_real_recovery(df, agg_vectors):
-    first = df[agg_vectors].values[0]
-    with np.errstate(invalid="ignore"):
-        return (first - df[agg_vectors].values) / first
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
+def calc_recovery(
+    df: pd.DataFrame, agg_vectors: list, rec_ensembles: list
+) -> pd.DataFrame:
+    """Recovery of the aggregated vectors for all realizations at once, relative to
+    the first value of each realization. Only ensembles in rec_ensembles are kept,
+    with the recovery of each aggregated vector as a REC column.
+    """
+    df = df[df["ENSEMBLE"].isin(rec_ensembles)].reset_index(drop=True)
+    groups = df.groupby(["ENSEMBLE", "REAL"], observed=True, sort=False)
+    # Groups are numbered in order of their first row
+    first_rows = np.flatnonzero(groups.cumcount().values == 0)
+    values = df[agg_vectors].values
+    first = values[first_rows[groups.ngroup().values]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rec = (first - values) / first
+    return pd.concat(
+        [df, pd.DataFrame(rec, columns=["REC" + vec[3:] for vec in agg_vectors]),],
+        axis=1,
+    )
 
 
 # pylint: disable=too-many-arguments, too-many-locals, unused-argument
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
+@fingerprint_memoize(timeout=CACHE.TIMEOUT)
 def per_real_calculations(
     df: pd.DataFrame,
     ensembles: list,
@@ -1130,42 +1233,38 @@ def per_real_calculations(
     mode: str,
     visualization: str,
     line_shape: str,
+    merge_traces: bool = False,
 ) -> tuple:
-    """All calls that are per realization are called here to avoid multiple loops:
-    That includes calculation of recovery and making traces per realization.
+    """Calculation of recovery (see `calc_recovery`), and making traces per
+    realization. If merge_traces is True, all realizations are instead rendered as a
+    single trace per ensemble and vector.
     This method assumes that the DataFrame 'df' has already been processed with
     the 'filter_and_aggregate_vectors' method.
     """
     if groupby != "ENSEMBLE" and len(ensembles) > 1:  # This should never happen
         raise ValueError("Cannot have multiple ensembles unless you group by ensemble")
     traces = []
-    ens_dfs = []
     # Find aggregated vectors
     agg_vectors = df.columns[df.columns.str.contains("AGG_.*")]
     # Subgroups from aggregated vector names to be used for e.g. legend.
     groupby_names = [
         agg_vector.split("_filtered_on_")[-1] for agg_vector in agg_vectors
     ]
-    # Make recovery vector names if relevant
     if mode == "rec":
-        rec_vectors = ["REC" + vec[3:] for vec in agg_vectors]
-    # Iterate over ensembles and realizations
-    for ens, ens_df in df.groupby("ENSEMBLE"):
-        ens_rec = []
-        if mode == "rec" and ens not in rec_ensembles:
-            continue
-        for real_no, (real, real_df) in enumerate(ens_df.groupby("REAL")):
-            if mode == "rec":
-                rec = calc_real_recovery(real_df, agg_vectors)
-                ens_rec.extend(rec)
-
-            if visualization == "realizations":
-                for i, vec in enumerate(agg_vectors):
+        # Cached separately, such that changing visualization does not recalculate
+        df = calc_recovery(df, list(agg_vectors), sorted(rec_ensembles))
+        vectors = ["REC" + vec[3:] for vec in agg_vectors]
+    else:
+        vectors = list(agg_vectors)
+    if visualization == "realizations" and not merge_traces:
+        for ens, ens_df in df.groupby("ENSEMBLE", observed=True):
+            for real_no, (real, real_df) in enumerate(ens_df.groupby("REAL")):
+                for i, vec in enumerate(vectors):
                     name = ens if groupby == "ENSEMBLE" else groupby_names[i]
                     traces.append(
                         {
                             "x": real_df["DATE"],
-                            "y": rec[:, i] if mode == "rec" else real_df[vec],
+                            "y": real_df[vec],
                             "hovertext": (
                                 f"{groupby.lower().capitalize()}: {name} "
                                 + f"Realization: {real}"
@@ -1177,43 +1276,41 @@ def per_real_calculations(
                             "line": {"shape": line_shape},
                         }
                     )
-        if mode == "rec":
-            # We want to store calculated recovery for statistical graphs and tables
-            ens_dfs.append(
-                pd.concat(
-                    [
-                        ens_df.reset_index(drop=True),
-                        pd.DataFrame(ens_rec, columns=rec_vectors).reset_index(
-                            drop=True
+    if visualization == "realizations" and merge_traces:
+        for ens, ens_df in df.groupby("ENSEMBLE", observed=True):
+            for i, vec in enumerate(vectors):
+                name = ens if groupby == "ENSEMBLE" else groupby_names[i]
+                traces.append(
+                    {
+                        **merged_realization_trace(
+                            ens_df,
+                            "DATE",
+                            vec,
+                            hovertext=(
+                                f"{groupby.lower().capitalize()}: {name} "
+                                + "Realization: {real}"
+                            ),
                         ),
-                    ],
-                    axis=1,
+                        "name": name,
+                        "legendgroup": name,
+                        "marker": {"color": groupby_colors[groupby][name]},
+                        "showlegend": True,
+                        "line": {"shape": line_shape},
+                    }
                 )
-            )
-    # Concat ensemble dfs with calculated recovery
-    if ens_dfs:
-        df = pd.concat(ens_dfs, ignore_index=True)
     return (traces, df)
 
 
 def calc_statistics(df):
     # Switched P10 and P90 due to convention in petroleum industry
-    def p10(x):
-        return np.nanpercentile(x, q=90)
-
-    def p90(x):
-        return np.nanpercentile(x, q=10)
-
-    stat_dfs = []
-    for ens, ens_df in df.groupby("ENSEMBLE"):
-        stat_dfs.append(
-            ens_df.drop(columns=["REAL", "ENSEMBLE"])
-            .groupby("DATE", as_index=False)
-            .agg([np.nanmean, np.nanstd, np.nanmin, np.nanmax, p10, p90])
-            .reset_index()
-            .assign(ENSEMBLE=ens)
-        )
-    return pd.concat(stat_dfs)
+    return ensemble_statistics(
+        df,
+        [col for col in df.columns if col not in ["REAL", "ENSEMBLE", "DATE"]],
+        x="DATE",
+        group_by=["ENSEMBLE"],
+        statistics=["mean", "std", "minimum", "maximum", "p10", "p90"],
+        high_p10=True,
+    ).reset_index()
 
 
 def add_statistic_traces(
@@ -1265,7 +1362,7 @@ def add_fanchart_traces(stat_df, col, legend_group, color, line_shape):
             "name": legend_group,
             "hovertext": f"Maximum {legend_group}",
             "x": stat_df["DATE"],
-            "y": stat_df[col]["nanmax"],
+            "y": stat_df[col]["maximum"],
             "mode": "lines",
             "line": {"width": 0, "color": line_color, "shape": line_shape},
             "legendgroup": legend_group,
@@ -1287,7 +1384,7 @@ def add_fanchart_traces(stat_df, col, legend_group, color, line_shape):
             "name": legend_group,
             "hovertext": f"Mean {legend_group}",
             "x": stat_df["DATE"],
-            "y": stat_df[col]["nanmean"],
+            "y": stat_df[col]["mean"],
             "mode": "lines",
             "fill": "tonexty",
             "fillcolor": fill_color,
@@ -1311,7 +1408,7 @@ def add_fanchart_traces(stat_df, col, legend_group, color, line_shape):
             "name": legend_group,
             "hovertext": f"Minimum {legend_group}",
             "x": stat_df["DATE"],
-            "y": stat_df[col]["nanmin"],
+            "y": stat_df[col]["minimum"],
             "mode": "lines",
             "fill": "tonexty",
             "fillcolor": fill_color,
@@ -1331,27 +1428,11 @@ def hex_to_rgb(hex_string, opacity=1):
     return f"rgba{tuple(rgb)}"
 
 
-def get_fip_array_nodes(fip, smry_cols):
-    """Sorted list of all available nodes for a given fip array (e.g FIPNUM)"""
-    sorted_int_list = sorted(
-        list(
-            {
-                int(col.split(":")[1])
-                for col in smry_cols
-                if (
-                    len(col.split(":")) > 1
-                    and col.split(":")[1].isdigit()
-                    and simulation_region_vector_breakdown(col)[1] == fip
-                )
-            }
-        )
-    )
-    return [str(i) for i in sorted_int_list]
-
-
 @webvizstore
 def get_fipdesc(fipfile: Path, column_keys: list) -> pd.DataFrame:
     fipdesc: list = []
+    # (FIP, GROUP, NODE) already given a subgroup
+    defined: set = set()
     with open(Path(fipfile), "r") as stream:
         fipdict = yaml.safe_load(stream)
     for fip, fipdef in fipdict.items():
@@ -1362,18 +1443,19 @@ def get_fipdesc(fipfile: Path, column_keys: list) -> pd.DataFrame:
                         raise TypeError(
                             f"FIP: {fip}, group: {group}, subgroup: {key} has non-integer input."
                         )
-                    if (fip, group, x) in fipdesc:
+                    if (fip, group, x) in defined:
                         raise ValueError(
                             f"FIP: {fip}, group: {group} has input which is not unique."
                             f"Value {x}  is used for multiple subgroups."
                         )
+                    defined.add((fip, group, x))
                     fipdesc.append((str(fip), str(group), str(key), x))
     df_before_data_verification = pd.DataFrame(
         fipdesc, columns=("FIP", "GROUP", "SUBGROUP", "NODE")
     )
     dfs = []
     for fip, fip_df in df_before_data_verification.groupby("FIP"):
-        nodes_in_data = get_fip_array_nodes(fip, column_keys)
+        nodes_in_data = RegionVectorIndex(column_keys).nodes(fip)
         dfs.extend(
             [
                 subgroup_df
@@ -8,10 +8,13 @@ def update_crossplot(df, sizeby, colorby):
 
     figures = []
 
-    for _ens, ensdf in df.groupby("ENSEMBLE"):
+    for _ens, ensdf in df.groupby("ENSEMBLE", observed=True):
 
         dframe = (
-            ensdf.groupby(["WELL", "DATE", "ZONE", "TVD"]).mean().reset_index().copy()
+            ensdf.groupby(["WELL", "DATE", "ZONE", "TVD"], observed=True)
+            .mean()
+            .reset_index()
+            .copy()
         )
         trace = {
             "x": dframe["OBS"],
@@ -84,7 +87,11 @@ def update_crossplot(df, sizeby, colorby):
 
 def size_color_settings(df, sizeby, colorby):
 
-    df = df.groupby(["WELL", "DATE", "ZONE", "TVD", "ENSEMBLE"]).mean().reset_index()
+    df = (
+        df.groupby(["WELL", "DATE", "ZONE", "TVD", "ENSEMBLE"], observed=True)
+        .mean()
+        .reset_index()
+    )
 
     sizeref = df[sizeby].quantile(0.9)
     cmin = df[colorby].min()
@@ -95,7 +102,11 @@ def size_color_settings(df, sizeby, colorby):
 
 def find_sim_range(df):
 
-    df = df.groupby(["WELL", "DATE", "ZONE", "TVD", "ENSEMBLE"]).mean().reset_index()
+    df = (
+        df.groupby(["WELL", "DATE", "ZONE", "TVD", "ENSEMBLE"], observed=True)
+        .mean()
+        .reset_index()
+    )
 
     max_sim = (
         df["SIMULATED"].max()
@@ -4,11 +4,11 @@ def update_errorplot(df, enscolors):
         lambda x: f"{x['WELL']} {int(x['YEAR'])} {x['ZONE']} ({int(x['TVD'])} TVD)",
         axis=1,
     )
-    df["DIFFMEAN"] = df.groupby(["WELL", "DATE", "ZONE", "TVD", "ENSEMBLE"])[
-        "ABSDIFF"
-    ].transform("median")
+    df["DIFFMEAN"] = df.groupby(
+        ["WELL", "DATE", "ZONE", "TVD", "ENSEMBLE"], observed=True
+    )["ABSDIFF"].transform("median")
     traces = []
-    for i, (ensemble, ensdf) in enumerate(df.groupby("ENSEMBLE")):
+    for i, (ensemble, ensdf) in enumerate(df.groupby("ENSEMBLE", observed=True)):
         if i == 0:
             ensdf = ensdf.sort_values(by=["DIFFMEAN"])
         traces.append(
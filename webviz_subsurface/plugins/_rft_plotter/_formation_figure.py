@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 
+from ..._utils.ensemble_statistics import ensemble_statistics
 from ._processing import interpolate_depth, filter_frame
 
 
@@ -128,7 +129,7 @@ class FormationFigure:
     def add_simulated_lines(self, date, ensembles):
         df = filter_frame(self.simdf, {"DATE": date, "ENSEMBLE": ensembles})
 
-        for ensemble, ensdf in df.groupby("ENSEMBLE"):
+        for ensemble, ensdf in df.groupby("ENSEMBLE", observed=True):
             for i, (real, realdf) in enumerate(ensdf.groupby("REAL")):
                 self.traces.append(
                     {
@@ -147,21 +148,12 @@ class FormationFigure:
 
     def add_fanchart(self, date, ensembles):
         df = filter_frame(self.simdf, {"DATE": date, "ENSEMBLE": ensembles})
-        for ensemble, ensdf in df.groupby("ENSEMBLE"):
-            dframe = interpolate_depth(ensdf)
-            quantiles = [10, 90]
-            dframe = dframe.drop(columns=["REAL"]).groupby("DEPTH")
-            # Build a dictionary of dataframes to be concatenated
-            dframes = {}
-            dframes["mean"] = dframe.mean()
-            for quantile in quantiles:
-                quantile_str = "p" + str(quantile)
-                dframes[quantile_str] = dframe.quantile(q=quantile / 100.0)
-            dframes["maximum"] = dframe.max()
-            dframes["minimum"] = dframe.min()
+        for ensemble, ensdf in df.groupby("ENSEMBLE", observed=True):
             self.traces.extend(
                 add_fanchart_traces(
-                    pd.concat(dframes, names=["STATISTIC"], sort=False)["PRESSURE"],
+                    ensemble_statistics(
+                        interpolate_depth(ensdf), ["PRESSURE"], x="DEPTH"
+                    )["PRESSURE"],
                     self.enscolors[ensemble],
                     ensemble,
                 )
@@ -3,7 +3,7 @@ class MapFigure:
 
         self.ertdf = (
             ertdf.loc[ertdf["ENSEMBLE"] == ensemble]
-            .groupby(["WELL", "DATE", "ENSEMBLE"])
+            .groupby(["WELL", "DATE", "ENSEMBLE"], observed=True)
             .aggregate("mean")
             .reset_index()
         )
@@ -5,9 +5,9 @@ def update_misfit_plot(df, enscolors):
 
     max_diff = find_max_diff(df)
     figures = []
-    for ens, ensdf in df.groupby("ENSEMBLE"):
+    for ens, ensdf in df.groupby("ENSEMBLE", observed=True):
 
-        realdf = ensdf.groupby("REAL").sum().reset_index()
+        realdf = ensdf.groupby("REAL")["ABSDIFF"].sum().reset_index()
 
         mean_diff = realdf["ABSDIFF"].mean()
         realdf = realdf.sort_values(by=["ABSDIFF"])
@@ -71,8 +71,8 @@ def average_arrow_annotation(mean_value, yref="y"):
 
 def find_max_diff(df):
     max_diff = 0
-    for _ens, ensdf in df.groupby("ENSEMBLE"):
-        realdf = ensdf.groupby("REAL").sum().reset_index()
+    for _ens, ensdf in df.groupby("ENSEMBLE", observed=True):
+        realdf = ensdf.groupby("REAL")["ABSDIFF"].sum().reset_index()
         max_diff = (
             max_diff if max_diff > realdf["ABSDIFF"].max() else realdf["ABSDIFF"].max()
         )
@@ -181,7 +181,7 @@ Note: Only TVD values are supported, plan to support MD values in a later realea
 
         self.ertdatadf = filter_frame(self.ertdatadf, {"ACTIVE": 1,})
         self.ertdatadf["STDDEV"] = self.ertdatadf.groupby(
-            ["WELL", "DATE", "ZONE", "ENSEMBLE", "TVD"]
+            ["WELL", "DATE", "ZONE", "ENSEMBLE", "TVD"], observed=True
         )["SIMULATED"].transform("std")
 
         self.set_callbacks(app)
@@ -1,4 +1,5 @@
 from typing import Union, Optional
+import os
 import json
 
 import pandas as pd
@@ -12,6 +13,7 @@ from webviz_config.common_cache import CACHE
 from webviz_config import WebvizPluginABC
 
 from .._datainput.fmu_input import load_ensemble_set, load_parameters
+from .._datainput.file_index import FILE_INDEX
 
 
 class RunningTimeAnalysisFMU(WebvizPluginABC):
@@ -488,6 +490,31 @@ def render_parcoord(plot_df, params, theme, colormap, color_col, colormap_labels
     return {"data": [data], "layout": layout}
 
 
+def find_status_files(ens_paths, status_file) -> pd.DataFrame:
+    """Paths of the status files in all realizations, with ensemble and realization"""
+    ens_set = load_ensemble_set(ens_paths, filter_file=None)
+    runpaths = [
+        (ens, real, realization.runpath())
+        for ens in ens_set.ensemblenames
+        for real, realization in sorted(ens_set[ens].realizations.items())
+    ]
+    status_files = pd.DataFrame(
+        [
+            {"FULLPATH": os.path.abspath(path), "REAL": real, "ENSEMBLE": ens}
+            for (ens, real, _), paths in zip(
+                runpaths,
+                FILE_INDEX.glob_many(
+                    [os.path.join(runpath, status_file) for _, _, runpath in runpaths]
+                ),
+            )
+            for path in paths
+        ],
+        columns=["FULLPATH", "REAL", "ENSEMBLE"],
+    )
+    FILE_INDEX.save_snapshot()
+    return status_files
+
+
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
 @webvizstore
 # pylint: disable=too-many-locals
@@ -533,13 +560,7 @@ def make_status_df(ens_paths, status_file, parameter_df) -> pd.DataFrame:
         return job_status_dfs
 
     # find status filepaths
-    ens_set = load_ensemble_set(ens_paths, filter_file=None)
-    df = pd.concat(
-        [
-            ens_set[ens].find_files(status_file).assign(ENSEMBLE=ens)
-            for ens in ens_set.ensemblenames
-        ]
-    )
+    df = find_status_files(ens_paths, status_file)
     # Initial values for local variables
     (job_status_dfs, ens_dfs, real_status) = ([], [], [])
     ens_max_job_runtime = 1
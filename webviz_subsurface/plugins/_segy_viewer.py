@@ -14,6 +14,7 @@ from webviz_config.webviz_store import webvizstore
 from webviz_config.utils import calculate_slider_step
 
 from .._datainput.seismic import load_cube_data, get_iline, get_xline, get_zslice
+from .._utils.figure_encoding import encode_trace
 
 
 class SegyViewer(WebvizPluginABC):
@@ -529,18 +530,21 @@ def make_heatmap(
 
     return {
         "data": [
-            {
-                "type": "heatmap",
-                "text": text if text else None,
-                "z": arr.tolist(),
-                "x": xaxis,
-                "y": yaxis,
-                "zsmooth": "best",
-                "showscale": showscale,
-                "colorscale": colors,
-                "zmin": zmin,
-                "zmax": zmax,
-            }
+            encode_trace(
+                {
+                    "type": "heatmap",
+                    "text": text if text else None,
+                    "z": arr,
+                    "x": xaxis,
+                    "y": yaxis,
+                    "zsmooth": "best",
+                    "showscale": showscale,
+                    "colorscale": colors,
+                    "zmin": zmin,
+                    "zmax": zmax,
+                },
+                keys=("z",),
+            )
         ],
         "layout": layout,
     }
@@ -16,6 +16,7 @@ from webviz_config.common_cache import CACHE
 from webviz_config import WebvizPluginABC
 
 from webviz_subsurface._datainput.fmu_input import get_realizations, find_surfaces
+from webviz_subsurface._datainput.file_index import FILE_INDEX
 from webviz_subsurface._datainput.surface import make_surface_layer, load_surface
 from webviz_subsurface._datainput.well import make_well_layers
 from webviz_subsurface._private_plugins.surface_selector import SurfaceSelector
@@ -673,11 +674,9 @@ def surfacedf_to_dict(df):
 
 @webvizstore
 def find_files(folder, suffix) -> io.BytesIO:
-    return io.BytesIO(
-        json.dumps(
-            sorted([str(filename) for filename in folder.glob(f"*{suffix}")])
-        ).encode()
-    )
+    files = FILE_INDEX.glob(Path(folder) / f"*{suffix}")
+    FILE_INDEX.save_snapshot()
+    return io.BytesIO(json.dumps(files).encode())
 
 
 def make_fmu_filename(data):
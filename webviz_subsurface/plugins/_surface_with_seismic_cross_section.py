@@ -17,6 +17,7 @@ from webviz_config.utils import calculate_slider_step
 
 from .._datainput.seismic import load_cube_data
 from .._datainput.surface import make_surface_layer, get_surface_fence
+from .._utils.figure_encoding import encode_trace
 
 
 class SurfaceWithSeismicCrossSection(WebvizPluginABC):
@@ -453,23 +454,26 @@ def make_heatmap(
     )
     return {
         "data": [
-            {
-                "type": "heatmap",
-                "name": "seismic",
-                "text": text,
-                "z": arr.tolist(),
-                "x0": xmin,
-                "xmax": xmax,
-                "dx": x_inc,
-                "y0": ymin,
-                "ymax": ymax,
-                "dy": y_inc,
-                "zsmooth": "best",
-                "showscale": showscale,
-                "colorscale": colors,
-                "zmin": zmin,
-                "zmax": zmax,
-            },
+            encode_trace(
+                {
+                    "type": "heatmap",
+                    "name": "seismic",
+                    "text": text,
+                    "z": arr,
+                    "x0": xmin,
+                    "xmax": xmax,
+                    "dx": x_inc,
+                    "y0": ymin,
+                    "ymax": ymax,
+                    "dy": y_inc,
+                    "zsmooth": "best",
+                    "showscale": showscale,
+                    "colorscale": colors,
+                    "zmin": zmin,
+                    "zmax": zmax,
+                },
+                keys=("z",),
+            ),
             {
                 "type": "line",
                 "y": s_arr[:, 2],
@@ -18,6 +18,7 @@ from webviz_config.webviz_store import webvizstore
 from webviz_config.common_cache import CACHE
 
 from .._datainput.fmu_input import get_realizations
+from .._datainput.file_index import FILE_INDEX
 from .._datainput.xsection import XSectionFigure
 from .._datainput.seismic import load_cube_data
 from .._datainput.well import load_well
@@ -600,8 +601,6 @@ def get_path(path) -> Path:
 
 @webvizstore
 def find_files(folder, suffix) -> io.BytesIO:
-    return io.BytesIO(
-        json.dumps(
-            sorted([str(filename) for filename in folder.glob(f"*{suffix}")])
-        ).encode()
-    )
+    files = FILE_INDEX.glob(Path(folder) / f"*{suffix}")
+    FILE_INDEX.save_snapshot()
+    return io.BytesIO(json.dumps(files).encode())